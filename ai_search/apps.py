@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class AiSearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'ai_search'
+
+    def ready(self):
+        # Keeps the chat retrieval index in sync with Project/Note/Post changes.
+        from . import retrieval  # noqa: F401
@@ -0,0 +1,226 @@
+"""
+Dense embeddings of the retrieval chunks, for questions that share no words
+with the portfolio text.
+
+`manage.py update_embeddings` embeds every chunk from ai_search.retrieval
+through the configured provider's OpenAI-compatible /embeddings endpoint
+(Ollama locally) and writes them as one contiguous, L2-normalized float32
+matrix. Only chunks whose content hash is new are sent; the rest are copied
+from the previous matrix.
+
+Files in AI_EMBEDDINGS_DIR:
+
+- vectors-<digest>.npy: the matrix, one row per chunk.
+- index.json: model, dimensions, the matrix file name and per-row chunks and
+  hashes. It is replaced atomically after the matrix is written, so a reader
+  never pairs rows with the wrong chunks. The matrix it replaced is kept for
+  one more generation, for workers that read the old index.json just before;
+  if a load still fails, get_store() keeps the store it had (or none, and the
+  chat uses BM25 only).
+
+Workers open the matrix with np.load(mmap_mode='r'): the pages live in the OS
+page cache and are shared by every gunicorn process instead of copied into
+each. A search is one matrix-vector product followed by a top-k selection.
+
+The store is a snapshot. Run update_embeddings after each deploy (build.sh does
+with UPDATE_EMBEDDINGS=true) and periodically, e.g. hourly from cron, so new
+notes and posts become searchable by meaning. Between runs, hits whose chunk is
+no longer in the live BM25 index are dropped (retrieval.live_hits): deleted
+notes, hidden projects and the old text of edited rows never reach the prompt,
+and new rows are found by keyword only.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+from django.conf import settings
+
+from . import providers
+from .retrieval import Chunk, Hit, all_chunks, live_hits
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = 'index.json'
+EMBED_BATCH_SIZE = 32
+MIN_SIMILARITY = 0.3  # 이보다 낮은 코사인 유사도는 관련 없는 것으로 봄
+
+
+def content_hash(model, chunk):
+    return hashlib.sha256(f"{model}\n{chunk.title}\n{chunk.text}".encode('utf-8')).hexdigest()[:32]
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k(scores, k):
+    """Indices of the k highest scores, best first, without sorting the whole array."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best])]
+
+
+def embed_texts(texts, provider=None):
+    """Unit-length float32 embeddings for texts, one request."""
+    provider = provider or providers.get_provider()
+    response = providers.get_client(provider).embeddings.create(model=provider.embedding_model, input=texts)
+    vectors = np.array([item.embedding for item in sorted(response.data, key=lambda item: item.index)], dtype=np.float32)
+    return _normalize(vectors)
+
+
+# ------------------------------
+# Store
+# ------------------------------
+
+@dataclass
+class EmbeddingStore:
+    model: str
+    chunks: list
+    hashes: list
+    matrix: np.ndarray  # (rows, dimensions) float32, memory-mapped when loaded from disk
+
+    @classmethod
+    def load(cls, directory=None):
+        """The store in directory, or None if update_embeddings has not run."""
+        directory = directory or settings.AI_EMBEDDINGS_DIR
+        try:
+            with open(os.path.join(directory, INDEX_FILE), encoding='utf-8') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        matrix = np.load(os.path.join(directory, meta['vectors']), mmap_mode='r')
+        chunks = [Chunk(tuple(row['source']), row['title'], row['text']) for row in meta['rows']]
+        return cls(meta['model'], chunks, [row['hash'] for row in meta['rows']], matrix)
+
+    def save(self, directory=None):
+        directory = directory or settings.AI_EMBEDDINGS_DIR
+        os.makedirs(directory, exist_ok=True)
+        matrix = np.ascontiguousarray(self.matrix, dtype=np.float32)
+        vectors = f"vectors-{hashlib.sha256(matrix.tobytes()).hexdigest()[:16]}.npy"
+        np.save(os.path.join(directory, vectors), matrix)
+        meta = {
+            'model': self.model,
+            'dimensions': int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+            'vectors': vectors,
+            'rows': [{'source': list(chunk.source), 'title': chunk.title, 'text': chunk.text, 'hash': digest}
+                     for chunk, digest in zip(self.chunks, self.hashes)],
+        }
+        keep = {vectors, _indexed_vectors(directory)}
+        temp = os.path.join(directory, f"{INDEX_FILE}.{os.getpid()}.tmp")
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(temp, os.path.join(directory, INDEX_FILE))
+        # 직전 세대는 남겨 둠: 옛 index.json을 막 읽은 워커가 아직 열지 않았을 수 있음
+        # (이미 열어 둔 mmap은 삭제된 파일도 계속 읽을 수 있음)
+        for name in os.listdir(directory):
+            if name.startswith('vectors-') and name not in keep:
+                os.remove(os.path.join(directory, name))
+
+    def search(self, vector, k):
+        if not len(self.chunks):
+            return []
+        scores = self.matrix @ vector
+        return [Hit(self.chunks[i], float(scores[i])) for i in top_k(scores, k)]
+
+
+def _indexed_vectors(directory):
+    """The matrix file the current index.json points to, if any."""
+    try:
+        with open(os.path.join(directory, INDEX_FILE), encoding='utf-8') as f:
+            return json.load(f).get('vectors')
+    except (OSError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class UpdateResult:
+    chunks: int
+    reused: int
+    embedded: int
+    requests: int
+
+
+def update_embeddings(full=False, batch_size=EMBED_BATCH_SIZE, directory=None, log=None):
+    """Re-embed chunks whose content changed since the last run and rewrite the store."""
+    log = log or logger.info
+    provider = providers.get_provider()
+    model = provider.embedding_model
+    chunks = list(all_chunks())
+    hashes = [content_hash(model, chunk) for chunk in chunks]
+
+    previous = None if full else EmbeddingStore.load(directory)
+    known = {}
+    if previous is not None and previous.model == model:
+        known = {digest: row for row, digest in enumerate(previous.hashes)}
+
+    missing = [i for i, digest in enumerate(hashes) if digest not in known]
+    new_vectors = {}
+    requests = 0
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        vectors = embed_texts([f"{chunks[i].title}\n{chunks[i].text}" for i in batch], provider)
+        requests += 1
+        new_vectors.update(zip(batch, vectors))
+        log(f"Embedded {min(start + batch_size, len(missing))}/{len(missing)} chunks")
+
+    dimensions = (next(iter(new_vectors.values())).shape[0] if new_vectors
+                  else previous.matrix.shape[1] if known else 0)
+    matrix = np.empty((len(chunks), dimensions), dtype=np.float32)
+    for i, digest in enumerate(hashes):
+        matrix[i] = new_vectors[i] if i in new_vectors else previous.matrix[known[digest]]
+
+    EmbeddingStore(model, chunks, hashes, matrix).save(directory)
+    return UpdateResult(len(chunks), len(chunks) - len(missing), len(missing), requests)
+
+
+# ------------------------------
+# Process-wide store used by the chat
+# ------------------------------
+
+_lock = threading.Lock()
+_store = None
+_store_mtime = None
+
+
+def get_store():
+    """The memory-mapped store, reloaded when update_embeddings has written a new one."""
+    global _store, _store_mtime
+    try:
+        mtime = os.stat(os.path.join(settings.AI_EMBEDDINGS_DIR, INDEX_FILE)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _lock:
+        if mtime != _store_mtime:
+            try:
+                store = EmbeddingStore.load()
+            except (OSError, ValueError, KeyError) as e:
+                # 예: 두 세대 넘게 지난 index.json을 읽음. 다음 호출에서 다시 시도
+                logger.warning(f"Could not load the embedding store, keeping the previous one: {e}")
+                return _store
+            _store, _store_mtime = store, mtime
+        return _store
+
+
+def similar_chunks(query, k=4, min_similarity=MIN_SIMILARITY):
+    """Chunks semantically close to query; [] when there is no store or the endpoint fails."""
+    store = get_store()
+    if store is None or not store.chunks:
+        return []
+    try:
+        provider = providers.get_provider()
+        if provider.embedding_model != store.model:
+            return []
+        vector = embed_texts([query], provider)[0]
+    except Exception as e:
+        logger.warning(f"Query embedding failed, using keyword retrieval only: {e}")
+        return []
+    # 색인 이후 삭제·숨김·수정된 행의 청크는 버리므로 여유 있게 가져옴
+    hits = [hit for hit in store.search(vector, k * 2) if hit.score >= min_similarity]
+    return live_hits(hits)[:k]
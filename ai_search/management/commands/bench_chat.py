@@ -0,0 +1,107 @@
+import asyncio
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import include, path
+
+from ai_search import views
+from ai_search.stub_llm import StubLLM, percentile
+
+# 벤치마크 전용 URLconf: 두 채팅 뷰를 나란히 두고 나머지는 사이트 그대로
+urlpatterns = [
+    path('bench/chat/sync/', views.chat_interaction),
+    path('bench/chat/async/', views.chat_interaction_async),
+    path('', include('mysite.urls')),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures how page requests fare while chats are streaming from a local stub LLM: '
+        'sync chat view on a fixed pool of worker threads (gunicorn sync workers) versus '
+        'the async view on one event loop (ASGI).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chats', type=int, default=8, help='Concurrent chat requests.')
+        parser.add_argument('--pages', type=int, default=20, help='Page requests issued while the chats run.')
+        parser.add_argument('--workers', type=int, default=4, help='Sync worker threads for the WSGI run.')
+        parser.add_argument('--page', default='/', help='Page URL to time.')
+        parser.add_argument('--latency', type=float, default=1.0, help='Stub seconds before the first token.')
+        parser.add_argument('--tokens', type=int, default=20, help='Tokens per stub answer.')
+        parser.add_argument('--token-delay', type=float, default=0.05, help='Stub seconds between tokens.')
+
+    def handle(self, *args, **options):
+        stub = StubLLM(options['latency'], options['tokens'], options['token_delay'])
+        settings = override_settings(
+            ROOT_URLCONF=__name__, ALLOWED_HOSTS=['testserver'], RATELIMIT_ENABLE=False, TISTORY_AUTO_SYNC=False,
+            AI_SERVICE_PROVIDER='local', OLLAMA_BASE_URL=stub.base_url,
+        )
+        with stub, settings:
+            self.stdout.write(
+                f"{options['chats']} chats (first token {options['latency']}s, "
+                f"{options['tokens']} tokens x {options['token_delay']}s) + {options['pages']} x GET {options['page']}"
+            )
+            self.report(f"WSGI, {options['workers']} sync workers", *self.run_sync(options))
+            self.report('ASGI, async view', *asyncio.run(self.run_async(options)))
+
+    def report(self, label, page_times, chat_times):
+        page_ms = sorted(t * 1000 for t in page_times)
+        p95 = percentile(page_ms, 0.95)
+        self.stdout.write(
+            f'{label:<24} page p50 {statistics.median(page_ms):7.0f} ms  p95 {p95:7.0f} ms  max {page_ms[-1]:7.0f} ms'
+            f' | chats done in {max(chat_times):.2f}s'
+        )
+
+    @staticmethod
+    def _check(response):
+        if response.status_code != 200:
+            raise CommandError(f'{response.request["PATH_INFO"]} answered {response.status_code}')
+        return response
+
+    @staticmethod
+    def _chat_body(index):
+        return json.dumps({'message': f'질문 {index}', 'stream': True})
+
+    def run_sync(self, options):
+        started = time.perf_counter()
+
+        def chat(index):
+            response = self._check(Client().post('/bench/chat/sync/', self._chat_body(index), content_type='application/json'))
+            b''.join(response.streaming_content)
+            return time.perf_counter() - started
+
+        def page(submitted):
+            # 큐에서 기다린 시간까지 포함: 사용자가 체감하는 지연
+            self._check(Client().get(options['page']))
+            return time.perf_counter() - submitted
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            chats = [pool.submit(chat, i) for i in range(options['chats'])]
+            time.sleep(0.1)
+            pages = [pool.submit(page, time.perf_counter()) for _ in range(options['pages'])]
+            return [f.result() for f in pages], [f.result() for f in chats]
+
+    async def run_async(self, options):
+        client = AsyncClient()
+        started = time.perf_counter()
+
+        async def chat(index):
+            response = self._check(await client.post('/bench/chat/async/', self._chat_body(index), content_type='application/json'))
+            async for _ in response.streaming_content:
+                pass
+            return time.perf_counter() - started
+
+        async def page():
+            submitted = time.perf_counter()
+            self._check(await client.get(options['page']))
+            return time.perf_counter() - submitted
+
+        chats = [asyncio.create_task(chat(i)) for i in range(options['chats'])]
+        await asyncio.sleep(0.1)
+        page_times = await asyncio.gather(*(page() for _ in range(options['pages'])))
+        return page_times, await asyncio.gather(*chats)
@@ -0,0 +1,71 @@
+import tempfile
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from ai_search.embeddings import EmbeddingStore, _normalize, top_k
+from ai_search.retrieval import Chunk
+
+
+class Command(BaseCommand):
+    help = (
+        'Times nearest-chunk search over random unit vectors stored like update_embeddings does '
+        '(memory-mapped .npy): a per-row Python loop, one matrix-vector product with a full sort '
+        '(brute force) and the same product with an argpartition top-k.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000], help='Matrix sizes to compare.')
+        parser.add_argument('--dimensions', type=int, default=768, help='Embedding width (nomic-embed-text: 768).')
+        parser.add_argument('--k', type=int, default=4, help='Chunks returned per query.')
+        parser.add_argument('--queries', type=int, default=50, help='Queries timed per method.')
+        parser.add_argument('--loop-limit', type=int, default=10000, help='Skip the Python loop above this many rows.')
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(0)
+        k = options['k']
+        self.stdout.write(f"{options['dimensions']} dimensions, top {k}, {options['queries']} queries, ms per query")
+        for rows in options['rows']:
+            matrix = _normalize(rng.standard_normal((rows, options['dimensions']), dtype=np.float32))
+            queries = _normalize(rng.standard_normal((options['queries'], options['dimensions']), dtype=np.float32))
+            chunks = [Chunk(('bench', i), '', '') for i in range(rows)]
+
+            with tempfile.TemporaryDirectory() as directory:
+                EmbeddingStore('bench', chunks, [''] * rows, matrix).save(directory)
+                started = time.perf_counter()
+                store = EmbeddingStore.load(directory)
+                load_ms = (time.perf_counter() - started) * 1000
+                mapped = store.matrix
+
+                def brute_force(q):
+                    scores = mapped @ q
+                    return np.argsort(-scores)[:k]
+
+                def partitioned(q):
+                    return top_k(mapped @ q, k)
+
+                def row_loop(q):
+                    scores = np.array([float(row @ q) for row in mapped])
+                    return np.argsort(-scores)[:k]
+
+                results = {
+                    'matvec + full sort': self.time(brute_force, queries),
+                    'matvec + top-k': self.time(partitioned, queries),
+                    'store.search()': self.time(lambda q: store.search(q, k), queries),
+                }
+                if rows <= options['loop_limit']:
+                    results['python row loop'] = self.time(row_loop, queries[:5])
+                agree = all(np.array_equal(brute_force(q), partitioned(q)) for q in queries)
+                del store, mapped  # mmap을 닫아야 임시 디렉터리를 지울 수 있음
+
+            timings = '  '.join(f'{name} {ms:8.3f}' for name, ms in results.items())
+            self.stdout.write(f'{rows:>7} rows (load {load_ms:5.1f} ms, same top-k: {agree})  {timings}')
+
+    @staticmethod
+    def time(search, queries):
+        search(queries[0])  # 첫 호출에서 mmap 페이지를 읽어 들임
+        started = time.perf_counter()
+        for q in queries:
+            search(q)
+        return (time.perf_counter() - started) * 1000 / len(queries)
@@ -0,0 +1,56 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from ai_search import providers
+from ai_search.stub_llm import StubLLM, percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures per-request client overhead against a local stub LLM: a new OpenAI() for every '
+        'request (the old behaviour) versus the pooled process-wide client from ai_search.providers. '
+        'The stub answers instantly, so the numbers are client setup plus connection cost; against '
+        'api.openai.com each new client also pays a TLS handshake.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300, help='Requests per run.')
+        parser.add_argument('--threads', type=int, nargs='+', default=[1, 8], help='Concurrent callers to compare.')
+
+    def handle(self, *args, **options):
+        with StubLLM(latency=0, tokens=5, token_delay=0) as stub:
+            provider = providers.Provider('stub', stub.base_url, 'stub', 'stub-model')
+            providers.get_client(provider)  # 풀 생성은 프로세스당 한 번이므로 측정에서 제외
+            for threads in options['threads']:
+                for label, client_for, per_request in (
+                    ('new client per request', lambda: providers.build_client(provider), True),
+                    ('pooled client', lambda: providers.get_client(provider), False),
+                ):
+                    connections = stub.connections
+                    times, elapsed = self.run(client_for, per_request, provider.model, options['requests'], threads)
+                    self.stdout.write(
+                        f'{threads:>2} threads, {label:<24} mean {statistics.mean(times) * 1000:6.2f} ms  '
+                        f'p95 {percentile(sorted(times), 0.95) * 1000:6.2f} ms  '
+                        f'{len(times) / elapsed:7.0f} req/s  {stub.connections - connections:>4} connections'
+                    )
+        providers.close_clients()
+
+    @staticmethod
+    def run(client_for, per_request, model, count, threads):
+        def one(_):
+            started = time.perf_counter()
+            client = client_for()
+            try:
+                client.chat.completions.create(model=model, messages=[{'role': 'user', 'content': 'ping'}])
+            finally:
+                if per_request:
+                    client.close()  # 요청마다 만든 클라이언트는 연결 풀째 닫아야 소켓이 쌓이지 않음
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            times = list(pool.map(one, range(count)))
+        return times, time.perf_counter() - started
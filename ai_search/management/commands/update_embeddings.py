@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from ai_search import embeddings
+
+
+class Command(BaseCommand):
+    help = 'Embeds new or changed chat retrieval chunks and rewrites the memory-mapped embedding matrix.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Re-embed every chunk, ignoring the stored vectors.')
+        parser.add_argument('--batch-size', type=int, default=embeddings.EMBED_BATCH_SIZE, help='Chunks per embeddings request.')
+
+    def handle(self, *args, **options):
+        result = embeddings.update_embeddings(
+            full=options['full'],
+            batch_size=options['batch_size'],
+            log=lambda message: self.stdout.write(f'  - {message}'),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.chunks} chunks: {result.reused} reused, {result.embedded} embedded '
+            f'in {result.requests} requests.'
+        ))
@@ -0,0 +1,124 @@
+"""
+Process-wide LLM clients.
+
+Both chat providers speak the OpenAI API: OpenAI itself and a local Ollama
+server (its /v1 endpoint). Building OpenAI() per request meant a new connection
+pool, and with it a new TCP/TLS handshake, for every chat. Clients are now
+created once per process for each provider and base URL and reused, so
+requests ride on kept-alive connections. Timeouts, retries and pool limits
+come from the AI_CLIENT_* settings.
+
+Async clients are kept per event loop: a connection pool belongs to the loop
+that opened its connections.
+"""
+import asyncio
+import logging
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from openai import AsyncOpenAI, OpenAI
+
+try:
+    import httpx
+except ImportError:  # openai releases built on httpx2
+    import httpx2 as httpx
+
+logger = logging.getLogger(__name__)
+
+
+class MissingAPIKey(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Provider:
+    name: str
+    base_url: Optional[str]
+    api_key: str
+    model: str
+    embedding_model: str = ''
+
+    @property
+    def key(self):
+        return (self.name, self.base_url, self.api_key)
+
+
+def get_provider(name=None):
+    """The configured provider ('openai' or 'local'); raises MissingAPIKey without an OpenAI key."""
+    name = (name or settings.AI_SERVICE_PROVIDER).lower()
+    if name == 'local':
+        # Ollama는 api_key가 필요 없습니다.
+        return Provider('local', settings.OLLAMA_BASE_URL, 'ollama', settings.OLLAMA_MODEL_NAME,
+                        settings.OLLAMA_EMBEDDING_MODEL)
+    if not settings.OPENAI_API_KEY:
+        raise MissingAPIKey()
+    return Provider('openai', None, settings.OPENAI_API_KEY, settings.OPENAI_CHAT_MODEL,
+                    settings.OPENAI_EMBEDDING_MODEL)
+
+
+def _client_options():
+    return {
+        'timeout': httpx.Timeout(settings.AI_CLIENT_TIMEOUT, connect=settings.AI_CLIENT_CONNECT_TIMEOUT),
+        'max_retries': settings.AI_CLIENT_MAX_RETRIES,
+    }
+
+
+def _limits():
+    return httpx.Limits(
+        max_connections=settings.AI_CLIENT_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.AI_CLIENT_MAX_KEEPALIVE,
+        keepalive_expiry=settings.AI_CLIENT_KEEPALIVE_EXPIRY,
+    )
+
+
+def build_client(provider):
+    """A new sync client with its own pool (get_client() shares one instead)."""
+    options = _client_options()
+    http_client = httpx.Client(timeout=options['timeout'], limits=_limits(), follow_redirects=True)
+    return OpenAI(base_url=provider.base_url, api_key=provider.api_key, http_client=http_client, **options)
+
+
+def build_async_client(provider):
+    options = _client_options()
+    http_client = httpx.AsyncClient(timeout=options['timeout'], limits=_limits(), follow_redirects=True)
+    return AsyncOpenAI(base_url=provider.base_url, api_key=provider.api_key, http_client=http_client, **options)
+
+
+_lock = threading.Lock()
+_clients = {}
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> {provider key: client}
+
+
+def get_client(provider):
+    """The process-wide sync client for `provider`."""
+    client = _clients.get(provider.key)
+    if client is None:
+        with _lock:
+            client = _clients.get(provider.key)
+            if client is None:
+                logger.info(f"Creating LLM client for {provider.name} ({provider.base_url or 'api.openai.com'}, model {provider.model})")
+                client = _clients[provider.key] = build_client(provider)
+    return client
+
+
+def get_async_client(provider):
+    """The async client for `provider` on the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(provider.key)
+        if client is None:
+            logger.info(f"Creating async LLM client for {provider.name} ({provider.base_url or 'api.openai.com'}, model {provider.model})")
+            client = clients[provider.key] = build_async_client(provider)
+    return client
+
+
+def close_clients():
+    """Close the pooled sync clients (async ones go with their event loop)."""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
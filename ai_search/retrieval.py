@@ -0,0 +1,403 @@
+"""
+Retrieval for the chat's RAG step.
+
+Projects (with their PROJECT_DETAIL_META write-ups), notes, posts and the
+knowledge-base markdown are cut into chunks and kept in an in-process inverted
+index scored with BM25. Text is tokenized into the same character bigrams as
+the notes search (notes.search.bigrams), so Korean matches without a
+morphological analyzer.
+
+The index is built on first use in each process. Saves and deletes re-chunk
+only the affected row: the process that made the change updates its index
+right away, and records the change under a version counter in the cache.
+Other processes replay those changes before their next query, or rebuild if
+the log has expired. With a per-process cache (LocMem) they only see their
+own changes, like the other cache-versioned data in this project.
+"""
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from blog.models import Post
+from notes.models import Note, notes_bulk_deleted
+from notes.search import bigrams
+from projects.models import Project
+from projects.detail_meta import PROJECT_DETAIL_META
+
+logger = logging.getLogger(__name__)
+
+KNOWLEDGE_BASE_FILES = [Path(__file__).resolve().parent / 'knowledge_base_structure.md']
+CHUNK_CHARS = 500
+DEFAULT_TOP_K = 4
+MAX_CONTEXT_CHARS = 2400
+RELATIVE_CUTOFF = 0.35  # 최고 점수의 이 비율보다 낮은 청크는 프롬프트에 넣지 않음
+RRF_K = 60
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+VERSION_KEY = 'ai_search:rag:version'
+CHANGE_KEY = 'ai_search:rag:change:{}'
+CHANGE_TIMEOUT = 24 * 60 * 60
+MAX_REPLAY = 500
+
+LABELS = {'project': '프로젝트', 'note': '노트', 'post': '블로그 글', 'kb': '자기소개'}
+META_LABELS = {'one_liner': '요약', 'period': '기간', 'role': '역할', 'contribution': '기여도', 'my_role_points': '담당'}
+
+_HEADING_RE = re.compile(r'^#{1,6}\s+(.*)$')
+
+
+@dataclass(frozen=True)
+class Chunk:
+    source: tuple  # (kind, key): ('project', 3), ('kb', 'knowledge_base_structure.md')
+    title: str
+    text: str
+
+    def render(self):
+        return f"### [{LABELS[self.source[0]]}] {self.title}\n{self.text}"
+
+
+@dataclass(frozen=True)
+class Hit:
+    chunk: Chunk
+    score: float
+
+
+# ------------------------------
+# Chunking
+# ------------------------------
+
+def split_text(text, limit=CHUNK_CHARS):
+    """Pack paragraphs into pieces of at most `limit` characters (longer paragraphs are cut)."""
+    pieces, current = [], ''
+    for paragraph in re.split(r'\n\s*\n', text or ''):
+        paragraph = paragraph.strip()
+        while len(paragraph) > limit:
+            pieces.append(paragraph[:limit])
+            paragraph = paragraph[limit:]
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) + 2 > limit:
+            pieces.append(current)
+            current = ''
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _meta_lines(value):
+    # PROJECT_DETAIL_META의 중첩 dict/list를 "라벨: 값" 줄로 평탄화
+    if isinstance(value, dict):
+        label = value.get('label')
+        lines = []
+        for key, item in value.items():
+            if key in ('label', 'view_mode', 'writeup_link', 'triple_title', 'kpi_title'):
+                continue
+            prefix = label or META_LABELS.get(key)
+            lines.extend(f"{prefix}: {line}" if prefix else line for line in _meta_lines(item))
+        return lines
+    if isinstance(value, (list, tuple)):
+        return [line for item in value for line in _meta_lines(item)]
+    return [str(value)] if value not in (None, '') else []
+
+
+def project_chunks(project):
+    if not project.is_visible:
+        return []
+    text = f"{project.description}\n\n기술: {project.technologies}"
+    meta = PROJECT_DETAIL_META.get(project.title)
+    if meta:
+        text += '\n\n' + '\n'.join(_meta_lines(meta))
+    return [Chunk(('project', project.pk), project.title, piece) for piece in split_text(text)]
+
+
+def note_chunks(note):
+    return [Chunk(('note', note.pk), note.title, piece) for piece in split_text(note.content)]
+
+
+def post_chunks(post):
+    return [Chunk(('post', post.pk), post.title, piece) for piece in split_text(post.content)]
+
+
+def markdown_chunks(path):
+    """One or more chunks per heading section of a markdown file."""
+    source = ('kb', path.name)
+    chunks, title, lines = [], path.stem, []
+
+    def flush():
+        for piece in split_text('\n'.join(lines)):
+            chunks.append(Chunk(source, title, piece))
+
+    for line in path.read_text(encoding='utf-8').splitlines():
+        if line.startswith('```'):
+            continue
+        match = _HEADING_RE.match(line)
+        if match:
+            flush()
+            title, lines = match.group(1).strip(), []
+        else:
+            lines.append(line)
+    flush()
+    return chunks
+
+
+def _load_source(kind, key):
+    """Chunks for one source read from the database (or disk); [] when it is gone."""
+    if kind == 'kb':
+        path = next((p for p in KNOWLEDGE_BASE_FILES if p.name == key), None)
+        return markdown_chunks(path) if path and path.exists() else []
+    model, build = {'project': (Project, project_chunks), 'note': (Note, note_chunks), 'post': (Post, post_chunks)}[kind]
+    obj = model.objects.filter(pk=key).first()
+    return build(obj) if obj else []
+
+
+def all_chunks():
+    projects = Project.objects.filter(is_visible=True).only('title', 'description', 'technologies', 'is_visible')
+    for project in projects.iterator():
+        yield from project_chunks(project)
+    for note in Note.objects.only('title', 'content').iterator():
+        yield from note_chunks(note)
+    for post in Post.objects.only('title', 'content').iterator():
+        yield from post_chunks(post)
+    for path in KNOWLEDGE_BASE_FILES:
+        if path.exists():
+            yield from markdown_chunks(path)
+
+
+# ------------------------------
+# BM25 index
+# ------------------------------
+
+class BM25Index:
+    """Inverted index of chunks; documents can be replaced per source."""
+
+    def __init__(self, k1=BM25_K1, b=BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._postings = defaultdict(dict)  # term -> {doc id: term frequency}
+        self._docs = {}                     # doc id -> (chunk, length, terms)
+        self._by_source = defaultdict(list)
+        self._total_length = 0
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, chunk):
+        return any(self._docs[doc_id][0] == chunk for doc_id in self._by_source.get(chunk.source, ()))
+
+    def add(self, chunk):
+        terms = Counter(bigrams(f"{chunk.title}\n{chunk.text}"))
+        if not terms:
+            return
+        doc_id = self._next_id
+        self._next_id += 1
+        length = sum(terms.values())
+        for term, tf in terms.items():
+            self._postings[term][doc_id] = tf
+        self._docs[doc_id] = (chunk, length, tuple(terms))
+        self._by_source[chunk.source].append(doc_id)
+        self._total_length += length
+
+    def remove(self, source):
+        for doc_id in self._by_source.pop(source, ()):
+            chunk, length, terms = self._docs.pop(doc_id)
+            for term in terms:
+                postings = self._postings[term]
+                del postings[doc_id]
+                if not postings:
+                    del self._postings[term]
+            self._total_length -= length
+
+    def replace(self, source, chunks):
+        self.remove(source)
+        for chunk in chunks:
+            self.add(chunk)
+
+    def search(self, query, k=DEFAULT_TOP_K):
+        count = len(self._docs)
+        if not count:
+            return []
+        average = self._total_length / count
+        scores = defaultdict(float)
+        for term in dict.fromkeys(bigrams(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                length = self._docs[doc_id][1]
+                norm = self.k1 * (1 - self.b + self.b * length / average)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [Hit(self._docs[doc_id][0], score) for doc_id, score in best]
+
+
+# ------------------------------
+# Process-wide index and cross-process change log
+# ------------------------------
+
+_lock = threading.RLock()
+_index = None
+_version = 0
+
+
+def _current_version():
+    return cache.get(VERSION_KEY, 0)
+
+
+def build_index():
+    """Replace this process's index with a fresh one built from every source."""
+    global _index, _version
+    with _lock:
+        version = _current_version()
+        index = BM25Index()
+        for chunk in all_chunks():
+            index.add(chunk)
+        _index, _version = index, version
+        logger.info(f"Built chat retrieval index: {len(index)} chunks")
+        return index
+
+
+def _sync():
+    """Replay changes other processes logged since this index was built."""
+    global _version
+    current = _current_version()
+    if current == _version:
+        return
+    versions = range(_version + 1, current + 1)
+    changes = cache.get_many([CHANGE_KEY.format(v) for v in versions]) if 0 < len(versions) <= MAX_REPLAY else {}
+    if not changes or len(changes) != len(versions):
+        build_index()  # 로그가 만료됐거나 캐시가 비워짐
+        return
+    for v in versions:
+        for kind, key in changes[CHANGE_KEY.format(v)]:
+            _index.replace((kind, key), _load_source(kind, key))
+    _version = current
+
+
+def get_index():
+    with _lock:
+        if _index is None:
+            return build_index()
+        _sync()
+        return _index
+
+
+def search(query, k=DEFAULT_TOP_K):
+    """Top-k chunks for query, best first."""
+    with _lock:
+        return get_index().search(query, k)
+
+
+def live_hits(hits):
+    """
+    The hits whose chunk is still indexed as is. Drops chunks of deleted or hidden
+    rows and outdated text of edited ones, e.g. from an older embedding store.
+    """
+    with _lock:
+        index = get_index()
+        return [hit for hit in hits if hit.chunk in index]
+
+
+def fuse(rankings, k=RRF_K):
+    """Merge ranked chunk lists by reciprocal rank fusion; chunks found by several lists rise."""
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, chunk in enumerate(ranking, start=1):
+            scores[chunk] += 1 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def context_for(query, dense_hits=(), k=DEFAULT_TOP_K, max_chars=MAX_CONTEXT_CHARS):
+    """
+    Prompt context: the top BM25 chunks that score at least RELATIVE_CUTOFF of the
+    best one, fused with dense_hits (ai_search.embeddings) and cut to max_chars.
+    Empty when nothing in the portfolio matches.
+    """
+    hits = search(query, k)
+    keyword = [hit.chunk for hit in hits if hit.score >= hits[0].score * RELATIVE_CUTOFF] if hits else []
+    parts, used = [], 0
+    for chunk in fuse([keyword, [hit.chunk for hit in dense_hits]])[:k]:
+        block = chunk.render()
+        if parts and used + len(block) > max_chars:
+            break
+        parts.append(block)
+        used += len(block)
+    return '\n\n'.join(parts)
+
+
+def record_changes(changes):
+    """
+    Apply {source: new chunks} locally and log the sources for other processes
+    as one version, however many there are (e.g. a bulk delete).
+    """
+    global _version
+    with _lock:
+        cache.add(VERSION_KEY, 0, None)
+        try:
+            version = cache.incr(VERSION_KEY)
+        except ValueError:  # 키가 방금 축출됨
+            version = None
+        if version is not None:
+            cache.set(CHANGE_KEY.format(version), list(changes), CHANGE_TIMEOUT)
+        if _index is None:
+            return
+        for source, chunks in changes.items():
+            _index.replace(source, chunks)
+        if version == _version + 1:
+            _version = version
+
+
+def record_change(source, chunks):
+    """Apply a source's new chunks locally and log the change for other processes."""
+    record_changes({source: chunks})
+
+
+# ------------------------------
+# Receivers (connected when ai_search is ready)
+# ------------------------------
+
+def _on_commit(source, chunks):
+    transaction.on_commit(lambda: record_change(source, chunks))
+
+
+@receiver(post_save, sender=Project)
+def reindex_project(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _on_commit(('project', instance.pk), project_chunks(instance))
+
+
+@receiver(post_save, sender=Note)
+def reindex_note(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _on_commit(('note', instance.pk), note_chunks(instance))
+
+
+@receiver(post_save, sender=Post)
+def reindex_post(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _on_commit(('post', instance.pk), post_chunks(instance))
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Note)
+@receiver(post_delete, sender=Post)
+def unindex_deleted(sender, instance, **kwargs):
+    kind = {Project: 'project', Note: 'note', Post: 'post'}[sender]
+    _on_commit((kind, instance.pk), [])
+
+
+@receiver(notes_bulk_deleted)
+def unindex_bulk_deleted_notes(sender, note_ids, **kwargs):
+    record_changes({('note', note_id): [] for note_id in note_ids})
@@ -0,0 +1,130 @@
+"""
+A local stand-in for an OpenAI-compatible chat endpoint, used by the chat
+benchmarks. It answers POST .../chat/completions after `latency` seconds with
+`tokens` words, streamed one per `token_delay` seconds when the request asks
+for stream=True, and POST .../embeddings with hashed bigram vectors.
+Connections are kept alive (HTTP/1.1) like a real server.
+"""
+import json
+import math
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list, shared by the benchmark reports."""
+    return sorted_values[max(math.ceil(len(sorted_values) * fraction) - 1, 0)]
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # 클라이언트가 keep-alive 연결을 끊는 것은 정상 종료
+
+
+class StubLLM:
+    def __init__(self, latency=0.5, tokens=20, token_delay=0.02, dimensions=64):
+        self.latency = latency
+        self.dimensions = dimensions
+        self.tokens = tokens
+        self.token_delay = token_delay
+        self.requests = 0
+        self.connections = 0
+        self.last_request = None
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True  # 헤더와 본문을 따로 쓰므로 지연 ACK 대기를 피함
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with stub._lock:
+                    stub.requests += 1
+                    stub.last_request = body
+                time.sleep(stub.latency)
+                if self.path.endswith('/embeddings'):
+                    self._embeddings(body)
+                elif body.get('stream'):
+                    self._stream(body['model'])
+                else:
+                    self._complete(body['model'])
+
+            def _complete(self, model):
+                time.sleep(stub.token_delay * stub.tokens)
+                self._json({
+                    'id': 'stub', 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': ' '.join(stub.words())}}],
+                })
+
+            def _embeddings(self, body):
+                texts = body['input'] if isinstance(body['input'], list) else [body['input']]
+                self._json({
+                    'object': 'list', 'model': body['model'],
+                    'data': [{'object': 'embedding', 'index': i, 'embedding': stub.embed(text)} for i, text in enumerate(texts)],
+                    'usage': {'prompt_tokens': 0, 'total_tokens': 0},
+                })
+
+            def _json(self, data):
+                payload = json.dumps(data).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _stream(self, model):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for index, word in enumerate(stub.words()):
+                    if index:
+                        time.sleep(stub.token_delay)
+                    chunk = {
+                        'id': 'stub', 'object': 'chat.completion.chunk', 'created': int(time.time()), 'model': model,
+                        'choices': [{'index': 0, 'finish_reason': None,
+                                     'delta': {'content': word if not index else f' {word}'}}],
+                    }
+                    self._chunk(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+                self._chunk(b"data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _chunk(self, data):
+                self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+                self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = _Server(('127.0.0.1', 0), Handler)
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}/v1'
+
+    def embed(self, text):
+        """Hashed character-bigram counts: texts sharing bigrams get similar vectors."""
+        vector = [0.0] * self.dimensions
+        text = ''.join(text.lower().split())
+        for i in range(len(text) - 1):
+            vector[zlib.crc32(text[i:i + 2].encode('utf-8')) % self.dimensions] += 1.0
+        return vector
+
+    def words(self):
+        return [f'토큰{i}' for i in range(self.tokens)]
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
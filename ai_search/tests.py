@@ -0,0 +1,619 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import include, path
+
+from blog.models import Post
+from notes.models import Note, bulk_delete_notes
+from projects.models import Project
+
+from . import embeddings, providers, retrieval, views
+from .retrieval import BM25Index, Chunk, Hit
+from .management.commands.bench_llm_clients import Command as BenchLLMClients
+from .stub_llm import StubLLM, percentile
+
+# 두 채팅 뷰를 나란히 시험하는 URLconf
+urlpatterns = [
+    path('chat/sync/', views.chat_interaction),
+    path('chat/async/', views.chat_interaction_async),
+    path('', include('mysite.urls')),
+]
+
+
+class RetrievalTestCase(TestCase):
+    """Starts every test with an empty process index and change log."""
+
+    def setUp(self):
+        cache.clear()
+        retrieval._index = None
+        retrieval._version = 0
+
+
+class StubLLMTestCase(RetrievalTestCase):
+    """Runs the local stub as the 'local' provider for the whole class."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.stub = cls.enterClassContext(StubLLM(latency=0, tokens=3, token_delay=0))
+        cls.enterClassContext(override_settings(AI_SERVICE_PROVIDER='local', OLLAMA_BASE_URL=cls.stub.base_url))
+
+
+def chunk(key, text, title='', kind='note'):
+    return Chunk((kind, key), title, text)
+
+
+class SplitTextTests(SimpleTestCase):
+    def test_paragraphs_are_packed_up_to_the_limit(self):
+        text = 'aaaa\n\nbbbb\n\n\ncccc'
+        self.assertEqual(retrieval.split_text(text, limit=10), ['aaaa\n\nbbbb', 'cccc'])
+        self.assertEqual(retrieval.split_text(text, limit=100), ['aaaa\n\nbbbb\n\ncccc'])
+
+    def test_long_paragraphs_are_cut(self):
+        self.assertEqual(retrieval.split_text('x' * 25 + '\n\nyy', limit=10), ['x' * 10, 'x' * 10, 'xxxxx\n\nyy'])
+
+    def test_empty_text(self):
+        self.assertEqual(retrieval.split_text(''), [])
+        self.assertEqual(retrieval.split_text(None), [])
+        self.assertEqual(retrieval.split_text(' \n\n '), [])
+
+
+class BM25IndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = BM25Index()
+        self.redis = chunk(1, 'Redis 캐시 전략과 Redis 만료 정책')
+        self.short = chunk(2, 'Redis 도입')
+        self.long = chunk(3, 'Redis 도입 ' + '관계없는 긴 설명 ' * 20)
+        self.other = chunk(4, '도커 배포 파이프라인')
+        for c in (self.redis, self.short, self.long, self.other):
+            self.index.add(c)
+
+    def ranked(self, query):
+        return [hit.chunk for hit in self.index.search(query, k=10)]
+
+    def test_term_frequency_and_length_rank(self):
+        self.assertEqual(self.ranked('Redis'), [self.redis, self.short, self.long])
+        scores = [hit.score for hit in self.index.search('Redis 캐시', k=10)]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(self.ranked('배포'), [self.other])
+        self.assertEqual(self.ranked('zzqq'), [])
+        self.assertEqual(self.ranked(''), [])
+
+    def test_rare_terms_weigh_more(self):
+        # "도입"은 두 문서, "캐시"는 한 문서에만 있음
+        best, = self.index.search('도입 캐시', k=1)
+        self.assertEqual(best.chunk, self.redis)
+
+    def test_sources_are_replaced_and_removed(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertIn(self.redis, self.index)
+        updated = chunk(1, '세션 저장소')
+        self.index.replace(('note', 1), [updated])
+        self.assertNotIn(self.redis, self.index)
+        self.assertIn(updated, self.index)
+        self.assertEqual(self.ranked('캐시'), [])
+        self.assertEqual(self.ranked('세션'), [updated])
+
+        self.index.remove(('note', 1))
+        self.index.remove(('note', 99))
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.ranked('세션'), [])
+        self.assertNotIn('세션', self.index._postings)
+
+
+class FuseTests(SimpleTestCase):
+    def test_chunks_in_several_rankings_rise(self):
+        a, b, c, d = (chunk(i, str(i)) for i in range(4))
+        self.assertEqual(retrieval.fuse([[a, b, c], [c, d]]), [c, a, b, d])
+        self.assertEqual(retrieval.fuse([[], [d]]), [d])
+        self.assertEqual(retrieval.fuse([[], []]), [])
+
+
+@mock.patch.object(retrieval, 'KNOWLEDGE_BASE_FILES', [])
+class ContextTests(RetrievalTestCase):
+    def test_weak_hits_are_cut_relative_to_the_best(self):
+        strong = Note.objects.create(title='Redis 캐시', content='Redis 캐시 키 전략, Redis 캐시 만료, 캐시 무효화')
+        weak = Note.objects.create(title='회고', content='여러 이야기 중 캐시 한 번 언급')
+        hits = retrieval.search('Redis 캐시 전략', k=10)
+        self.assertEqual(hits[0].chunk.source, ('note', strong.pk))
+        self.assertLess(hits[-1].score, hits[0].score * retrieval.RELATIVE_CUTOFF)
+
+        context = retrieval.context_for('Redis 캐시 전략')
+        self.assertIn('### [노트] Redis 캐시', context)
+        self.assertNotIn(weak.title, context)
+
+    def test_context_respects_char_budget(self):
+        for i in range(4):
+            Note.objects.create(title=f'배포 {i}', content='배포 자동화 ' * 30)
+        full = retrieval.context_for('배포 자동화', max_chars=10_000)
+        self.assertEqual(full.count('### [노트]'), 4)
+        first = full.split('\n\n### ')[0]
+        self.assertEqual(retrieval.context_for('배포 자동화', max_chars=len(first) + 10), first)
+        # 첫 블록은 예산을 넘어도 넣음
+        self.assertEqual(retrieval.context_for('배포 자동화', max_chars=1), first)
+
+    def test_unrelated_query_has_no_context(self):
+        Note.objects.create(title='배포', content='배포 자동화')
+        self.assertEqual(retrieval.context_for('zzqq'), '')
+
+    def test_dense_hits_are_fused(self):
+        Note.objects.create(title='배포', content='배포 자동화')
+        dense = chunk(999, '의미로 찾은 청크', title='의미 검색')
+        context = retrieval.context_for('배포', [Hit(dense, 0.9)])
+        self.assertIn('### [노트] 배포', context)
+        self.assertIn('의미로 찾은 청크', context)
+
+    def test_hidden_projects_are_not_indexed(self):
+        Project.objects.create(title='숨김 프로젝트', description='비공개 실험', technologies='Python', is_visible=False)
+        Project.objects.create(title='공개 프로젝트', description='공개 실험', technologies='Python')
+        sources = {hit.chunk.title for hit in retrieval.search('실험', k=10)}
+        self.assertEqual(sources, {'공개 프로젝트'})
+
+
+@mock.patch.object(retrieval, 'KNOWLEDGE_BASE_FILES', [])
+class ChangeLogTests(RetrievalTestCase):
+    def titles(self, query):
+        return {hit.chunk.title for hit in retrieval.search(query, k=10)}
+
+    def log_remote_change(self, *sources):
+        # 다른 프로세스가 record_changes로 남긴 것과 같은 기록 (이 프로세스의 색인은 그대로)
+        cache.add(retrieval.VERSION_KEY, 0, None)
+        version = cache.incr(retrieval.VERSION_KEY)
+        cache.set(retrieval.CHANGE_KEY.format(version), list(sources))
+        return version
+
+    def test_saves_and_deletes_update_the_index_after_commit(self):
+        retrieval.get_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            note = Note.objects.create(title='새 노트', content='쿠버네티스 배포')
+            post = Post.objects.create(title='새 글', content='쿠버네티스 운영')
+        self.assertEqual(self.titles('쿠버네티스'), {'새 노트', '새 글'})
+        self.assertEqual(cache.get(retrieval.VERSION_KEY), 2)
+        self.assertEqual(retrieval._version, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            note.delete()
+            post.title = '고친 글'
+            post.save()
+        self.assertEqual(self.titles('쿠버네티스'), {'고친 글'})
+
+    def test_changes_wait_for_commit(self):
+        retrieval.get_index()
+        with self.captureOnCommitCallbacks() as callbacks:
+            Note.objects.create(title='미커밋', content='롤백될 수 있는 내용')
+        self.assertEqual(self.titles('롤백'), set())
+        self.assertEqual(len(callbacks), 1)
+
+    def test_bulk_deleted_notes_are_unindexed(self):
+        notes = [Note.objects.create(title=f'대량 {i}', content='일괄 삭제 대상') for i in range(3)]
+        retrieval.get_index()
+        version = retrieval._version
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_delete_notes(Note.objects.filter(pk__in=[n.pk for n in notes[:2]]))
+        self.assertEqual(self.titles('일괄 삭제'), {'대량 2'})
+        # 몇 개를 지우든 변경 기록은 하나
+        self.assertEqual(retrieval._version, version + 1)
+        self.assertEqual(sorted(cache.get(retrieval.CHANGE_KEY.format(version + 1))),
+                         [('note', notes[0].pk), ('note', notes[1].pk)])
+
+    def test_large_bulk_delete_is_replayed_without_rebuild(self):
+        Note.objects.bulk_create([Note(title=f'대량 {i}', content='일괄 삭제 대상') for i in range(retrieval.MAX_REPLAY + 10)])
+        kept = Note.objects.create(title='남는 노트', content='일괄 삭제 대상')
+        retrieval.get_index()
+        # 다른 프로세스에서 지워진 것처럼: 이 프로세스의 색인은 그대로 두고 기록만 남김
+        ids = list(Note.objects.exclude(pk=kept.pk).values_list('pk', flat=True))
+        with mock.patch.object(retrieval, 'record_changes', side_effect=lambda changes: self.log_remote_change(*changes)):
+            with self.captureOnCommitCallbacks(execute=True):
+                bulk_delete_notes(Note.objects.filter(pk__in=ids))
+        with mock.patch.object(retrieval, 'build_index', wraps=retrieval.build_index) as build:
+            self.assertEqual(self.titles('일괄 삭제'), {'남는 노트'})
+        build.assert_not_called()
+
+    def test_other_process_changes_are_replayed(self):
+        note = Note.objects.create(title='원래 제목', content='원래 내용 텍스트')
+        retrieval.get_index()
+        # 신호 없이 DB만 바꾸고 변경 기록을 남김
+        Note.objects.filter(pk=note.pk).update(title='바뀐 제목', content='바뀐 내용 텍스트')
+        self.log_remote_change(('note', note.pk))
+        with mock.patch.object(retrieval, 'build_index', wraps=retrieval.build_index) as build:
+            self.assertEqual(self.titles('내용 텍스트'), {'바뀐 제목'})
+        build.assert_not_called()
+        self.assertEqual(retrieval._version, cache.get(retrieval.VERSION_KEY))
+
+    def test_gap_in_the_log_rebuilds(self):
+        note = Note.objects.create(title='원래 제목', content='원래 내용 텍스트')
+        retrieval.get_index()
+        Note.objects.filter(pk=note.pk).update(title='바뀐 제목')
+        version = self.log_remote_change(('note', note.pk))
+        self.log_remote_change(('note', note.pk))
+        cache.delete(retrieval.CHANGE_KEY.format(version))  # 만료된 기록
+        with mock.patch.object(retrieval, 'build_index', wraps=retrieval.build_index) as build:
+            self.assertEqual(self.titles('내용 텍스트'), {'바뀐 제목'})
+        build.assert_called_once()
+        self.assertEqual(retrieval._version, version + 1)
+
+    def test_cleared_cache_rebuilds(self):
+        retrieval.get_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            Note.objects.create(title='노트', content='캐시 비움')
+        cache.clear()
+        with mock.patch.object(retrieval, 'build_index', wraps=retrieval.build_index) as build:
+            self.assertEqual(self.titles('캐시 비움'), {'노트'})
+        build.assert_called_once()
+
+
+class EmbeddingStoreTests(StubLLMTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        settings = override_settings(AI_EMBEDDINGS_DIR=directory)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        embeddings._store = embeddings._store_mtime = None
+
+        self.note = Note.objects.create(title='배포 자동화', content='GitHub Actions로 Render 배포 파이프라인을 구성했습니다.')
+        self.other = Note.objects.create(title='캐시', content='Redis로 세션과 사이드바 캐시를 공유했습니다.')
+        self.project = Project.objects.create(title='추천 시스템', description='협업 필터링 기반 도서 추천 시스템', technologies='Python')
+
+    def sources(self, query):
+        return {hit.chunk.source for hit in embeddings.similar_chunks(query, k=10)}
+
+    def test_unchanged_chunks_are_reused_by_hash(self):
+        first = embeddings.update_embeddings()
+        self.assertEqual((first.reused, first.embedded), (0, first.chunks))
+
+        requests = self.stub.requests
+        self.note.content += ' 롤백도 자동화했습니다.'
+        self.note.save()
+        second = embeddings.update_embeddings()
+        self.assertEqual((second.chunks, second.reused, second.embedded, second.requests), (first.chunks, first.chunks - 1, 1, 1))
+        self.assertEqual(self.stub.requests, requests + 1)
+
+        store = embeddings.EmbeddingStore.load()
+        row = next(i for i, chunk in enumerate(store.chunks) if chunk.source == ('note', self.note.pk))
+        expected = embeddings._normalize(embeddings.np.array([self.stub.embed(f"{self.note.title}\n{self.note.content}")]))[0]
+        self.assertTrue(embeddings.np.allclose(store.matrix[row], expected, atol=1e-6))
+
+        third = embeddings.update_embeddings()
+        self.assertEqual((third.embedded, third.requests), (0, 0))
+
+    def test_other_model_is_not_mixed_in(self):
+        embeddings.update_embeddings()
+        requests = self.stub.requests
+        with override_settings(OLLAMA_EMBEDDING_MODEL='other-model'):
+            # 저장된 벡터와 다른 모델의 질의 벡터는 비교하지 않음
+            self.assertEqual(embeddings.similar_chunks(self.note.content), [])
+            self.assertEqual(self.stub.requests, requests)
+
+            result = embeddings.update_embeddings()
+            self.assertEqual((result.reused, result.embedded), (0, result.chunks))
+            self.assertEqual(embeddings.EmbeddingStore.load().model, 'other-model')
+            self.assertIn(('note', self.note.pk), self.sources(self.note.content))
+
+    def vector_files(self):
+        return sorted(name for name in os.listdir(embeddings.settings.AI_EMBEDDINGS_DIR) if name.startswith('vectors-'))
+
+    def test_previous_matrix_is_kept_for_one_generation(self):
+        generations = []
+        for text in ('첫째', '둘째', '셋째'):
+            self.note.content = text
+            self.note.save()
+            embeddings.update_embeddings()
+            generations.append(embeddings.EmbeddingStore.load().matrix.filename)
+        names = [os.path.basename(name) for name in generations]
+        self.assertEqual(len(set(names)), 3)
+        self.assertEqual(self.vector_files(), sorted(names[1:]))
+
+    def test_unloadable_store_falls_back(self):
+        embeddings.update_embeddings()
+        store = embeddings.get_store()
+        self.assertIsNotNone(store)
+        path = os.path.join(embeddings.settings.AI_EMBEDDINGS_DIR, embeddings.INDEX_FILE)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'model': store.model, 'vectors': 'vectors-gone.npy', 'rows': []}, f)
+        os.utime(path, ns=(0, 1))
+        with self.assertLogs('ai_search.embeddings', 'WARNING'):
+            self.assertIs(embeddings.get_store(), store)
+
+        embeddings._store = embeddings._store_mtime = None
+        with self.assertLogs('ai_search.embeddings', 'WARNING'):
+            self.assertEqual(embeddings.similar_chunks('배포'), [])
+        # 채팅은 BM25만으로 계속 답함
+        self.assertIn('배포 자동화', retrieval.context_for('배포 파이프라인', embeddings.similar_chunks('배포 파이프라인')))
+
+    def test_no_store_means_no_hits(self):
+        self.assertIsNone(embeddings.get_store())
+        self.assertEqual(embeddings.similar_chunks('배포'), [])
+
+    def test_stale_rows_are_filtered(self):
+        embeddings.update_embeddings()
+        self.assertIn(('note', self.note.pk), self.sources(self.note.content))
+        self.assertIn(('project', self.project.pk), self.sources(self.project.description))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            note_pk = self.note.pk
+            self.note.delete()
+            self.project.is_visible = False
+            self.project.save()
+            self.other.content = 'Memcached로 바꿨습니다.'
+            self.other.save()
+
+        # update_embeddings를 다시 돌리기 전이라 저장소에는 옛 행이 남아 있음
+        stored = {chunk.source for chunk in embeddings.get_store().chunks}
+        self.assertTrue({('note', note_pk), ('project', self.project.pk), ('note', self.other.pk)} <= stored)
+        self.assertNotIn(('note', note_pk), self.sources('GitHub Actions로 Render 배포 파이프라인을 구성했습니다.'))
+        self.assertNotIn(('project', self.project.pk), self.sources(self.project.description))
+        self.assertNotIn(('note', self.other.pk), self.sources('Redis로 세션과 사이드바 캐시를 공유했습니다.'))
+
+        context = retrieval.context_for('Render 배포 파이프라인', embeddings.similar_chunks('Render 배포 파이프라인'))
+        self.assertNotIn('GitHub Actions', context)
+
+
+class ProviderClientTests(StubLLMTestCase):
+    def setUp(self):
+        super().setUp()
+        providers.close_clients()
+        self.addCleanup(providers.close_clients)
+        self.provider = providers.get_provider('local')
+
+    def complete(self, client):
+        return client.chat.completions.create(model=self.provider.model, messages=[]).choices[0].message.content
+
+    def test_sync_client_is_shared_per_process(self):
+        with mock.patch('ai_search.providers.build_client', wraps=providers.build_client) as build:
+            clients = []
+            threads = [threading.Thread(target=lambda: clients.append(providers.get_client(self.provider)))
+                       for _ in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        build.assert_called_once_with(self.provider)
+        self.assertEqual(len({id(client) for client in clients}), 1)
+
+        # 같은 풀을 쓰므로 연속 호출이 연결 하나를 재사용함
+        connections = self.stub.connections
+        for _ in range(3):
+            self.assertEqual(self.complete(clients[0]), '토큰0 토큰1 토큰2')
+        self.assertEqual(self.stub.connections, connections + 1)
+
+    def test_each_base_url_gets_its_own_client(self):
+        client = providers.get_client(self.provider)
+        with override_settings(OLLAMA_BASE_URL='http://127.0.0.1:9/v1'):
+            other = providers.get_client(providers.get_provider('local'))
+        self.assertIsNot(other, client)
+        self.assertIs(providers.get_client(self.provider), client)
+
+        providers.close_clients()
+        self.assertIsNot(providers.get_client(self.provider), client)
+
+    def test_async_clients_are_kept_per_event_loop(self):
+        async def clients():
+            return providers.get_async_client(self.provider), providers.get_async_client(self.provider)
+
+        first, again = asyncio.run(clients())
+        self.assertIs(first, again)
+        second, _ = asyncio.run(clients())
+        self.assertIsNot(second, first)
+
+    @override_settings(AI_CLIENT_TIMEOUT=12, AI_CLIENT_CONNECT_TIMEOUT=3, AI_CLIENT_MAX_RETRIES=1,
+                       AI_CLIENT_MAX_CONNECTIONS=7, AI_CLIENT_MAX_KEEPALIVE=4, AI_CLIENT_KEEPALIVE_EXPIRY=15)
+    def test_limits_and_timeouts_come_from_settings(self):
+        async def async_client():
+            return providers.get_async_client(self.provider)
+
+        for client in (providers.get_client(self.provider), asyncio.run(async_client())):
+            with self.subTest(client=type(client).__name__):
+                self.assertEqual(client.max_retries, 1)
+                for timeout in (client.timeout, client._client.timeout):
+                    self.assertEqual((timeout.connect, timeout.read), (3, 12))
+                pool = client._client._transport._pool
+                self.assertEqual((pool._max_connections, pool._max_keepalive_connections, pool._keepalive_expiry), (7, 4, 15))
+
+
+    def test_benchmark_closes_per_request_clients(self):
+        clients = []
+
+        def client_for():
+            clients.append(providers.build_client(self.provider))
+            return clients[-1]
+
+        times, _ = BenchLLMClients.run(client_for, True, self.provider.model, 3, 1)
+        self.assertEqual(len(times), 3)
+        self.assertTrue(all(client.is_closed() for client in clients))
+
+        # 요청이 실패해도 닫힘
+        failing = mock.Mock()
+        failing.chat.completions.create.side_effect = ConnectionError
+        with self.assertRaises(ConnectionError):
+            BenchLLMClients.run(lambda: failing, True, self.provider.model, 1, 1)
+        failing.close.assert_called_once_with()
+
+
+class PercentileTests(SimpleTestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 21))
+        self.assertEqual(percentile(values, 0.95), 19)
+        self.assertEqual(percentile(values, 0.5), 10)
+        self.assertEqual(percentile([7], 0.95), 7)
+        self.assertEqual(percentile(values, 0), 1)
+
+
+def parse_sse(body):
+    events = []
+    for block in body.decode('utf-8').split('\n\n'):
+        if block:
+            fields = dict(line.split(': ', 1) for line in block.split('\n'))
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+@override_settings(ROOT_URLCONF=__name__, AI_CLIENT_MAX_RETRIES=0, AI_EMBEDDINGS_DIR='/nonexistent/embeddings')
+class ChatStreamTests(StubLLMTestCase):
+    """The sync view, served by the test Client as under WSGI."""
+
+    url = '/chat/sync/'
+    answer = '토큰0 토큰1 토큰2'
+
+    def post(self, message, stream=True, **extra):
+        return self.client.post(self.url, json.dumps({'message': message, 'stream': stream}),
+                                content_type='application/json', **extra)
+
+    def stream(self, message):
+        response = self.post(message)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream; charset=utf-8')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        return parse_sse(b''.join(response.streaming_content))
+
+    def history(self):
+        return self.client.session.get('chat_history')
+
+    def test_tokens_then_done_and_history_saved(self):
+        events = self.stream('Redis를 왜 썼나요?')
+        self.assertEqual([event for event, _ in events], ['token'] * 3 + ['done'])
+        self.assertEqual(''.join(data['text'] for _, data in events[:-1]), self.answer)
+        self.assertEqual(events[-1][1], {'type': 'html', 'content': f'<p>{self.answer}</p>'})
+        self.assertEqual(self.history(), [{'user': 'redis를 왜 썼나요?', 'ai': self.answer}])
+
+        self.stream('두 번째 질문')
+        self.assertEqual(len(self.history()), 2)
+        messages = self.stub.last_request['messages']
+        self.assertEqual(messages[-3:], [
+            {'role': 'user', 'content': 'redis를 왜 썼나요?'},
+            {'role': 'assistant', 'content': self.answer},
+            {'role': 'user', 'content': '두 번째 질문'},
+        ])
+        self.assertTrue(self.stub.last_request['stream'])
+
+    def test_history_keeps_the_last_exchanges(self):
+        for i in range(views.CHAT_HISTORY_LENGTH + 2):
+            self.stream(f'질문 {i}')
+        history = self.history()
+        self.assertEqual(len(history), views.CHAT_HISTORY_LENGTH)
+        self.assertEqual(history[-1]['user'], f'질문 {views.CHAT_HISTORY_LENGTH + 1}')
+
+    def test_accept_header_selects_streaming(self):
+        response = self.post('질문', stream=False, headers={'Accept': 'text/event-stream'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream; charset=utf-8')
+
+    def test_model_error_is_an_error_event(self):
+        with override_settings(OLLAMA_BASE_URL='http://127.0.0.1:9/v1'), self.assertLogs('ai_search.views', 'ERROR'):
+            events = self.stream('질문')
+        self.assertEqual([event for event, _ in events], ['error'])
+        self.assertIn('AI 모델 호출 중 오류', events[0][1]['content'])
+        self.assertEqual(self.history(), [])
+
+    def test_missing_api_key_is_an_error_event(self):
+        with override_settings(AI_SERVICE_PROVIDER='openai', OPENAI_API_KEY=''), self.assertLogs('ai_search.views', 'ERROR'):
+            events = self.stream('질문')
+        self.assertEqual(events, [('error', {'type': 'text', 'content': '관리자에게 문의하세요: OPENAI_API_KEY가 설정되지 않았습니다.'})])
+
+    def test_json_answer_without_stream(self):
+        response = self.post('질문', stream=False)
+        self.assertEqual(response.json(), {'response': {'type': 'html', 'content': f'<p>{self.answer}</p>'}})
+        self.assertEqual(self.history(), [{'user': '질문', 'ai': self.answer}])
+        self.assertFalse(self.stub.last_request.get('stream'))
+
+    def test_rate_limit_is_a_429(self):
+        rate = int(views.CHAT_RATE.split('/')[0])
+        for _ in range(rate):
+            self.assertEqual(self.post('프로젝트', stream=False).status_code, 200)
+        response = self.post('프로젝트', stream=False)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+
+    def test_project_questions_stay_json(self):
+        Project.objects.create(title='포트폴리오 사이트', description='d', technologies='Django')
+        requests = self.stub.requests
+        response = self.post('프로젝트 보여줘')
+        self.assertEqual(response.json()['response']['type'], 'html')
+        self.assertEqual(self.history(), [{'user': '프로젝트 보여줘', 'ai': '프로젝트 목록을 표시했습니다.'}])
+        self.assertEqual(self.stub.requests, requests)
+
+
+class AsyncChatStreamTests(ChatStreamTests):
+    """The async view, served by AsyncClient as under ASGI."""
+
+    url = '/chat/async/'
+
+    def setUp(self):
+        super().setUp()
+        self.client = None  # 이 클래스의 요청은 모두 async_client로 보냄
+
+    async def apost(self, message, stream=True, **extra):
+        return await self.async_client.post(self.url, json.dumps({'message': message, 'stream': stream}),
+                                            content_type='application/json', **extra)
+
+    async def astream(self, message):
+        response = await self.apost(message)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream; charset=utf-8')
+        if not response.is_async:  # 미리 만든 error 이벤트 목록
+            return parse_sse(b''.join(response.streaming_content))
+        return parse_sse(b''.join([part async for part in response.streaming_content]))
+
+    async def ahistory(self):
+        return await (await self.async_client.asession()).aget('chat_history')
+
+    async def test_tokens_then_done_and_history_saved(self):
+        events = await self.astream('Redis를 왜 썼나요?')
+        self.assertEqual([event for event, _ in events], ['token'] * 3 + ['done'])
+        self.assertEqual(events[-1][1], {'type': 'html', 'content': f'<p>{self.answer}</p>'})
+        self.assertEqual(await self.ahistory(), [{'user': 'redis를 왜 썼나요?', 'ai': self.answer}])
+
+        await self.astream('두 번째 질문')
+        self.assertEqual(len(await self.ahistory()), 2)
+        self.assertEqual(self.stub.last_request['messages'][-2], {'role': 'assistant', 'content': self.answer})
+
+    async def test_history_keeps_the_last_exchanges(self):
+        for i in range(views.CHAT_HISTORY_LENGTH + 2):
+            await self.astream(f'질문 {i}')
+        self.assertEqual(len(await self.ahistory()), views.CHAT_HISTORY_LENGTH)
+
+    async def test_accept_header_selects_streaming(self):
+        response = await self.apost('질문', stream=False, headers={'Accept': 'text/event-stream'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream; charset=utf-8')
+
+    async def test_model_error_is_an_error_event(self):
+        with override_settings(OLLAMA_BASE_URL='http://127.0.0.1:9/v1'), self.assertLogs('ai_search.views', 'ERROR'):
+            events = await self.astream('질문')
+        self.assertEqual([event for event, _ in events], ['error'])
+        self.assertEqual(await self.ahistory(), [])
+
+    async def test_missing_api_key_is_an_error_event(self):
+        with override_settings(AI_SERVICE_PROVIDER='openai', OPENAI_API_KEY=''), self.assertLogs('ai_search.views', 'ERROR'):
+            events = await self.astream('질문')
+        self.assertEqual([event for event, _ in events], ['error'])
+
+    async def test_json_answer_without_stream(self):
+        response = await self.apost('질문', stream=False)
+        self.assertEqual(response.json(), {'response': {'type': 'html', 'content': f'<p>{self.answer}</p>'}})
+        self.assertEqual(await self.ahistory(), [{'user': '질문', 'ai': self.answer}])
+
+    async def test_project_questions_stay_json(self):
+        await Project.objects.acreate(title='포트폴리오 사이트', description='d', technologies='Django')
+        response = await self.apost('프로젝트 보여줘')
+        self.assertEqual(response.json()['response']['type'], 'html')
+        self.assertEqual(await self.ahistory(), [{'user': '프로젝트 보여줘', 'ai': '프로젝트 목록을 표시했습니다.'}])
+
+    async def test_rate_limit_is_a_429(self):
+        rate = int(views.CHAT_RATE.split('/')[0])
+        for _ in range(rate):
+            response = await self.apost('프로젝트', stream=False)
+            self.assertEqual(response.status_code, 200)
+        response = await self.apost('프로젝트', stream=False)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+        self.assertIn('error', response.json())
+        # 같은 IP의 동기 뷰 요청도 같은 버킷에서 차감됨
+        response = await self.async_client.post('/chat/sync/', json.dumps({'message': '프로젝트'}), content_type='application/json')
+        self.assertEqual(response.status_code, 429)
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
@@ -5,5 +6,7 @@ app_name = 'ai_search'
 
 urlpatterns = [
     path('', views.ai_search_view, name='search'),
-    path('chat/', views.chat_interaction, name='chat_interaction'),
+    # ASGI로 실행할 때(AI_CHAT_ASYNC)는 비동기 뷰가 같은 주소를 처리
+    path('chat/', views.chat_interaction_async if settings.AI_CHAT_ASYNC else views.chat_interaction,
+         name='chat_interaction'),
 ]
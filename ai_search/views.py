@@ -1,37 +1,201 @@
 import json
-import os
+import time
 import markdown
-from openai import OpenAI, AuthenticationError
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from openai import AuthenticationError
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.template.loader import render_to_string
 from projects.models import Project
+from projects.technologies import detect_technologies
+from . import embeddings, retrieval
+from .providers import MissingAPIKey, get_async_client, get_client, get_provider
+from django_ratelimit.core import is_ratelimited
 from django_ratelimit.decorators import ratelimit
+from django_ratelimit.exceptions import Ratelimited
 import logging
 import traceback # Import traceback
 
 logger = logging.getLogger(__name__)
 
+CHAT_HISTORY_LENGTH = 4  # exchanges kept in the session
+CHAT_RATE = '10/m'
+CHAT_RATELIMIT_GROUP = 'ai_search.views.chat_interaction'  # shared by the sync and async views
+CHAT_TEMPERATURE = 0.7
+NO_CONTEXT = "질문과 관련된 포트폴리오 정보가 없습니다."
+SYSTEM_PROMPT = (
+    "You are an AI assistant representing the developer (b-hyoung) in a mock job interview setting. "
+    "An interviewer will ask you questions about the developer's projects, skills, and experience. "
+    "Your task is to answer these questions *as if you were the developer*, using only the provided context about their portfolio information. "
+    "Provide clear, detailed, and professional answers. Do not ask questions to the interviewer. "
+    "Focus on showcasing the developer's expertise and accomplishments. **You must always answer in Korean.**"
+)
+
+
+def _build_messages(history, user_message, project_context):
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "system", "content": f"## 포트폴리오 프로젝트 정보:\n{project_context}"}
+    ]
+    for h in history:
+        messages.append({"role": "user", "content": h['user']})
+        messages.append({"role": "assistant", "content": h['ai']})
+    messages.append({"role": "user", "content": user_message})
+    return messages
+
+
+def _project_response(user_message):
+    """Project cards for portfolio questions, or {} when the message should go to the model."""
+    if '프로젝트' in user_message or '포트폴리오' in user_message or '뭐했어' in user_message or '뭐 했어' in user_message:
+        projects_query = Project.objects.for_display().with_stack().filter(is_visible=True).order_by('-created_at')
+
+        # Re-introduce tech filtering
+        detected_techs = detect_technologies(user_message)
+        if detected_techs:
+            tech_to_filter = detected_techs[0]
+            projects_query = projects_query.filter(tech_stack__slug=tech_to_filter)
+
+        projects_to_display = projects_query[:4] # Display up to 4 projects
+
+        if projects_to_display.exists():
+            rendered_html = render_to_string('ai_search/_project_cards.html', {'projects': projects_to_display})
+            return {'type': 'html', 'content': rendered_html}
+        return {'type': 'text', 'content': '현재 등록된 프로젝트가 없습니다.'}
+    return {}
+
+
+def _project_context(user_message):
+    """
+    Portfolio chunks relevant to the message: BM25 over projects, notes, posts and
+    the knowledge base, fused with embedding neighbours once update_embeddings has run.
+    """
+    return retrieval.context_for(user_message, embeddings.similar_chunks(user_message)) or NO_CONTEXT
+
+
+def _history_content(ai_response):
+    # For predefined responses, save a simplified text to history, NOT the raw HTML
+    return "프로젝트 목록을 표시했습니다." if ai_response.get('type') == 'html' else ai_response.get('content', '')
+
+
+def _remember(request, history, user_message, ai_content):
+    history.append({'user': user_message, 'ai': ai_content})
+    request.session['chat_history'] = history[-CHAT_HISTORY_LENGTH:]
+
+
+def _auth_error(ai_provider):
+    return {'type': 'text', 'content': f"AI 서비스 인증 오류가 발생했습니다. ('{ai_provider}'). 관리자에게 문의하세요."}
+
+
+def _call_error(ai_provider):
+    return {'type': 'text', 'content': f"AI 모델 호출 중 오류가 발생했습니다. ('{ai_provider}'). 서버 로그를 확인하세요."}
+
+
+def _wants_stream(request, data):
+    return bool(data.get('stream')) or 'text/event-stream' in request.headers.get('Accept', '')
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _sse_response(events):
+    response = StreamingHttpResponse(events, content_type='text/event-stream; charset=utf-8')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx가 스트림을 버퍼링하지 않도록
+    return response
+
+
+def _stream_chat(request, client, model, ai_provider, messages, history, user_message):
+    """
+    Relay the completion as SSE: a `token` event per delta, then `done` with the
+    rendered Markdown (or `error`). History is saved only after the stream ends.
+    """
+    started = time.monotonic()
+    parts = []
+    try:
+        stream = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=CHAT_TEMPERATURE,
+            stream=True,
+        )
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if not parts:
+                _log_first_token(ai_provider, model, started)
+            parts.append(delta)
+            yield _sse('token', {'text': delta})
+    except Exception as e:
+        yield _sse('error', _stream_error(ai_provider, e))
+        return
+
+    ai_text_response = _log_stream_end(ai_provider, model, started, parts)
+    # 미들웨어가 응답 시작 시점에 이미 세션을 저장했으므로 여기서 직접 저장
+    _remember(request, history, user_message, ai_text_response)
+    request.session.save()
+    yield _sse('done', {'type': 'html', 'content': markdown.markdown(ai_text_response)})
+
+
+async def _stream_chat_async(request, client, model, ai_provider, messages, history, user_message):
+    """_stream_chat on AsyncOpenAI: waiting for tokens does not hold a thread."""
+    started = time.monotonic()
+    parts = []
+    try:
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=CHAT_TEMPERATURE,
+            stream=True,
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if not parts:
+                _log_first_token(ai_provider, model, started)
+            parts.append(delta)
+            yield _sse('token', {'text': delta})
+    except Exception as e:
+        yield _sse('error', _stream_error(ai_provider, e))
+        return
+
+    ai_text_response = _log_stream_end(ai_provider, model, started, parts)
+    _remember(request, history, user_message, ai_text_response)
+    await request.session.asave()
+    yield _sse('done', {'type': 'html', 'content': markdown.markdown(ai_text_response)})
+
+
+def _log_first_token(ai_provider, model, started):
+    logger.info(f"AI stream ({ai_provider}, {model}): first token after {(time.monotonic() - started) * 1000:.0f} ms")
+
+
+def _log_stream_end(ai_provider, model, started, parts):
+    ai_text_response = ''.join(parts)
+    logger.info(f"AI stream ({ai_provider}, {model}): {len(ai_text_response)} chars in {time.monotonic() - started:.2f}s")
+    return ai_text_response
+
+
+def _stream_error(ai_provider, e):
+    if isinstance(e, AuthenticationError):
+        logger.error(f"AI Service AuthenticationError for provider '{ai_provider}': {e}")
+        return _auth_error(ai_provider)
+    logger.error(f"Error during AI stream for provider '{ai_provider}': {e}", exc_info=True)
+    return _call_error(ai_provider)
+
+
+def chat_rate_limited(request, exception):
+    """RATELIMIT_VIEW: RatelimitMiddleware turns Ratelimited from either chat view into a 429."""
+    response = JsonResponse({'error': '요청이 너무 많습니다. 잠시 후 다시 시도해 주세요.'}, status=429)
+    response['Retry-After'] = '60'  # CHAT_RATE의 창 길이
+    return response
 
-# --- Tech Name Mapping ---
-TECH_MAP = {
-    '파이썬': 'python', 'python': 'python',
-    '장고': 'django', 'django': 'django',
-    '리액트': 'react', 'react': 'react',
-    '도커': 'docker', 'docker': 'docker',
-    '자바스크립트': 'javascript', 'javascript': 'javascript',
-    '자바': 'java', 'java': 'java',
-    'mysql': 'mysql', 'sql': 'mysql', '마이에스큐엘': 'mysql',
-    'postgresql': 'postgresql', '포스트그레스큐엘': 'postgresql',
-    'aws': 'aws', '아마존 웹 서비스': 'aws',
-    '넥스트js': 'nextjs', 'nextjs': 'nextjs', 'next.js': 'nextjs',
-    '파이어베이스': 'firebase', 'firebase': 'firebase',
-    '테일윈드css': 'tailwindcss', 'tailwindcss': 'tailwindcss', 'tailwind': 'tailwindcss',
-    '소켓': 'socket', 'socket': 'socket',
-    '올라마': 'ollama', 'ollama': 'ollama', 'llama3.1': 'ollama', 'llama': 'ollama',
-    '스프링 부트': 'spring boot', 'spring boot': 'spring boot',
-    '깃': 'git', 'git': 'git', 'github': 'git', '깃허브': 'git',
-}
 
 def ai_search_view(request):
     """
@@ -39,10 +203,14 @@ def ai_search_view(request):
     """
     return render(request, 'ai_search/ai_search.html', {'hide_layout_elements': True})
 
-@ratelimit(key='ip', rate='10/m', block=True)
+@ratelimit(group=CHAT_RATELIMIT_GROUP, key='ip', rate=CHAT_RATE, block=True)
 def chat_interaction(request):
     """
     Handles conversational AJAX requests using an OpenAI RAG pattern.
+
+    With {"stream": true} in the body (or Accept: text/event-stream) the model's
+    answer is sent as Server-Sent Events while it is generated; rule-based
+    answers such as the project list stay plain JSON.
     """
     if request.method != 'POST':
         return JsonResponse({'error': 'Invalid request method'}, status=405)
@@ -50,119 +218,61 @@ def chat_interaction(request):
     try: # Outer try-except to catch any unexpected error during initial processing
         data = json.loads(request.body)
         user_message = data.get('message', '').lower().strip()
+        stream = _wants_stream(request, data)
         history = request.session.get('chat_history', [])
-        ai_response = {}
-        
+
         # --- Priority 1: Project-related queries ---
-        if '프로젝트' in user_message or '포트폴리오' in user_message or '뭐했어' in user_message or '뭐 했어' in user_message:
-            projects_query = Project.objects.filter(is_visible=True).order_by('-created_at')
-            
-            # Re-introduce tech filtering
-            detected_techs = list(set([TECH_MAP[key] for key in TECH_MAP if key in user_message if key in TECH_MAP]))
-            if detected_techs:
-                tech_to_filter = detected_techs[0]
-                projects_query = projects_query.filter(technologies__iregex=fr'\b{tech_to_filter}\b')
-
-            projects_to_display = projects_query[:4] # Display up to 4 projects
-            
-            if projects_to_display.exists():
-                rendered_html = render_to_string('ai_search/_project_cards.html', {'projects': projects_to_display})
-                ai_response = {'type': 'html', 'content': rendered_html}
-            else:
-                ai_response = {'type': 'text', 'content': '현재 등록된 프로젝트가 없습니다.'}
-        
+        ai_response = _project_response(user_message)
+
         # If ai_response is already set by project logic, skip OpenAI call
         if ai_response:
-            # For predefined responses, save a simplified text to history, NOT the raw HTML
-            history_ai_content = "프로젝트 목록을 표시했습니다." if ai_response.get('type') == 'html' else ai_response.get('content', '')
-            history.append({'user': user_message, 'ai': history_ai_content})
-            request.session['chat_history'] = history[-4:] # Keep last 4 exchanges
+            _remember(request, history, user_message, _history_content(ai_response))
             return JsonResponse({'response': ai_response})
 
         # --- RAG: Retrieve Context from Database (if no specific rule matched) ---
-        # TEMPORARY TEST: Force a very short context to check if code changes are being deployed.
-        project_context = "This is a temporary deployment test."
-
+        project_context = _project_context(user_message)
 
         # --- Dynamic AI Service Selection ---
-        # 환경 변수 'AI_SERVICE_PROVIDER' 값에 따라 사용할 AI 서비스를 선택합니다.
-        # 'openai' 또는 'local'을 값으로 가집니다. 기본값은 'openai' 입니다.
-        ai_provider = os.environ.get("AI_SERVICE_PROVIDER", "openai").lower()
-
-        # --- Prepare messages for AI API (Common for both services) ---
-        formatted_history = []
-        for h in history:
-            formatted_history.append({"role": "user", "content": h['user']})
-            formatted_history.append({"role": "assistant", "content": h['ai']})
-
-        system_prompt = (
-            "You are an AI assistant representing the developer (b-hyoung) in a mock job interview setting. "
-            "An interviewer will ask you questions about the developer's projects, skills, and experience. "
-            "Your task is to answer these questions *as if you were the developer*, using only the provided context about their portfolio information. "
-            "Provide clear, detailed, and professional answers. Do not ask questions to the interviewer. "
-            "Focus on showcasing the developer's expertise and accomplishments. **You must always answer in Korean.**"
-        )
-        
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "system", "content": f"## 포트폴리오 프로젝트 정보:\n{project_context}"}
-        ]
-        messages.extend(formatted_history)
-        messages.append({"role": "user", "content": user_message})
+        # 설정 AI_SERVICE_PROVIDER 값('openai' 또는 'local')에 따라 사용할 AI 서비스를 선택합니다.
+        # 클라이언트는 프로세스마다 한 번 만들어 재사용합니다 (ai_search.providers).
+        ai_provider = settings.AI_SERVICE_PROVIDER
+        messages = _build_messages(history, user_message, project_context)
+
+        try:
+            provider = get_provider(ai_provider)
+        except MissingAPIKey:
+            logger.error("OPENAI_API_KEY is not set for the 'openai' provider.")
+            ai_response = {'type': 'text', 'content': '관리자에게 문의하세요: OPENAI_API_KEY가 설정되지 않았습니다.'}
+            if stream:
+                return _sse_response([_sse('error', ai_response)])
+            return JsonResponse({'response': ai_response})
+        client, model = get_client(provider), provider.model
+
+        if stream:
+            # 세션 쿠키는 응답 헤더와 함께 나가야 하므로 스트림 시작 전에 세션을 만들어 둠
+            request.session['chat_history'] = history[-CHAT_HISTORY_LENGTH:]
+            return _sse_response(_stream_chat(request, client, model, ai_provider, messages, history, user_message))
 
         # --- Call AI Service based on provider ---
         try:
-            if ai_provider == 'local':
-                # --- Use Local AI (Ollama) ---
-                ollama_base_url = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434/v1")
-                # 사용자가 지정한 모델 'llama3:instruct'를 기본값으로 설정합니다.
-                ollama_model_name = os.environ.get("OLLAMA_MODEL_NAME", "llama3:instruct")
-
-                client = OpenAI(
-                    base_url=ollama_base_url,
-                    api_key='ollama', # Ollama는 api_key가 필요 없습니다.
-                )
-                
-                logger.info(f"Connecting to Local AI: {ollama_base_url} with model {ollama_model_name}")
-                
-                completion = client.chat.completions.create(
-                    model=ollama_model_name,
-                    messages=messages,
-                    temperature=0.7,
-                )
-            else: # Default to OpenAI
-                # --- Use OpenAI ---
-                api_key = os.environ.get("OPENAI_API_KEY")
-                if not api_key:
-                    logger.error("OPENAI_API_KEY is not set for the 'openai' provider.")
-                    return JsonResponse({
-                        'response': {'type': 'text', 'content': '관리자에게 문의하세요: OPENAI_API_KEY가 설정되지 않았습니다.'}
-                    })
-                
-                client = OpenAI(api_key=api_key)
-                
-                logger.info("Connecting to OpenAI API with model gpt-3.5-turbo")
-                
-                completion = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=messages,
-                    temperature=0.7,
-                )
+            completion = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=CHAT_TEMPERATURE,
+            )
 
             # --- Process and Save Response (Common for both services) ---
             ai_text_response = completion.choices[0].message.content
             ai_response = {'type': 'html', 'content': markdown.markdown(ai_text_response)}
-            
-            history.append({'user': user_message, 'ai': ai_text_response}) 
-            request.session['chat_history'] = history[-4:] 
+            _remember(request, history, user_message, ai_text_response)
 
         except AuthenticationError as e:
             logger.error(f"AI Service AuthenticationError for provider '{ai_provider}': {e}")
-            ai_response = {'type': 'text', 'content': f"AI 서비스 인증 오류가 발생했습니다. ('{ai_provider}'). 관리자에게 문의하세요."}
+            ai_response = _auth_error(ai_provider)
         except Exception as e:
             logger.error(f"Error during AI call for provider '{ai_provider}': {e}", exc_info=True)
-            ai_response = {'type': 'text', 'content': f"AI 모델 호출 중 오류가 발생했습니다. ('{ai_provider}'). 서버 로그를 확인하세요."}
-        
+            ai_response = _call_error(ai_provider)
+
         return JsonResponse({'response': ai_response})
 
     except json.JSONDecodeError as e:
@@ -172,3 +282,72 @@ def chat_interaction(request):
         logger.error(f"Unhandled exception in chat_interaction: {e}", exc_info=True)
         return JsonResponse({'error': f'An unexpected error occurred: {str(e)}'}, status=500)
 
+
+
+async def chat_interaction_async(request):
+    """
+    chat_interaction for ASGI deployments (see mysite/asgi.py). The model call
+    is awaited on AsyncOpenAI, so an in-flight chat costs a coroutine instead of
+    a worker; sessions use the async session API and ORM work for the project
+    cards runs through sync_to_async.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request method'}, status=405)
+    # django_ratelimit's decorator is sync-only; same bucket as the sync view
+    if await sync_to_async(is_ratelimited)(request=request, group=CHAT_RATELIMIT_GROUP, key='ip',
+                                           rate=CHAT_RATE, increment=True):
+        raise Ratelimited()
+
+    try:
+        data = json.loads(request.body)
+        user_message = data.get('message', '').lower().strip()
+        stream = _wants_stream(request, data)
+        history = await request.session.aget('chat_history', [])
+
+        ai_response = await sync_to_async(_project_response)(user_message)
+        if ai_response:
+            _remember(request, history, user_message, _history_content(ai_response))
+            return JsonResponse({'response': ai_response})
+
+        project_context = await sync_to_async(_project_context)(user_message)
+        ai_provider = settings.AI_SERVICE_PROVIDER
+        messages = _build_messages(history, user_message, project_context)
+
+        try:
+            provider = get_provider(ai_provider)
+        except MissingAPIKey:
+            logger.error("OPENAI_API_KEY is not set for the 'openai' provider.")
+            ai_response = {'type': 'text', 'content': '관리자에게 문의하세요: OPENAI_API_KEY가 설정되지 않았습니다.'}
+            if stream:
+                return _sse_response([_sse('error', ai_response)])
+            return JsonResponse({'response': ai_response})
+        client, model = get_async_client(provider), provider.model
+
+        if stream:
+            request.session['chat_history'] = history[-CHAT_HISTORY_LENGTH:]
+            return _sse_response(_stream_chat_async(request, client, model, ai_provider, messages, history, user_message))
+
+        try:
+            completion = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=CHAT_TEMPERATURE,
+            )
+            ai_text_response = completion.choices[0].message.content
+            ai_response = {'type': 'html', 'content': markdown.markdown(ai_text_response)}
+            _remember(request, history, user_message, ai_text_response)
+        except AuthenticationError as e:
+            logger.error(f"AI Service AuthenticationError for provider '{ai_provider}': {e}")
+            ai_response = _auth_error(ai_provider)
+        except Exception as e:
+            logger.error(f"Error during AI call for provider '{ai_provider}': {e}", exc_info=True)
+            ai_response = _call_error(ai_provider)
+
+        return JsonResponse({'response': ai_response})
+
+    except json.JSONDecodeError as e:
+        logger.error(f"JSONDecodeError in chat_interaction_async: {e}", exc_info=True)
+        return JsonResponse({'error': 'Invalid JSON payload'}, status=400)
+    except Exception as e:
+        logger.error(f"Unhandled exception in chat_interaction_async: {e}", exc_info=True)
+        return JsonResponse({'error': f'An unexpected error occurred: {str(e)}'}, status=500)
@@ -0,0 +1,102 @@
+"""
+Field definitions for the read-only API.
+
+Each resource maps public field names to the model columns they need, a getter
+and an optional prefetch, so a request for ?fields=id,title loads exactly those
+columns and nothing else. Heavy fields (note/post content, the legacy Base64
+project image) are never part of the defaults.
+"""
+from typing import Callable, NamedTuple, Optional
+
+from blog.models import Post
+from notes.models import Note
+from projects.models import Project
+
+
+class Field(NamedTuple):
+    columns: tuple
+    get: Callable
+    prefetch: Optional[Callable] = None
+
+
+class Resource(NamedTuple):
+    name: str
+    queryset: Callable
+    fields: dict
+    defaults: tuple
+
+    def select(self, names):
+        """Queryset loading only what `names` need."""
+        columns = {'id', 'created_at'}  # keyset pagination orders by (created_at, id)
+        queryset = self.queryset()
+        for name in names:
+            field = self.fields[name]
+            columns.update(field.columns)
+            if field.prefetch:
+                queryset = field.prefetch(queryset)
+        return queryset.only(*columns)
+
+    def serialize(self, obj, names):
+        return {name: self.fields[name].get(obj) for name in names}
+
+
+def _column(name):
+    return Field((name,), lambda obj: getattr(obj, name))
+
+
+def _timestamp(name):
+    return Field((name,), lambda obj: getattr(obj, name).isoformat())
+
+
+def _rendered():
+    return Field(('content', 'content_html', 'content_html_key'), lambda obj: str(obj.rendered_content))
+
+
+PROJECTS = Resource(
+    name='projects',
+    queryset=lambda: Project.objects.all(),
+    fields={
+        'id': _column('id'),
+        'title': _column('title'),
+        'description': _column('description'),
+        'technologies': _column('technologies'),
+        'stack': Field((), lambda p: [tech.name for tech in p.stack], lambda qs: qs.with_stack()),
+        'live_link': _column('live_link'),
+        'source_link': _column('source_link'),
+        'image_url': Field(('image_file',), lambda p: p.image_url, lambda qs: qs.with_legacy_flag()),
+        'image_variants': _column('image_variants'),
+        'image_data': _column('image_data'),
+        'created_at': _timestamp('created_at'),
+    },
+    defaults=('id', 'title', 'description', 'stack', 'live_link', 'source_link', 'image_url', 'created_at'),
+)
+
+NOTES = Resource(
+    name='notes',
+    queryset=lambda: Note.objects.all(),
+    fields={
+        'id': _column('id'),
+        'title': _column('title'),
+        'content': _column('content'),
+        'content_html': _rendered(),
+        'tags': Field((), lambda n: [tag.name for tag in n.tags.all()], lambda qs: qs.prefetch_related('tags')),
+        'created_at': _timestamp('created_at'),
+        'updated_at': _timestamp('updated_at'),
+    },
+    defaults=('id', 'title', 'tags', 'created_at', 'updated_at'),
+)
+
+POSTS = Resource(
+    name='posts',
+    queryset=lambda: Post.objects.all(),
+    fields={
+        'id': _column('id'),
+        'title': _column('title'),
+        'content': _column('content'),
+        'content_html': _rendered(),
+        'created_at': _timestamp('created_at'),
+    },
+    defaults=('id', 'title', 'created_at'),
+)
+
+RESOURCES = {resource.name: resource for resource in (PROJECTS, NOTES, POSTS)}
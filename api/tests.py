@@ -0,0 +1,106 @@
+from unittest import skipIf
+
+from django.test import TestCase
+from django.urls import reverse
+
+from blog.models import Post
+from notes.models import Note
+from projects.models import Project
+
+from . import views
+
+
+class ReadApiTests(TestCase):
+    """Every endpoint runs a fixed number of queries and sends heavy fields only on request."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(3):
+            Project.objects.create(
+                title=f'Project {i}', description='desc', technologies='Python, Django',
+                image_data='data:image/png;base64,AAAA',
+            )
+            note = Note.objects.create(title=f'Note {i}', content=f'**body {i}**')
+            note.tags.add('django', f'tag{i}')
+            Post.objects.create(title=f'Post {i}', content=f'# Post body {i}')
+        cls.note = note
+
+    def get(self, name, queries, **params):
+        with self.assertNumQueries(queries):
+            response = self.client.get(reverse(f'api:{name}'), params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_projects_list(self):
+        # projects + prefetched stack
+        data = self.get('projects_list', 2).json()['data']
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data[0]['stack'], ['Python', 'Django'])
+        self.assertNotIn('image_data', data[0])
+
+    def test_projects_sparse_fields(self):
+        data = self.get('projects_list', 1, fields='id,title').json()['data']
+        self.assertEqual(set(data[0]), {'id', 'title'})
+        data = self.get('projects_list', 1, fields='image_data').json()['data']
+        self.assertEqual(data[0]['image_data'], 'data:image/png;base64,AAAA')
+
+    def test_notes_list(self):
+        # notes + prefetched tags
+        data = self.get('notes_list', 2).json()['data']
+        self.assertEqual(len(data), 3)
+        self.assertIn('django', data[0]['tags'])
+        self.assertNotIn('content', data[0])
+
+    def test_notes_content_on_request(self):
+        data = self.get('notes_list', 1, fields='id,content,content_html').json()['data']
+        self.assertEqual(data[0]['content'], '**body 2**')
+        self.assertEqual(data[0]['content_html'], '<p><strong>body 2</strong></p>')
+
+    def test_posts_list(self):
+        data = self.get('posts_list', 1).json()['data']
+        self.assertEqual([post['title'] for post in data], ['Post 2', 'Post 1', 'Post 0'])
+        self.assertNotIn('content', data[0])
+
+    def test_detail_endpoints(self):
+        project = Project.objects.first()
+        post = Post.objects.first()
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('api:projects_detail', args=[project.pk]))
+        self.assertEqual(response.json()['data']['title'], project.title)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('api:notes_detail', args=[self.note.pk]))
+        self.assertEqual(response.json()['data']['title'], 'Note 2')
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('api:posts_detail', args=[post.pk]))
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('api:posts_detail', args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_keyset_pagination(self):
+        first = self.get('notes_list', 1, fields='title', limit=2).json()
+        self.assertEqual([n['title'] for n in first['data']], ['Note 2', 'Note 1'])
+        second = self.get('notes_list', 1, fields='title', limit=2, cursor=first['next_cursor']).json()
+        self.assertEqual([n['title'] for n in second['data']], ['Note 0'])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_etag_revalidation(self):
+        response = self.get('posts_list', 1)
+        with self.assertNumQueries(1):
+            cached = self.client.get(reverse('api:posts_list'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_bad_requests(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('api:notes_list'), {'fields': 'title,password'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(reverse('api:notes_list'), {'limit': '1000'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('api:notes_list'), {'cursor': '!!'}).status_code, 400)
+
+    @skipIf(views.msgpack is None, 'msgpack is not installed')
+    def test_msgpack_encoding(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('api:posts_list'), HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        data = views.msgpack.unpackb(response.content)
+        self.assertEqual(data['data'][0]['title'], 'Post 2')
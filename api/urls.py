@@ -0,0 +1,11 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('projects/', views.resource_list, {'resource': 'projects'}, name='projects_list'),
+    path('projects/<int:pk>/', views.resource_detail, {'resource': 'projects'}, name='projects_detail'),
+    path('notes/', views.resource_list, {'resource': 'notes'}, name='notes_list'),
+    path('notes/<int:pk>/', views.resource_detail, {'resource': 'notes'}, name='notes_detail'),
+    path('posts/', views.resource_list, {'resource': 'posts'}, name='posts_list'),
+    path('posts/<int:pk>/', views.resource_detail, {'resource': 'posts'}, name='posts_detail'),
+]
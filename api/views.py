@@ -0,0 +1,122 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+
+from notes.pagination import decode_cursor, keyset_page
+
+from .resources import RESOURCES
+
+try:
+    import msgpack
+except ImportError:  # optional: only needed for the compact encoding
+    msgpack = None
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MSGPACK_TYPES = ('application/msgpack', 'application/x-msgpack')
+API_CACHE_CONTROL = 'no-cache'
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _wants_msgpack(request):
+    fmt = request.GET.get('format')
+    if fmt:
+        return fmt == 'msgpack'
+    accept = request.headers.get('Accept', '')
+    return any(media_type in accept for media_type in MSGPACK_TYPES)
+
+
+def _encode(request, data):
+    """(body, content type) in JSON, or MessagePack when the client asks for it."""
+    if _wants_msgpack(request):
+        if msgpack is None:
+            raise ApiError('MessagePack encoding is not available on this server.', status=406)
+        return msgpack.packb(data, use_bin_type=True), MSGPACK_TYPES[0]
+    body = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':'))
+    return body.encode('utf-8'), 'application/json'
+
+
+def _respond(request, data, status=200):
+    try:
+        body, content_type = _encode(request, data)
+    except ApiError as e:
+        body, content_type = json.dumps({'error': str(e)}).encode('utf-8'), 'application/json'
+        status = e.status
+
+    response = None
+    etag = None
+    if status == 200:
+        # 본문 해시로 ETag를 만들어 바뀌지 않은 응답은 304로 돌려줌
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type=content_type, status=status)
+    if etag:
+        response['ETag'] = etag
+    response['Cache-Control'] = API_CACHE_CONTROL
+    patch_vary_headers(response, ['Accept'])
+    return response
+
+
+def _field_names(request, resource):
+    raw = request.GET.get('fields')
+    if not raw:
+        return resource.defaults
+    names = tuple(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    unknown = [name for name in names if name not in resource.fields]
+    if unknown:
+        raise ApiError(f"Unknown field(s) for {resource.name}: {', '.join(unknown)}. "
+                       f"Available: {', '.join(resource.fields)}.")
+    return names
+
+
+def _page_size(request):
+    raw = request.GET.get('limit')
+    if raw is None:
+        return DEFAULT_PAGE_SIZE
+    if not raw.isdigit() or not 1 <= int(raw) <= MAX_PAGE_SIZE:
+        raise ApiError(f'limit must be between 1 and {MAX_PAGE_SIZE}.')
+    return int(raw)
+
+
+def resource_list(request, resource):
+    """
+    A page of a resource, newest first: {"data": [...], "next_cursor": "..."}.
+    ?fields= picks the fields, ?limit= the page size and ?cursor= continues from a previous page.
+    """
+    resource = RESOURCES[resource]
+    try:
+        names = _field_names(request, resource)
+        page_size = _page_size(request)
+        cursor = request.GET.get('cursor')
+        if cursor and decode_cursor(cursor) is None:
+            raise ApiError('Malformed cursor.')
+    except ApiError as e:
+        return _respond(request, {'error': str(e)}, status=e.status)
+
+    objects, next_cursor = keyset_page(resource.select(names), cursor, page_size)
+    return _respond(request, {
+        'data': [resource.serialize(obj, names) for obj in objects],
+        'next_cursor': next_cursor,
+    })
+
+
+def resource_detail(request, resource, pk):
+    resource = RESOURCES[resource]
+    try:
+        names = _field_names(request, resource)
+    except ApiError as e:
+        return _respond(request, {'error': str(e)}, status=e.status)
+
+    obj = resource.select(names).filter(pk=pk).first()
+    if obj is None:
+        raise Http404(f'No such {resource.name} item.')
+    return _respond(request, {'data': resource.serialize(obj, names)})
@@ -1,4 +1,13 @@
 from django.contrib import admin
-from .models import Post
+from .models import ExternalPost, FeedState, Post
 # Register your models here.
-admin.site.register(Post)
\ No newline at end of file
+admin.site.register(Post)
+
+
+@admin.register(ExternalPost)
+class ExternalPostAdmin(admin.ModelAdmin):
+    list_display = ('title', 'source', 'published_at')
+    list_filter = ('source',)
+
+
+admin.site.register(FeedState)
@@ -1,37 +1,33 @@
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+from mysite.caching import is_shared
+from projects import cache as projects_cache
 from projects.models import Project
+from projects.technologies import lookup as tech_lookup
 from .tistory import fetch_tistory_posts
 
+# Sidebar data is wrapped in SimpleLazyObject: it is computed (once) only when a
+# template actually iterates it, so pages with hide_layout_elements and plain
+# fragments pay nothing.
+
 def recent_posts(request):
-    recent_posts = fetch_tistory_posts(limit=5)
-    return {'recent_posts': recent_posts}
+    return {'recent_posts': SimpleLazyObject(lambda: fetch_tistory_posts(limit=5))}
 
-def sidebar_projects(request):
-    # Skill to color mapping based on the image
-    skill_color_map = {
-        'Python': 'teal', 'Java': 'teal', 'JavaScript': 'teal',
-        'NextJs': 'purple', 'Spring Boot': 'purple', 'React': 'purple', 'Django': 'purple',
-        'Docker': 'teal', 'Git & GitHub': 'teal', 'PostgreSQL': 'teal', 'AWS': 'teal', 'aws': 'teal',
-        'MySQL': 'purple', 'MongoDB': 'purple',
-        'Docker Compose': 'teal', 'Kubernetes': 'teal',
-        'Socket': 'purple', 'Ollama(llama3.1)': 'purple',
-        'TailwindCss': 'purple', 'TainwindCss': 'purple', # Handle potential typo
-    }
+SIDEBAR_CACHE_KEY = 'sidebar_projects'
+SIDEBAR_CACHE_SECONDS = 60 * 60 * 24
+# A per-process cache only sees its own version bumps, so other workers rely on expiry.
+SIDEBAR_LOCAL_CACHE_SECONDS = 60
+
+def _build_sidebar_projects():
+    projects = Project.objects.only('id', 'title').with_stack().filter(is_visible=True).order_by('-created_at')[:4]
 
-    projects = Project.objects.filter(is_visible=True).order_by('-created_at')[:4]
-    
     project_data = []
     for project in projects:
-        techs_raw_from_comma = [tech.strip() for tech in project.technologies.split(',') if tech.strip()]
-        
-        techs_final = []
-        for tech_chunk in techs_raw_from_comma:
-            techs_final.extend([t.strip() for t in tech_chunk.split(' ') if t.strip()])
-
         # Prepare skill objects with name and color
         skills_with_colors = []
-        for tech in techs_final:
-            skill_color = skill_color_map.get(tech, 'teal') # Default to teal if not in map
-            skills_with_colors.append({'name': tech, 'color': skill_color})
+        for tech in project.stack:
+            skill_color = tech_lookup(tech.name).color
+            skills_with_colors.append({'name': tech.name, 'color': skill_color})
 
         project_data.append({
             'id': project.id,
@@ -39,8 +35,21 @@ def sidebar_projects(request):
             'skills': skills_with_colors[:3], # Still limit to 3 for initial display
             'more_skills': len(skills_with_colors) > 3,
         })
-        
-    return {'sidebar_projects': project_data}
+
+    return project_data
+
+def _cached_sidebar_projects():
+    # Keyed by the projects cache version, which Project saves/deletes bump after commit.
+    version = projects_cache.get_version()
+    project_data = cache.get(SIDEBAR_CACHE_KEY, version=version)
+    if project_data is None:
+        project_data = _build_sidebar_projects()
+        timeout = SIDEBAR_CACHE_SECONDS if is_shared() else SIDEBAR_LOCAL_CACHE_SECONDS
+        cache.set(SIDEBAR_CACHE_KEY, project_data, timeout, version=version)
+    return project_data
+
+def sidebar_projects(request):
+    return {'sidebar_projects': SimpleLazyObject(_cached_sidebar_projects)}
 
 
 def default_template_variables(request):
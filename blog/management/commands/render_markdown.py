@@ -0,0 +1,47 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from blog.markdown_render import render_key, render_with_key
+from blog.models import Post
+from notes.models import Note
+
+
+class Command(BaseCommand):
+    help = 'Re-renders stored Markdown HTML for posts and notes whose source or renderer config changed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count).')
+        parser.add_argument('--batch-size', type=int, default=200, help='Rows loaded and updated per batch.')
+        parser.add_argument('--force', action='store_true', help='Re-render every row, not only stale ones.')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            for model in (Post, Note):
+                rendered = self.render_model(model, executor, batch_size, options['force'])
+                self.stdout.write(self.style.SUCCESS(f'{model.__name__}: re-rendered {rendered} rows.'))
+
+    def render_model(self, model, executor, batch_size, force):
+        allow_html = model.markdown_allow_html
+        rendered = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                model.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .only('pk', 'content', 'content_html_key')[:batch_size]
+            )
+            if not batch:
+                return rendered
+            last_pk = batch[-1].pk
+
+            stale = [obj for obj in batch if force or obj.content_html_key != render_key(obj.content, allow_html)]
+            if not stale:
+                continue
+            results = executor.map(
+                render_with_key, [obj.content for obj in stale], [allow_html] * len(stale), chunksize=16
+            )
+            for obj, (html, key) in zip(stale, results):
+                obj.content_html, obj.content_html_key = html, key
+            model.objects.bulk_update(stale, ['content_html', 'content_html_key'])
+            rendered += len(stale)
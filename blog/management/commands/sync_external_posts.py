@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from blog.tistory import TISTORY_RSS_URL, TISTORY_SOURCE, sync_feed
+
+
+class Command(BaseCommand):
+    help = 'Syncs external blog posts (Tistory RSS) into the ExternalPost table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default=TISTORY_RSS_URL, help='Feed URL to sync.')
+        parser.add_argument('--source', default=TISTORY_SOURCE, help='Source label stored on each post.')
+        parser.add_argument('--full', action='store_true', help='Ignore validators and re-read every item.')
+
+    def handle(self, *args, **options):
+        try:
+            stored = sync_feed(url=options['url'], source=options['source'], full=options['full'])
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'Could not sync {options["url"]}: {e}'))
+            return
+
+        if stored is None:
+            self.stdout.write(self.style.SUCCESS('Feed not modified. Nothing to do.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Stored {stored} posts from {options["url"]}.'))
@@ -0,0 +1,124 @@
+"""
+Markdown rendering shared by Post and Note.
+
+Rendered HTML is stored next to the source (see blog.models.RenderedMarkdownModel)
+together with a key hashing the source text and the renderer configuration, so
+changing the extensions or upgrading Markdown/Pygments invalidates stored HTML.
+"""
+import hashlib
+import html
+import json
+import re
+
+import markdown
+import pygments
+from markdown.extensions import Extension
+from markdown.treeprocessors import Treeprocessor
+from markdown.util import AMP_SUBSTITUTE
+
+
+MARKDOWN_EXTENSIONS = ['extra', 'nl2br', 'fenced_code', 'codehilite']
+# 'extra' without attr_list ({: onclick=...} would set any attribute) and md_in_html (raw HTML is escaped anyway).
+VISITOR_MARKDOWN_EXTENSIONS = ['abbr', 'def_list', 'footnotes', 'tables', 'nl2br', 'fenced_code', 'codehilite']
+MARKDOWN_EXTENSION_CONFIGS = {'codehilite': {'css_class': 'highlight', 'noclasses': True}}
+SAFE_URL_SCHEMES = {'http', 'https', 'mailto'}
+# Bump when the link sanitizer changes so stored visitor HTML is re-rendered.
+SANITIZER_VERSION = 3
+# Attributes the Markdown syntax itself produces in visitor content; everything else is dropped.
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title', 'class', 'id'},  # links, footnote refs
+    'img': {'src', 'alt', 'title'},
+    'abbr': {'title'},
+    'th': {'style'},  # table column alignment
+    'td': {'style'},
+    'sup': {'id'},
+    'li': {'id'},
+    'div': {'class'},
+    'ol': {'start'},
+}
+
+# Browsers ignore whitespace and control characters inside a URL scheme ("java\tscript:").
+_URL_IGNORED_RE = re.compile(r'[\x00-\x20\x7f-\x9f]+')
+_URL_SCHEME_RE = re.compile(r'^([a-z][a-z0-9+.\-]*):')
+
+
+def is_safe_url(value):
+    """
+    True for relative URLs and http/https/mailto ones. The scheme is checked the
+    way a browser reads the attribute: entities decoded, whitespace and control
+    characters dropped, case folded.
+    """
+    url = value.replace(AMP_SUBSTITUTE, '&')
+    for _ in range(3):  # "&amp;#58;" 같은 중첩 인코딩도 풀어서 확인
+        decoded = html.unescape(url)
+        if decoded == url:
+            break
+        url = decoded
+    match = _URL_SCHEME_RE.match(_URL_IGNORED_RE.sub('', url).lower())
+    return match is None or match.group(1) in SAFE_URL_SCHEMES
+
+
+class _StripUnsafeLinks(Treeprocessor):
+    def run(self, root):
+        for element in root.iter():
+            allowed = ALLOWED_ATTRIBUTES.get(element.tag, ())
+            for attr in [attr for attr in element.attrib if attr not in allowed]:
+                del element.attrib[attr]
+            for attr in ('href', 'src'):
+                value = element.get(attr)
+                if value is not None and not is_safe_url(value):
+                    element.set(attr, '#')
+
+
+class EscapeHtmlExtension(Extension):
+    """
+    Treat raw HTML as text, keep only ALLOWED_ATTRIBUTES and neutralize
+    javascript:-style links (for visitor content).
+    """
+
+    def extendMarkdown(self, md):
+        md.preprocessors.deregister('html_block')
+        md.inlinePatterns.deregister('html')
+        md.treeprocessors.register(_StripUnsafeLinks(md), 'strip_unsafe_links', 0)
+
+
+def _extensions(allow_html):
+    return MARKDOWN_EXTENSIONS if allow_html else VISITOR_MARKDOWN_EXTENSIONS
+
+
+def _fingerprint(allow_html):
+    config = {
+        'extensions': _extensions(allow_html),
+        'configs': MARKDOWN_EXTENSION_CONFIGS,
+        'allow_html': allow_html,
+        'sanitizer': SANITIZER_VERSION,
+        'markdown': markdown.__version__,
+        'pygments': pygments.__version__,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+CONFIG_FINGERPRINTS = {True: _fingerprint(True), False: _fingerprint(False)}
+
+
+def render_markdown(text, allow_html=True):
+    extensions = list(_extensions(allow_html))
+    if not allow_html:
+        extensions.append(EscapeHtmlExtension())
+    return markdown.markdown(text or '', extensions=extensions, extension_configs=MARKDOWN_EXTENSION_CONFIGS)
+
+
+def render_key(text, allow_html=True):
+    """
+    Hash of the renderer configuration and the source text.
+    """
+    digest = hashlib.sha256(CONFIG_FINGERPRINTS[allow_html].encode('ascii'))
+    digest.update((text or '').encode('utf-8'))
+    return digest.hexdigest()
+
+
+def render_with_key(text, allow_html=True):
+    """
+    (html, key) pair; a plain function so it can run in a worker process.
+    """
+    return render_markdown(text, allow_html), render_key(text, allow_html)
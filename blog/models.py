@@ -1,11 +1,95 @@
 from django.db import models
 from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from .markdown_render import render_key, render_with_key
+
+
+class RenderedMarkdownModel(models.Model):
+    """
+    Stores the Markdown rendering of ``content`` in ``content_html`` so page
+    views serve stored HTML. ``content_html_key`` hashes the source and the
+    renderer config; a mismatch means the stored HTML is stale.
+    """
+    content_html = models.TextField(blank=True, editable=False)
+    content_html_key = models.CharField(max_length=64, blank=True, editable=False)
+
+    # Visitor-submitted content should not be able to inject raw HTML.
+    markdown_allow_html = True
+
+    class Meta:
+        abstract = True
+
+    def content_html_is_stale(self):
+        return self.content_html_key != render_key(self.content, self.markdown_allow_html)
+
+    def render_content(self):
+        self.content_html, self.content_html_key = render_with_key(self.content, self.markdown_allow_html)
+
+    def save(self, *args, **kwargs):
+        if self.content_html_is_stale():
+            self.render_content()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'content_html', 'content_html_key'}
+        super().save(*args, **kwargs)
+
+    @property
+    def rendered_content(self):
+        """
+        Stored HTML; re-rendered and persisted once if the source or config changed.
+        """
+        if self.content_html_is_stale():
+            self.render_content()
+            type(self).objects.filter(pk=self.pk).update(
+                content_html=self.content_html, content_html_key=self.content_html_key
+            )
+        return mark_safe(self.content_html)
+
 
 # Create your models here.
-class Post(models.Model):
+class Post(RenderedMarkdownModel):
     title = models.CharField(max_length=200)
     content = models.TextField()
     created_at = models.DateTimeField(default=timezone.now)
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+class ExternalPost(models.Model):
+    """A post mirrored from an external feed (e.g. Tistory RSS) by sync_external_posts."""
+    source = models.CharField(max_length=30)
+    guid = models.CharField(max_length=500)
+    title = models.CharField(max_length=300)
+    url = models.URLField(max_length=500)
+    summary = models.TextField(blank=True)
+    published_at = models.DateTimeField(default=timezone.now)
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-published_at']
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'guid'], name='unique_external_post'),
+        ]
+        indexes = [
+            models.Index(fields=['source', '-published_at'], name='external_post_recent_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    @property
+    def published(self):
+        return self.published_at.strftime('%Y-%m-%d') if self.published_at else ''
+
+
+class FeedState(models.Model):
+    """HTTP validators of the last successful fetch, for conditional requests."""
+    url = models.URLField(max_length=500, unique=True)
+    etag = models.CharField(max_length=300, blank=True)
+    last_modified = models.CharField(max_length=100, blank=True)
+    checked_at = models.DateTimeField(null=True, blank=True)
+    changed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.url
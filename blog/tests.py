@@ -1,3 +1,381 @@
-from django.test import TestCase
+import threading
+import time
+import urllib.error
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from notes.models import Note
+from projects import cache as projects_cache
+from projects.models import Project
+
+from . import tistory
+from .context_processors import SIDEBAR_CACHE_KEY, SIDEBAR_CACHE_SECONDS, SIDEBAR_LOCAL_CACHE_SECONDS
+from . import markdown_render
+from .markdown_render import render_key, render_markdown
+from .models import ExternalPost, FeedState, Post
+
+
+class LazyContextProcessorTests(TestCase):
+    """The sidebar processors only hit the DB/feed when base.html renders the sidebar."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = Project.objects.create(title='Portfolio', description='desc', technologies='Python, Django')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_sidebar_page_fetches_once(self):
+        with mock.patch('blog.context_processors.fetch_tistory_posts', return_value=[]) as fetch:
+            # sidebar projects + their prefetched stack; post_list's own feed read is mocked out
+            with mock.patch('blog.views.fetch_tistory_posts', return_value=[]):
+                with self.assertNumQueries(2):
+                    response = self.client.get(reverse('post_list'))
+        self.assertContains(response, 'Portfolio')
+        fetch.assert_called_once_with(limit=5)
+
+    def test_hidden_sidebar_skips_processors(self):
+        with mock.patch('blog.context_processors.fetch_tistory_posts') as fetch:
+            # project + prefetched stack only; no sidebar queries
+            with self.assertNumQueries(2):
+                response = self.client.get(reverse('project_detail', args=[self.project.pk]))
+        self.assertEqual(response.status_code, 200)
+        fetch.assert_not_called()
+
+    def test_chat_fragment_skips_processors(self):
+        with mock.patch('blog.context_processors.fetch_tistory_posts') as fetch:
+            response = self.client.post(
+                reverse('ai_search:chat_interaction'),
+                data='{"message": "프로젝트 보여줘"}',
+                content_type='application/json',
+            )
+        self.assertEqual(response.json()['response']['type'], 'html')
+        fetch.assert_not_called()
+
+
+class SidebarProjectsCacheTests(TestCase):
+    """The sidebar view model is cached per projects version and rebuilt on Project changes."""
+
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(title='Portfolio', description='desc', technologies='Python, Django')
+
+    def get_post_list(self):
+        with mock.patch('blog.context_processors.fetch_tistory_posts', return_value=[]):
+            with mock.patch('blog.views.fetch_tistory_posts', return_value=[]):
+                return self.client.get(reverse('post_list'))
+
+    def test_steady_state_runs_no_sidebar_queries(self):
+        with self.assertNumQueries(2):
+            self.get_post_list()
+        with self.assertNumQueries(0):
+            response = self.get_post_list()
+        self.assertContains(response, 'Portfolio')
+
+    def test_project_save_and_delete_invalidate(self):
+        self.get_post_list()
+
+        self.project.title = 'Renamed'
+        self.project.technologies = 'Python, Django, Redis, Docker'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save()
+        response = self.get_post_list()
+        self.assertContains(response, 'Renamed')
+        self.assertContains(response, 'skill-badge-teal">...</span>')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        response = self.get_post_list()
+        self.assertNotContains(response, 'Renamed')
+
+    def test_version_is_bumped_after_commit(self):
+        version = projects_cache.get_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.project.save()
+            self.assertEqual(projects_cache.get_version(), version)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(projects_cache.get_version(), version)
+
+    def test_per_process_cache_uses_short_timeout(self):
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            self.get_post_list()
+        timeouts = [c.args[2] for c in cache_set.call_args_list if c.args[0] == SIDEBAR_CACHE_KEY]
+        self.assertEqual(timeouts, [SIDEBAR_LOCAL_CACHE_SECONDS])
+
+        cache.clear()
+        with mock.patch('blog.context_processors.is_shared', return_value=True):
+            with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+                self.get_post_list()
+        timeouts = [c.args[2] for c in cache_set.call_args_list if c.args[0] == SIDEBAR_CACHE_KEY]
+        self.assertEqual(timeouts, [SIDEBAR_CACHE_SECONDS])
+
+
+class UnsafeLinkTests(TestCase):
+    """Visitor Markdown keeps http(s)/mailto/relative links and neutralizes every other scheme."""
+
+    UNSAFE = [
+        '[x](javascript:alert(1))',
+        '[x](JaVaScRiPt:alert(1))',
+        '[x](javascript&#58;alert(1))',
+        '[x](javascript&colon;alert(1))',
+        '[x](&#106;avascript:alert(1))',
+        '[x](java&#x09;script:alert(1))',
+        '[x](< javascript:alert(1)>)',
+        '[x](%s)' % '\x01javascript:alert(1)',
+        '[x](DATA:text/html;base64,PHNjcmlwdD4=)',
+        '[x](data&#58;text/html;base64,PHNjcmlwdD4=)',
+        '![i]( data:image/svg+xml;base64,PHN2Zz4=)',
+    ]
+    SAFE = {
+        '[x](https://example.com/a:b)': 'href="https://example.com/a:b"',
+        '[x](HTTP://example.com)': 'href="HTTP://example.com"',
+        '[x](mailto:me@example.com)': 'href="mailto:me@example.com"',
+        '[x](/notes/1/)': 'href="/notes/1/"',
+        '[x](#top)': 'href="#top"',
+        '[x](page?a=1:2)': 'href="page?a=1:2"',
+    }
+
+    def test_unsafe_schemes_are_replaced(self):
+        for text in self.UNSAFE:
+            with self.subTest(text=text):
+                html = render_markdown(text, allow_html=False)
+                self.assertRegex(html, r'(href|src)="#"')
+                self.assertNotIn('script', html.lower())
+                self.assertNotIn('data', html.lower())
+
+    def test_safe_links_are_kept(self):
+        for text, attribute in self.SAFE.items():
+            with self.subTest(text=text):
+                self.assertIn(attribute, render_markdown(text, allow_html=False))
+
+    def test_attribute_lists_are_not_applied(self):
+        for text in (
+            '[a](http://x){: onclick="alert(1)" }',
+            '![i](/a.png){: onerror="alert(1)" }',
+            'para\n{: onmouseover="alert(1)" style="position:fixed" }',
+            '# title {: #x onclick="alert(1)" }',
+        ):
+            with self.subTest(text=text):
+                html = render_markdown(text, allow_html=False)
+                self.assertNotRegex(html, r'<[^>]*\s(on\w+|style)=')
+
+    def test_only_allowed_attributes_survive(self):
+        html = render_markdown('[a](http://x "t") ![i](/a.png "t")\n\n| h |\n|:-:|\n| c |\n\nn[^1]\n\n[^1]: f', allow_html=False)
+        self.assertIn('<a href="http://x" title="t">a</a>', html)
+        self.assertIn('<img alt="i" src="/a.png" title="t" />', html)
+        self.assertIn('<th style="text-align: center;">h</th>', html)
+        self.assertIn('class="footnote"', html)
+        # 작성자 콘텐츠(allow_html=True)는 attr_list를 그대로 씀
+        self.assertIn('class="wide"', render_markdown('para\n{: .wide }'))
+
+    def test_stored_note_html_is_sanitized(self):
+        note = Note.objects.create(title='xss', content='[x](javascript&#58;alert(1))')
+        self.assertIn('href="#"', note.rendered_content)
+        response = self.client.get(reverse('notes:note_detail', args=[note.pk]))
+        self.assertNotContains(response, 'javascript')
+
+    def test_note_attribute_injection_does_not_reach_pages(self):
+        note = Note.objects.create(title='xss', content='[a](http://x){: onclick="alert(1)" }\n\nhi\n{: onmouseover="alert(1)" }')
+        response = self.client.get(reverse('notes:note_detail', args=[note.pk]))
+        # 속성 목록은 본문 글자로만 남음
+        self.assertNotRegex(response.content.decode(), r'<[^>]*\s(onclick|onmouseover)=')
+        self.assertNotRegex(note.content_html, r'<[^>]*\son\w+=')
+
+
+class RenderedContentTests(TestCase):
+    def test_save_renders_and_stores_the_key(self):
+        post = Post.objects.create(title='t', content='**굵게**')
+        self.assertEqual(post.content_html, '<p><strong>굵게</strong></p>')
+        self.assertEqual(post.content_html_key, render_key('**굵게**'))
+        post.content = '_기울임_'
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+        self.assertEqual(post.content_html, '<p><em>기울임</em></p>')
+
+    def test_stale_rows_are_rendered_once_on_read(self):
+        post = Post.objects.create(title='t', content='**a**')
+        Post.objects.filter(pk=post.pk).update(content_html='', content_html_key='')
+        post = Post.objects.get(pk=post.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(post.rendered_content, '<p><strong>a</strong></p>')
+        with self.assertNumQueries(0):
+            post.rendered_content
+        self.assertEqual(Post.objects.get(pk=post.pk).content_html_key, render_key('**a**'))
+
+    def test_renderer_config_change_invalidates_stored_html(self):
+        post = Post.objects.create(title='t', content='a')
+        note = Note.objects.create(title='t', content='a')
+        self.assertFalse(post.content_html_is_stale())
+        changed = {True: 'new', False: 'new-visitor'}
+        with mock.patch.dict(markdown_render.CONFIG_FINGERPRINTS, changed):
+            self.assertTrue(post.content_html_is_stale())
+            self.assertTrue(note.content_html_is_stale())
+            self.assertNotEqual(render_key('a', True), render_key('a', False))
+
+    def test_command_renders_only_stale_rows(self):
+        fresh = Post.objects.create(title='fresh', content='**a**')
+        old = Post.objects.create(title='old', content='**b**')
+        note = Note.objects.create(title='n', content='<b>x</b>')
+        Post.objects.filter(pk=old.pk).update(content_html='', content_html_key='')
+        Note.objects.filter(pk=note.pk).update(content_html='', content_html_key='')
+
+        out = StringIO()
+        call_command('render_markdown', workers=1, batch_size=1, stdout=out)
+        self.assertIn('Post: re-rendered 1 rows.', out.getvalue())
+        self.assertIn('Note: re-rendered 1 rows.', out.getvalue())
+        old.refresh_from_db()
+        note.refresh_from_db()
+        self.assertEqual((old.content_html, old.content_html_key), ('<p><strong>b</strong></p>', render_key('**b**')))
+        self.assertEqual(note.content_html, '<p>&lt;b&gt;x&lt;/b&gt;</p>')
+
+        out = StringIO()
+        call_command('render_markdown', workers=1, force=True, stdout=out)
+        self.assertIn('Post: re-rendered 2 rows.', out.getvalue())
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.content_html, '<p><strong>a</strong></p>')
+
+
+FEED_URL = 'https://example.com/rss'
+
+
+def rss(*guids):
+    items = ''.join(
+        f'<item><title>글 {guid}</title><link>https://example.com/{guid}</link><guid>{guid}</guid>'
+        f'<description>&lt;p&gt;요약 {guid}&lt;/p&gt;</description>'
+        f'<pubDate>Mon, 0{len(guids) - i} Sep 2025 10:00:00 +0900</pubDate></item>'
+        for i, guid in enumerate(guids)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss><channel>{items}</channel></rss>'.encode()
+
+
+class FeedResponse(BytesIO):
+    def __init__(self, body, etag='"v1"', last_modified='Mon, 01 Sep 2025 01:00:00 GMT'):
+        super().__init__(body)
+        self.headers = {'ETag': etag, 'Last-Modified': last_modified}
+
+
+def not_modified():
+    return urllib.error.HTTPError(FEED_URL, 304, 'Not Modified', {}, None)
+
+
+class TistorySyncTests(TestCase):
+    def sync(self, *responses, **kwargs):
+        with mock.patch('blog.tistory.urllib.request.urlopen', side_effect=responses) as urlopen:
+            result = tistory.sync_feed(url=FEED_URL, source='test', **kwargs)
+        self.request_headers = dict(urlopen.call_args.args[0].header_items())
+        return result
+
+    def guids(self):
+        return sorted(ExternalPost.objects.filter(source='test').values_list('guid', flat=True))
+
+    def test_first_sync_stores_items_and_validators(self):
+        self.assertEqual(self.sync(FeedResponse(rss('b', 'a'))), 2)
+        self.assertNotIn('If-none-match', self.request_headers)
+        self.assertEqual(self.guids(), ['a', 'b'])
+        post = ExternalPost.objects.get(guid='a')
+        self.assertEqual((post.title, post.url, post.summary), ('글 a', 'https://example.com/a', '요약 a'))
+        state = FeedState.objects.get(url=FEED_URL)
+        self.assertEqual((state.etag, state.last_modified), ('"v1"', 'Mon, 01 Sep 2025 01:00:00 GMT'))
+        self.assertIsNotNone(state.changed_at)
+
+    def test_not_modified_short_circuits(self):
+        self.sync(FeedResponse(rss('a')))
+        changed_at = FeedState.objects.get(url=FEED_URL).changed_at
+        self.assertIsNone(self.sync(not_modified()))
+        self.assertEqual(self.request_headers['If-none-match'], '"v1"')
+        self.assertEqual(self.request_headers['If-modified-since'], 'Mon, 01 Sep 2025 01:00:00 GMT')
+        state = FeedState.objects.get(url=FEED_URL)
+        self.assertEqual(state.changed_at, changed_at)
+        self.assertGreater(state.checked_at, changed_at)
+        self.assertEqual(self.guids(), ['a'])
+
+    def test_stops_at_the_first_known_guid(self):
+        self.sync(FeedResponse(rss('b', 'a')))
+        ExternalPost.objects.filter(guid='a').delete()
+        # 'a'는 알려진 'b' 뒤에 있으므로 다시 읽지 않음
+        self.assertEqual(self.sync(FeedResponse(rss('c', 'b', 'a'), etag='"v2"')), 1)
+        self.assertEqual(self.guids(), ['b', 'c'])
+        self.assertEqual(FeedState.objects.get(url=FEED_URL).etag, '"v2"')
+
+    def test_max_items(self):
+        self.assertEqual(self.sync(FeedResponse(rss('c', 'b', 'a')), max_items=2), 2)
+        self.assertEqual(self.guids(), ['b', 'c'])
+
+    def test_full_sync_rereads_every_item(self):
+        self.sync(FeedResponse(rss('b', 'a')))
+        ExternalPost.objects.filter(guid='a').delete()
+        ExternalPost.objects.filter(guid='b').update(title='옛 제목')
+        with mock.patch('blog.tistory.urllib.request.urlopen', return_value=FeedResponse(rss('b', 'a'))) as urlopen:
+            out = StringIO()
+            call_command('sync_external_posts', '--full', url=FEED_URL, source='test', stdout=out)
+        headers = dict(urlopen.call_args.args[0].header_items())
+        self.assertNotIn('If-none-match', headers)
+        self.assertNotIn('If-modified-since', headers)
+        self.assertIn(f'Stored 2 posts from {FEED_URL}.', out.getvalue())
+        self.assertEqual(self.guids(), ['a', 'b'])
+        self.assertEqual(ExternalPost.objects.get(guid='b').title, '글 b')
+
+    def test_command_reports_not_modified(self):
+        self.sync(FeedResponse(rss('a')))
+        out = StringIO()
+        with mock.patch('blog.tistory.urllib.request.urlopen', side_effect=not_modified()):
+            call_command('sync_external_posts', url=FEED_URL, source='test', stdout=out)
+        self.assertIn('Feed not modified', out.getvalue())
+
+
+class TistoryAutoSyncTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_off_in_tests(self):
+        with mock.patch('blog.tistory.threading.Thread') as thread:
+            tistory.fetch_tistory_posts()
+        thread.assert_not_called()
+
+    @override_settings(TISTORY_AUTO_SYNC=True)
+    def test_one_background_sync_per_interval(self):
+        with mock.patch('blog.tistory.threading.Thread') as thread, mock.patch.object(tistory, '_sync_thread', None):
+            thread.return_value.is_alive.return_value = False
+            tistory.fetch_tistory_posts()
+            tistory.fetch_tistory_posts()
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once_with()
+
+    @override_settings(TISTORY_AUTO_SYNC=True)
+    def test_requests_serve_stored_posts_while_the_sync_runs(self):
+        ExternalPost.objects.create(source=tistory.TISTORY_SOURCE, guid='old', title='저장된 글', url='https://example.com/old')
+        started, release = threading.Event(), threading.Event()
+
+        def slow_sync():
+            started.set()
+            release.wait(5)
+
+        with mock.patch.object(tistory, 'sync_feed', side_effect=slow_sync) as sync, \
+                mock.patch.object(tistory, '_sync_thread', None), mock.patch.object(tistory.connection, 'close'):
+            t0 = time.monotonic()
+            first = tistory.fetch_tistory_posts(limit=5)
+            self.assertTrue(started.wait(5))
+            # 동기화가 도는 동안: 다른 한도의 호출도 기다리지 않고 같은 저장본을 받으며 새 동기화는 없음
+            cache.delete(tistory.AUTO_SYNC_LOCK_KEY)
+            second = tistory.fetch_tistory_posts(limit=4)
+            self.assertLess(time.monotonic() - t0, 1)
+            release.set()
+            tistory._sync_thread.join(5)
+        self.assertEqual([p.title for p in first], ['저장된 글'])
+        self.assertEqual(second, first)
+        sync.assert_called_once_with()
+
+    @override_settings(TISTORY_AUTO_SYNC=True)
+    def test_failed_sync_retries_sooner(self):
+        with mock.patch.object(tistory, 'sync_feed', side_effect=OSError('down')), \
+                mock.patch.object(tistory.connection, 'close'), \
+                mock.patch.object(cache, 'set', wraps=cache.set) as cache_set, \
+                self.assertLogs('blog.tistory', 'WARNING'):
+            tistory._background_sync()
+        cache_set.assert_called_once_with(tistory.AUTO_SYNC_LOCK_KEY, True, tistory.AUTO_SYNC_RETRY)
@@ -1,13 +1,34 @@
 from email.utils import parsedate_to_datetime
 from html import unescape
+import logging
 import re
+import threading
+import urllib.error
 import urllib.request
 import xml.etree.ElementTree as ET
 
+from django.conf import settings
 from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from .models import ExternalPost, FeedState
+
+logger = logging.getLogger(__name__)
 
 
 TISTORY_RSS_URL = "https://kimbob-world.tistory.com/rss"
+TISTORY_SOURCE = "tistory"
+
+FETCH_TIMEOUT = 5
+SYNC_MAX_ITEMS = 50
+# Without a cron job, page views start at most one background sync per interval.
+AUTO_SYNC_LOCK_KEY = "tistory_auto_sync"
+AUTO_SYNC_INTERVAL = 600
+AUTO_SYNC_RETRY = 60  # after a failed sync; the stored posts keep being served meanwhile
+
+_sync_thread = None
+_sync_thread_lock = threading.Lock()
 
 
 def _strip_html(text):
@@ -17,50 +38,137 @@ def _strip_html(text):
     return re.sub(r"\s+", " ", unescape(no_tags)).strip()
 
 
-def fetch_tistory_posts(limit=5, cache_seconds=600):
-    cache_key = f"tistory_posts_{limit}"
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
+def _parse_item(item):
+    title = (item.findtext("title") or "").strip()
+    link = (item.findtext("link") or "").strip()
+    guid = (item.findtext("guid") or "").strip() or link
+    description = _strip_html(item.findtext("description") or "")
+    pub_date_raw = (item.findtext("pubDate") or "").strip()
+
+    published_at = None
+    if pub_date_raw:
+        try:
+            published_at = parsedate_to_datetime(pub_date_raw)
+        except Exception:
+            published_at = None
+
+    return {
+        "guid": guid[:500],
+        "title": title[:300],
+        "url": link[:500],
+        "summary": description,
+        "published_at": published_at or timezone.now(),
+    }
+
+
+def _iter_new_items(stream, known_guids, max_items, full=False):
+    """
+    Stream <item> elements with iterparse, stopping at the first item we
+    already have (feeds list newest first) unless a full sync is requested.
+    """
+    seen = 0
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        if elem.tag != "item":
+            continue
+        item = _parse_item(elem)
+        elem.clear()
+        if not full and item["guid"] in known_guids:
+            return
+        yield item
+        seen += 1
+        if seen >= max_items:
+            return
+
+
+def sync_feed(url=TISTORY_RSS_URL, source=TISTORY_SOURCE, full=False, max_items=SYNC_MAX_ITEMS):
+    """
+    Fetch the feed with If-None-Match/If-Modified-Since and store new items.
+    Returns the number of stored items, or None when the feed was unchanged.
+    """
+    state, _ = FeedState.objects.get_or_create(url=url)
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if not full:
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
 
+    now = timezone.now()
+    req = urllib.request.Request(url, headers=headers)
     try:
-        req = urllib.request.Request(TISTORY_RSS_URL, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            xml_data = resp.read()
-
-        root = ET.fromstring(xml_data)
-        channel = root.find("channel")
-        if channel is None:
-            cache.set(cache_key, [], cache_seconds)
-            return []
-
-        posts = []
-        for item in channel.findall("item")[:limit]:
-            title = (item.findtext("title") or "").strip()
-            link = (item.findtext("link") or "").strip()
-            description = _strip_html(item.findtext("description") or "")
-            pub_date_raw = (item.findtext("pubDate") or "").strip()
-
-            published = ""
-            if pub_date_raw:
-                try:
-                    dt = parsedate_to_datetime(pub_date_raw)
-                    published = dt.strftime("%Y-%m-%d")
-                except Exception:
-                    published = pub_date_raw
-
-            posts.append(
-                {
-                    "title": title,
-                    "url": link,
-                    "summary": description,
-                    "published": published,
-                    "source": "tistory",
-                }
+        resp = urllib.request.urlopen(req, timeout=FETCH_TIMEOUT)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            FeedState.objects.filter(pk=state.pk).update(checked_at=now)
+            return None
+        raise
+
+    with resp:
+        recent_guids = set(
+            ExternalPost.objects.filter(source=source)
+            .order_by("-published_at")
+            .values_list("guid", flat=True)[:max_items]
+        )
+        items = list(_iter_new_items(resp, recent_guids, max_items, full=full))
+        etag = resp.headers.get("ETag", "")
+        last_modified = resp.headers.get("Last-Modified", "")
+
+    if full:
+        for item in items:
+            ExternalPost.objects.update_or_create(
+                source=source, guid=item["guid"], defaults={k: v for k, v in item.items() if k != "guid"}
             )
+    elif items:
+        ExternalPost.objects.bulk_create(
+            [ExternalPost(source=source, **item) for item in items], ignore_conflicts=True
+        )
+
+    FeedState.objects.filter(pk=state.pk).update(
+        etag=etag[:300], last_modified=last_modified[:100], checked_at=now, changed_at=now
+    )
+    return len(items)
+
+
+def _background_sync():
+    try:
+        sync_feed()
+    except Exception as e:
+        logger.warning(f"Failed to sync Tistory feed: {e}")
+        cache.set(AUTO_SYNC_LOCK_KEY, True, AUTO_SYNC_RETRY)
+    finally:
+        connection.close()
+
+
+def _maybe_start_sync():
+    """
+    Start at most one background sync per AUTO_SYNC_INTERVAL (AUTO_SYNC_RETRY
+    after a failure). Requests never wait for it: they read the stored posts,
+    which stay as they are while the sync runs.
+
+    The cache.add() lock is single-flight across workers only on a shared cache
+    (REDIS_URL). With the default LocMem cache every process holds its own lock,
+    so each gunicorn worker may start one sync per interval; the thread check
+    below still keeps it to one per process.
+    """
+    global _sync_thread
+    if not getattr(settings, "TISTORY_AUTO_SYNC", False):
+        return
+    with _sync_thread_lock:
+        if _sync_thread is not None and _sync_thread.is_alive():
+            return
+        if not cache.add(AUTO_SYNC_LOCK_KEY, True, AUTO_SYNC_INTERVAL):
+            return
+        _sync_thread = threading.Thread(target=_background_sync, name="tistory-sync", daemon=True)
+        _sync_thread.start()
+
 
-        cache.set(cache_key, posts, cache_seconds)
-        return posts
-    except Exception:
-        cache.set(cache_key, [], cache_seconds)
-        return []
+def fetch_tistory_posts(limit=5):
+    """
+    Most recent synced Tistory posts, read from the indexed ExternalPost table.
+    """
+    _maybe_start_sync()
+    return list(
+        ExternalPost.objects.filter(source=TISTORY_SOURCE)
+        .only("title", "url", "summary", "published_at")
+        .order_by("-published_at")[:limit]
+    )
@@ -6,6 +6,15 @@ pip install -r requirements.txt
 python manage.py collectstatic --noinput
 python manage.py migrate
 
+# Fill or refresh stored Markdown HTML (empty for old rows, stale after a renderer change)
+# here, so page views never re-render and UPDATE inside a read request.
+python manage.py render_markdown
+
+# Chat embeddings (ai_search.embeddings) go stale as content changes; also run this periodically.
+if [ "${UPDATE_EMBEDDINGS}" = "true" ]; then
+  python manage.py update_embeddings || echo "update_embeddings failed; the chat uses keyword retrieval only."
+fi
+
 if [ "${CREATE_SUPERUSER}" = "true" ]; then
   echo "Creating superuser (non-interactive) ..."
   python manage.py createsuperuser --noinput || true
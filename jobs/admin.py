@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('task', 'queue', 'status', 'attempts', 'run_at', 'created_at')
+    list_filter = ('queue', 'status', 'task')
+    readonly_fields = ('locked_until', 'locked_by', 'last_error')
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from jobs import queue
+from jobs.models import Job
+
+BENCH_QUEUE = 'bench'
+
+
+# Registered only when this command is loaded, so production workers never see it.
+@queue.task('jobs.noop', queue=BENCH_QUEUE, max_attempts=1)
+def noop(sleep=0):
+    """Does nothing (optionally sleeps); measures queue overhead."""
+    if sleep:
+        time.sleep(sleep)
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures job queue throughput (enqueue and processing) on the configured database. '
+        'Run it once with the default SQLite settings and once with DATABASE_URL pointing at PostgreSQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=2000, help='Jobs per run.')
+        parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='Worker counts to compare.')
+        parser.add_argument('--batch', type=int, default=1, help='Jobs claimed per round trip.')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Seconds each job sleeps (simulated I/O).')
+
+    def handle(self, *args, **options):
+        count = options['jobs']
+        self.stdout.write(f'Backend: {connection.vendor}, {count} jobs per run, batch {options["batch"]}')
+        Job.objects.filter(queue=BENCH_QUEUE).delete()
+
+        try:
+            started = time.perf_counter()
+            with override_settings(JOB_QUEUE_INLINE=False):
+                for _ in range(count):
+                    queue.enqueue('jobs.noop', sleep=options['sleep'])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'enqueue(): {count / elapsed:,.0f} jobs/s')
+            Job.objects.filter(queue=BENCH_QUEUE).delete()
+
+            for workers in options['workers']:
+                now = timezone.now()
+                Job.objects.bulk_create(
+                    [Job(queue=BENCH_QUEUE, task='jobs.noop', payload={'sleep': options['sleep']}, max_attempts=1, run_at=now)
+                     for _ in range(count)],
+                    batch_size=500,
+                )
+                started = time.perf_counter()
+                processed = queue.run_workers(workers=workers, queue=BENCH_QUEUE, burst=True, batch=options['batch'])
+                elapsed = time.perf_counter() - started
+                left = Job.objects.filter(queue=BENCH_QUEUE).count()
+                self.stdout.write(
+                    f'{workers:>2} workers: {processed / elapsed:,.0f} jobs/s '
+                    f'({processed} processed in {elapsed:.2f}s, {left} left)'
+                )
+                Job.objects.filter(queue=BENCH_QUEUE).delete()
+        finally:
+            Job.objects.filter(queue=BENCH_QUEUE).delete()
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from jobs import queue
+
+
+class Command(BaseCommand):
+    help = 'Runs background job workers until interrupted (or until the queue is empty with --burst).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Worker threads, each with its own DB connection.')
+        parser.add_argument('--queue', default=queue.DEFAULT_QUEUE, help='Queue to consume.')
+        parser.add_argument('--batch', type=int, default=1, help='Jobs claimed per round trip.')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty.')
+        parser.add_argument('--burst', action='store_true', help='Exit once the queue is empty.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Starting {options["workers"]} workers on queue "{options["queue"]}". Press Ctrl+C to stop.')
+        processed = queue.run_workers(
+            workers=options['workers'],
+            queue=options['queue'],
+            burst=options['burst'],
+            poll_interval=options['poll_interval'],
+            batch=options['batch'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} jobs.'))
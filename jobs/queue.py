@@ -0,0 +1,246 @@
+"""
+A small job queue on top of the Job table.
+
+Register a function with @task("app.name"), call enqueue("app.name", **kwargs)
+from request code, and run `manage.py run_workers` to execute jobs. Deployments
+without a worker process set JOB_QUEUE_INLINE, and enqueue() then runs the task
+right away in the calling process (one attempt, errors logged). Failed jobs
+are retried with exponential backoff until max_attempts; a job held by a worker
+that died is picked up again once its visibility timeout expires, or marked
+failed if that was its last attempt.
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import F, Q, Subquery
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE = 'default'
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_TIMEOUT = 300     # seconds a claimed job stays invisible to other workers
+BACKOFF_BASE = 10         # seconds before the first retry, doubled per attempt
+BACKOFF_MAX = 3600
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    func: object
+    queue: str
+    max_attempts: int
+    timeout: int
+
+
+_TASKS = {}
+
+
+def task(name, queue=DEFAULT_QUEUE, max_attempts=DEFAULT_MAX_ATTEMPTS, timeout=DEFAULT_TIMEOUT):
+    """Register func as a background task; it is called with the job payload as keyword arguments."""
+    def register(func):
+        _TASKS[name] = Task(name, func, queue, max_attempts, timeout)
+        return func
+    return register
+
+
+def get_task(name):
+    return _TASKS.get(name)
+
+
+def enqueue(name, delay=0, **payload):
+    """
+    Store a job for the task `name` and return it; workers run it after `delay` seconds.
+    With JOB_QUEUE_INLINE the task runs now instead and None is returned.
+    """
+    registered = _TASKS[name]
+    if settings.JOB_QUEUE_INLINE:
+        _run_inline(registered, payload)
+        return None
+    return Job.objects.create(
+        queue=registered.queue,
+        task=name,
+        payload=payload,
+        max_attempts=registered.max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def _run_inline(registered, payload):
+    try:
+        registered.func(**payload)
+    except Exception as e:
+        logger.warning(f"Inline task {registered.name} failed: {e}", exc_info=True)
+
+
+def backoff(attempts):
+    """Seconds to wait before retry number `attempts`, with jitter so retries do not line up."""
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _claimable(queue, now):
+    return Job.objects.filter(
+        Q(status=Job.PENDING, run_at__lte=now)
+        # 워커가 죽어 잠금이 만료된 작업 (시도 횟수가 남은 경우만)
+        | Q(status=Job.RUNNING, locked_until__lt=now, attempts__lt=F('max_attempts')),
+        queue=queue,
+    )
+
+
+def fail_expired(queue=DEFAULT_QUEUE, now=None):
+    """Mark jobs whose worker died during their last attempt as failed; returns how many."""
+    now = now or timezone.now()
+    return Job.objects.filter(
+        queue=queue, status=Job.RUNNING, locked_until__lt=now, attempts__gte=F('max_attempts'),
+    ).update(
+        status=Job.FAILED,
+        locked_until=None,
+        last_error='Visibility timeout expired during the last attempt (worker died?)',
+    )
+
+
+def claim(queue=DEFAULT_QUEUE, worker_id='', limit=1):
+    """
+    Atomically take up to `limit` due jobs from `queue` for this worker.
+
+    PostgreSQL uses SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers never
+    wait on each other; backends without it (SQLite) claim with a single
+    UPDATE ... WHERE id IN (SELECT ... LIMIT n) and read the rows back by a
+    per-claim token.
+    """
+    now = timezone.now()
+    fail_expired(queue, now)
+    candidates = _claimable(queue, now).order_by('run_at', 'id')
+    token = f"{worker_id}:{uuid.uuid4().hex[:8]}"
+    claimed = []
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            jobs = list(candidates.select_for_update(skip_locked=True)[:limit])
+            for job in jobs:
+                _lock(job, token, now)
+                job.save(update_fields=['status', 'attempts', 'locked_until', 'locked_by'])
+            claimed = jobs
+    else:
+        # SQLite는 쓰기를 직렬화하므로 UPDATE ... WHERE id IN (SELECT ... LIMIT n) 한 문장이 원자적으로 선점
+        taken = Job.objects.filter(pk__in=Subquery(candidates.values('pk')[:limit])).update(
+            status=Job.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_until=now + timedelta(seconds=DEFAULT_TIMEOUT),
+            locked_by=token,
+        )
+        if taken:
+            claimed = list(Job.objects.filter(locked_by=token, status=Job.RUNNING).order_by('run_at', 'id'))
+            _set_visibility(claimed, now)
+    return claimed
+
+
+def _timeout(job):
+    registered = _TASKS.get(job.task)
+    return registered.timeout if registered else DEFAULT_TIMEOUT
+
+
+def _set_visibility(jobs, now):
+    # 작업별 타임아웃이 기본값과 다르면 잠금 만료 시각을 맞춤
+    for job in jobs:
+        timeout = _timeout(job)
+        if timeout != DEFAULT_TIMEOUT:
+            job.locked_until = now + timedelta(seconds=timeout)
+            Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(locked_until=job.locked_until)
+
+
+def _lock(job, token, now):
+    job.status = Job.RUNNING
+    job.attempts += 1
+    job.locked_until = now + timedelta(seconds=_timeout(job))
+    job.locked_by = token
+
+
+def run_job(job):
+    """Execute a claimed job, then delete it or schedule its retry. Returns True on success."""
+    registered = _TASKS.get(job.task)
+    try:
+        if registered is None:
+            raise LookupError(f"Unknown task {job.task!r}")
+        registered.func(**job.payload)
+    except Exception as e:
+        retry = registered is not None and job.attempts < job.max_attempts
+        logger.warning(f"Job {job.task} #{job.pk} failed (attempt {job.attempts}/{job.max_attempts}): {e}")
+        # 다른 워커가 타임아웃 후 가져간 경우에는 덮어쓰지 않음
+        Job.objects.filter(pk=job.pk, locked_by=job.locked_by, attempts=job.attempts).update(
+            status=Job.PENDING if retry else Job.FAILED,
+            run_at=timezone.now() + timedelta(seconds=backoff(job.attempts)) if retry else F('run_at'),
+            locked_until=None,
+            last_error=traceback.format_exc(limit=5),
+        )
+        return False
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by, attempts=job.attempts).delete()
+    return True
+
+
+def worker_name(index=0):
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+def work(queue=DEFAULT_QUEUE, worker_id=None, burst=False, poll_interval=1.0, batch=1, stop=None):
+    """
+    Claim and run jobs until `stop` is set, or, with burst=True, until the queue is empty.
+    Returns the number of jobs processed.
+    """
+    worker_id = worker_id or worker_name()
+    stop = stop or threading.Event()
+    processed = 0
+    while not stop.is_set():
+        close_old_connections()
+        try:
+            jobs = claim(queue, worker_id, limit=batch)
+        except DatabaseError as e:
+            # 예: SQLite "database is locked" — 잠시 후 다시 시도
+            logger.warning(f"Worker {worker_id} could not claim jobs: {e}")
+            stop.wait(poll_interval)
+            continue
+        if not jobs:
+            if burst:
+                break
+            stop.wait(poll_interval)
+            continue
+        for job in jobs:
+            run_job(job)
+            processed += 1
+    return processed
+
+
+def run_workers(workers=1, queue=DEFAULT_QUEUE, burst=False, poll_interval=1.0, batch=1, stop=None):
+    """Run `workers` threads, each with its own database connection. Returns total jobs processed."""
+    stop = stop or threading.Event()
+    counts = [0] * workers
+
+    def target(index):
+        try:
+            counts[index] = work(queue, worker_name(index), burst, poll_interval, batch, stop)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=target, args=(i,), name=f"job-worker-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return sum(counts)
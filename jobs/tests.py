@@ -0,0 +1,163 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from notes.models import Note
+
+from . import queue
+from .models import Job
+
+TEST_QUEUE = 'test'
+calls = []
+
+
+@queue.task('jobs.test_record', queue=TEST_QUEUE, max_attempts=3, timeout=60)
+def record(**payload):
+    calls.append(payload)
+
+
+@queue.task('jobs.test_fail', queue=TEST_QUEUE, max_attempts=2)
+def fail(**payload):
+    raise RuntimeError('boom')
+
+
+class QueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def expire(self, job):
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+    def test_enqueue_stores_task_settings(self):
+        job = queue.enqueue('jobs.test_record', delay=30, note_id=7)
+        job.refresh_from_db()
+        self.assertEqual((job.queue, job.task, job.payload), (TEST_QUEUE, 'jobs.test_record', {'note_id': 7}))
+        self.assertEqual((job.status, job.attempts, job.max_attempts), (Job.PENDING, 0, 3))
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=25))
+
+    def test_claim_takes_due_jobs_once(self):
+        due = queue.enqueue('jobs.test_record', n=1)
+        queue.enqueue('jobs.test_record', delay=60, n=2)
+
+        before = timezone.now()
+        claimed = queue.claim(TEST_QUEUE, 'w1', limit=5)
+        self.assertEqual([job.pk for job in claimed], [due.pk])
+        job = claimed[0]
+        self.assertEqual((job.status, job.attempts), (Job.RUNNING, 1))
+        self.assertTrue(job.locked_by.startswith('w1:'))
+        # 작업별 타임아웃(60초)이 잠금 만료 시각에 반영됨
+        self.assertLess(job.locked_until, before + timedelta(seconds=61))
+        self.assertEqual(Job.objects.get(pk=job.pk).locked_until, job.locked_until)
+
+        self.assertEqual(queue.claim(TEST_QUEUE, 'w2'), [])
+        self.assertEqual(queue.claim('other', 'w2'), [])
+
+    def test_success_deletes_job(self):
+        queue.enqueue('jobs.test_record', n=1)
+        self.assertEqual(queue.work(TEST_QUEUE, 'w1', burst=True), 1)
+        self.assertEqual(calls, [{'n': 1}])
+        self.assertFalse(Job.objects.exists())
+
+    def test_failure_is_retried_with_backoff_then_failed(self):
+        job = queue.enqueue('jobs.test_fail')
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            claimed, = queue.claim(TEST_QUEUE, 'w1')
+            started = timezone.now()
+            self.assertFalse(queue.run_job(claimed))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.PENDING, 1))
+        self.assertIn('RuntimeError: boom', job.last_error)
+        delay = (job.run_at - started).total_seconds()
+        self.assertTrue(queue.BACKOFF_BASE * 0.8 - 1 <= delay <= queue.BACKOFF_BASE * 1.2)
+
+        # 백오프가 지나기 전에는 다시 가져가지 않음
+        self.assertEqual(queue.claim(TEST_QUEUE, 'w1'), [])
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            claimed, = queue.claim(TEST_QUEUE, 'w1')
+            queue.run_job(claimed)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_until), (Job.FAILED, 2, None))
+
+    def test_backoff_doubles_and_is_capped(self):
+        with mock.patch('jobs.queue.random.uniform', return_value=1.0):
+            self.assertEqual([queue.backoff(n) for n in (1, 2, 3)], [10, 20, 40])
+            self.assertEqual(queue.backoff(30), queue.BACKOFF_MAX)
+
+    def test_expired_job_is_reclaimed(self):
+        queue.enqueue('jobs.test_record', n=1)
+        first, = queue.claim(TEST_QUEUE, 'w1')
+        self.expire(first)
+
+        second, = queue.claim(TEST_QUEUE, 'w2')
+        self.assertEqual((second.pk, second.attempts), (first.pk, 2))
+        # 잠금을 잃은 첫 워커의 결과는 새 소유자의 작업을 지우지 않음
+        self.assertTrue(queue.run_job(first))
+        self.assertTrue(Job.objects.filter(pk=first.pk).exists())
+        self.assertTrue(queue.run_job(second))
+        self.assertFalse(Job.objects.filter(pk=first.pk).exists())
+
+    def test_expired_final_attempt_is_failed(self):
+        job = queue.enqueue('jobs.test_fail')
+        for _ in range(2):
+            claimed, = queue.claim(TEST_QUEUE, 'w1')
+            self.expire(claimed)
+
+        self.assertEqual(queue.claim(TEST_QUEUE, 'w1'), [])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_until), (Job.FAILED, 2, None))
+        self.assertIn('Visibility timeout', job.last_error)
+
+    def test_unknown_task_fails_without_retry(self):
+        Job.objects.create(queue=TEST_QUEUE, task='jobs.missing')
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            queue.work(TEST_QUEUE, 'w1', burst=True)
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn('LookupError', job.last_error)
+
+
+class TagNoteDispatchTests(TestCase):
+    def test_created_note_is_tagged_by_a_worker(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('notes:create_note'), {'title': 't', 'content': 'Django 캐시', 'tags': 'memo'},
+            )
+        self.assertEqual(response.status_code, 200)
+        note = Note.objects.get()
+        job = Job.objects.get()
+        self.assertEqual((job.task, job.payload), ('notes.tag_note', {'note_id': note.pk}))
+
+        with mock.patch('notes.tagging.keywords_for', return_value=['django', '캐시']) as keywords_for:
+            self.assertEqual(queue.work(burst=True), 1)
+        keywords_for.assert_called_once_with('Django 캐시')
+        self.assertEqual(sorted(note.tags.names()), ['django', 'memo', '캐시'])
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOB_QUEUE_INLINE=True)
+    def test_without_workers_the_note_is_tagged_inline(self):
+        with mock.patch('notes.tagging.keywords_for', return_value=['django']) as keywords_for:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('notes:create_note'), {'title': 't', 'content': 'Django', 'tags': 'memo'})
+        keywords_for.assert_called_once_with('Django')
+        self.assertEqual(sorted(Note.objects.get().tags.names()), ['django', 'memo'])
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOB_QUEUE_INLINE=True)
+    def test_inline_failures_are_logged(self):
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            self.assertIsNone(queue.enqueue('jobs.test_fail'))
+        self.assertFalse(Job.objects.exists())
+
+    def test_benchmark_task_is_not_registered_for_workers(self):
+        self.assertIsNone(queue.get_task('jobs.noop'))
+
+    def test_deleted_note_is_skipped(self):
+        queue.enqueue('notes.tag_note', note_id=999)
+        with mock.patch('notes.tagging.keywords_for') as keywords_for:
+            queue.work(burst=True)
+        keywords_for.assert_not_called()
+        self.assertFalse(Job.objects.exists())
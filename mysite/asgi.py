@@ -5,6 +5,14 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Run mode: the AI chat endpoint is async under ASGI, so a slow model answer
+does not occupy a worker while it streams. Serve with
+
+    gunicorn mysite.asgi:application -k uvicorn_worker.UvicornWorker --workers 2
+
+(or `uvicorn mysite.asgi:application` locally). The WSGI entry point
+(mysite.wsgi) keeps the sync chat view.
 """
 
 import os
@@ -12,5 +20,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mysite.settings')
+os.environ.setdefault('AI_CHAT_ASYNC', 'True')
 
 application = get_asgi_application()
@@ -0,0 +1,16 @@
+"""
+What the configured cache backends can be trusted with.
+
+Quotas and version counters only mean something across gunicorn workers when
+every worker talks to the same cache. Without REDIS_URL the default cache is
+LocMem, which lives inside one process, so callers check is_shared() and fall
+back to the database or to short timeouts.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_shared(alias='default'):
+    """False for caches that each process keeps to itself (LocMem, dummy)."""
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
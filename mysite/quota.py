@@ -0,0 +1,92 @@
+"""
+Per-client write quotas on the cache backend.
+
+SlidingWindowQuota approximates a sliding window with two fixed buckets: the
+count of the current window plus the previous window's count weighted by how
+much of it still overlaps. A hit increments the current bucket first and is
+rolled back if the estimate goes over the limit, so concurrent requests can
+never all pass. That relies on an atomic cache incr(), which Redis, Memcached
+and the in-process LocMem cache provide; the file and database caches do not.
+
+The `fallback` callable returns the number of hits since the window start (for
+example an indexed COUNT over the rows the client created). It is used when the
+cache is unreachable, and always when the cache is per-process (LocMem): counts
+there would be multiplied by the number of workers and lost on every restart.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import caches
+
+from .caching import is_shared
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QuotaResult:
+    allowed: bool
+    remaining: int
+    retry_after: int  # seconds until another hit may be allowed (0 if allowed)
+
+
+class SlidingWindowQuota:
+    def __init__(self, name, limit, window, fallback=None, cache_alias='default'):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.fallback = fallback
+        self.cache_alias = cache_alias
+
+    def _key(self, client, bucket):
+        return f"quota:{self.name}:{client}:{bucket}"
+
+    def _estimate(self, previous, current, elapsed):
+        return previous * (self.window - elapsed) / self.window + current
+
+    def hit(self, client, now=None):
+        """Record one hit for client if the quota allows it."""
+        now = time.time() if now is None else now
+        bucket, elapsed = divmod(now, self.window)
+        bucket = int(bucket)
+        if self.fallback is not None and not is_shared(self.cache_alias):
+            return self._hit_fallback(client, now)
+        try:
+            return self._hit_cache(client, bucket, elapsed)
+        except Exception as e:
+            if self.fallback is None:
+                raise
+            logger.warning(f"Quota {self.name}: cache unavailable ({e}); counting with fallback")
+            return self._hit_fallback(client, now)
+
+    def _hit_cache(self, client, bucket, elapsed):
+        cache = caches[self.cache_alias]
+        key = self._key(client, bucket)
+        # 버킷은 다음 창까지 가중치로 쓰이므로 창 두 개 동안 유지
+        cache.add(key, 0, timeout=self.window * 2)
+        current = cache.incr(key)
+        previous = cache.get(self._key(client, bucket - 1), 0)
+
+        estimate = self._estimate(previous, current, elapsed)
+        if estimate <= self.limit:
+            return QuotaResult(True, int(self.limit - estimate), 0)
+
+        cache.decr(key)  # 한도를 넘은 요청은 기록하지 않음
+        return QuotaResult(False, 0, self._retry_after(previous, current - 1, elapsed))
+
+    def _retry_after(self, previous, current, elapsed):
+        if current + 1 > self.limit or not previous:
+            # 이전 창의 가중치가 사라져도 모자라면 다음 창까지 대기
+            return int(self.window - elapsed) + 1
+        # 이전 창 가중치가 (limit - current - 1)/previous 아래로 떨어지는 시점
+        overlap_needed = (self.limit - current - 1) / previous
+        return max(int(self.window * (1 - overlap_needed) - elapsed) + 1, 1)
+
+    def _hit_fallback(self, client, now):
+        since = datetime.fromtimestamp(now - self.window, tz=dt_timezone.utc)
+        used = self.fallback(client, since)
+        if used < self.limit:
+            return QuotaResult(True, self.limit - used - 1, 0)
+        return QuotaResult(False, 0, self.window)
@@ -61,6 +61,8 @@ INSTALLED_APPS = [
     'notes',
     'ai_search',
     'projects',
+    'jobs',
+    'api',
     'crispy_forms',
     'crispy_bootstrap5',
     'taggit', # Added for django-taggit
@@ -82,6 +84,9 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'mysite.urls'
 
+# django_ratelimit의 block=True가 던지는 Ratelimited를 미들웨어가 이 뷰로 넘김 (없으면 500)
+RATELIMIT_VIEW = 'ai_search.views.chat_rate_limited'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -169,11 +174,31 @@ STORAGES = {
     "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
 }
 
+# `manage.py test` applies the shared test settings overrides (mysite.test_runner).
+TEST_RUNNER = 'mysite.test_runner.PortfolioTestRunner'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+# Quotas, the sidebar cache version and the chat retrieval change log have to be
+# shared by every worker, so production sets REDIS_URL. Without it each process
+# keeps its own LocMem cache and those callers fall back to the database or to
+# short timeouts (mysite.caching.is_shared).
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
 # Email Settings for Contact Form
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend' # Use console backend for development
 
@@ -186,3 +211,50 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend' # Use console b
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Page views kick off a background Tistory sync when the last one is older than 10 minutes.
+# Off by default with DEBUG so local runs don't fetch the feed; production (DEBUG=False)
+# keeps it on unless TISTORY_AUTO_SYNC=False, e.g. when `manage.py sync_external_posts`
+# runs from cron instead. Tests always run with it off (mysite.test_runner).
+TISTORY_AUTO_SYNC = os.environ.get("TISTORY_AUTO_SYNC", str(not DEBUG)).lower() == "true"
+
+# Background jobs (jobs.queue). With a worker process deployed (`python manage.py run_workers`,
+# e.g. a Render background worker), set JOB_QUEUE_INLINE=False so requests only store Job rows.
+# The default runs each task inline in the request that enqueues it, so nothing piles up
+# in the Job table when no worker is running.
+JOB_QUEUE_INLINE = os.environ.get("JOB_QUEUE_INLINE", "True").lower() == "true"
+
+# Worker processes that encode responsive project image variants (0 = encode inline).
+PROJECT_IMAGE_WORKERS = int(os.environ.get("PROJECT_IMAGE_WORKERS", "1"))
+
+# Upper bound for the per-process LRU of decoded project images served by projects.views.project_image.
+PROJECT_IMAGE_CACHE_BYTES = int(os.environ.get("PROJECT_IMAGE_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+# Notes a single IP may post per sliding window (seconds), enforced by mysite.quota.
+# The quota counts on the shared cache; with a per-process cache it counts Note rows instead.
+NOTE_CREATE_LIMIT = int(os.environ.get("NOTE_CREATE_LIMIT", "3"))
+NOTE_CREATE_WINDOW = int(os.environ.get("NOTE_CREATE_WINDOW", str(24 * 60 * 60)))
+
+# Serve /ai/chat/ with the async view. mysite/asgi.py turns this on, so it only needs
+# setting by hand when running under another ASGI entry point.
+AI_CHAT_ASYNC = os.environ.get("AI_CHAT_ASYNC", "False").lower() == "true"
+
+# Chat model provider: 'openai' or 'local' (Ollama's OpenAI-compatible endpoint).
+AI_SERVICE_PROVIDER = os.environ.get("AI_SERVICE_PROVIDER", "openai").lower()
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
+OPENAI_CHAT_MODEL = os.environ.get("OPENAI_CHAT_MODEL", "gpt-3.5-turbo")
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434/v1")
+OLLAMA_MODEL_NAME = os.environ.get("OLLAMA_MODEL_NAME", "llama3:instruct")
+OPENAI_EMBEDDING_MODEL = os.environ.get("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+OLLAMA_EMBEDDING_MODEL = os.environ.get("OLLAMA_EMBEDDING_MODEL", "nomic-embed-text")
+
+# Chunk embeddings written by `manage.py update_embeddings` and memory-mapped by every worker.
+AI_EMBEDDINGS_DIR = Path(os.environ.get("AI_EMBEDDINGS_DIR", BASE_DIR / "var" / "embeddings"))
+
+# Pooled LLM clients (ai_search.providers): one per process and provider, reused across requests.
+AI_CLIENT_TIMEOUT = float(os.environ.get("AI_CLIENT_TIMEOUT", "60"))
+AI_CLIENT_CONNECT_TIMEOUT = float(os.environ.get("AI_CLIENT_CONNECT_TIMEOUT", "5"))
+AI_CLIENT_MAX_RETRIES = int(os.environ.get("AI_CLIENT_MAX_RETRIES", "2"))
+AI_CLIENT_MAX_CONNECTIONS = int(os.environ.get("AI_CLIENT_MAX_CONNECTIONS", "20"))
+AI_CLIENT_MAX_KEEPALIVE = int(os.environ.get("AI_CLIENT_MAX_KEEPALIVE", "10"))
+AI_CLIENT_KEEPALIVE_EXPIRY = float(os.environ.get("AI_CLIENT_KEEPALIVE_EXPIRY", "60"))
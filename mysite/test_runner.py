@@ -0,0 +1,30 @@
+"""
+Test runner for `manage.py test`.
+
+Every app's tests run with the same settings overrides: plain static storage,
+since the manifest storage needs collectstatic, no background Tistory sync,
+since tests must not reach the network, and queued jobs, so tests drive the
+workers themselves.
+"""
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+TEST_SETTINGS = {
+    'STORAGES': {
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    },
+    'TISTORY_AUTO_SYNC': False,
+    'JOB_QUEUE_INLINE': False,
+}
+
+
+class PortfolioTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._test_settings = override_settings(**TEST_SETTINGS)
+        self._test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._test_settings.disable()
+        super().teardown_test_environment(**kwargs)
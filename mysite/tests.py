@@ -0,0 +1,75 @@
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from .quota import SlidingWindowQuota
+
+
+@mock.patch('mysite.quota.is_shared', return_value=True)
+class SlidingWindowQuotaTests(SimpleTestCase):
+    """Counting on a shared cache (LocMem stands in for Redis here)."""
+
+    def setUp(self):
+        cache.clear()
+        self.quota = SlidingWindowQuota('test', limit=3, window=100)
+
+    def test_limit_and_retry_after(self, _):
+        results = [self.quota.hit('1.2.3.4', now=1000 + i) for i in range(4)]
+        self.assertEqual([r.allowed for r in results], [True, True, True, False])
+        self.assertEqual([r.remaining for r in results[:3]], [2, 1, 0])
+        # 이전 창이 비어 있으므로 다음 창이 시작될 때까지
+        self.assertEqual(results[3].retry_after, 98)
+        self.assertTrue(self.quota.hit('5.6.7.8', now=1003).allowed)
+
+    def test_previous_window_is_weighted(self, _):
+        for i in range(3):
+            self.quota.hit('ip', now=1090 + i)
+        # 1150: 이전 창 3개 x 0.5 = 1.5 -> 한 번 더 허용, 그다음은 거절
+        self.assertTrue(self.quota.hit('ip', now=1150).allowed)
+        denied = self.quota.hit('ip', now=1150)
+        self.assertFalse(denied.allowed)
+        # 3 x (100 - elapsed)/100 + 2 <= 3 이 되는 elapsed 67부터
+        self.assertEqual(denied.retry_after, 17)
+        self.assertTrue(self.quota.hit('ip', now=1150 + denied.retry_after).allowed)
+
+    def test_denied_hits_are_rolled_back(self, _):
+        for i in range(10):
+            self.quota.hit('ip', now=1000 + i)
+        self.assertEqual(cache.get(self.quota._key('ip', 10)), 3)
+
+    def test_concurrent_hits_never_exceed_limit(self, _):
+        results = []
+        barrier = threading.Barrier(20)
+
+        def hit():
+            barrier.wait()
+            results.append(self.quota.hit('ip', now=1000))
+
+        threads = [threading.Thread(target=hit) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum(r.allowed for r in results), 3)
+        self.assertEqual(cache.get(self.quota._key('ip', 10)), 3)
+
+    def test_cache_error_uses_fallback(self, _):
+        fallback = mock.Mock(return_value=3)
+        quota = SlidingWindowQuota('test', limit=3, window=100, fallback=fallback)
+        with mock.patch.object(cache, 'incr', side_effect=ConnectionError('down')), self.assertLogs('mysite.quota', 'WARNING'):
+            result = quota.hit('ip', now=1000)
+        self.assertFalse(result.allowed)
+        self.assertEqual(result.retry_after, 100)
+        self.assertEqual(fallback.call_args.args[0], 'ip')
+
+
+class ProcessLocalCacheQuotaTests(SimpleTestCase):
+    def test_fallback_is_authoritative(self):
+        fallback = mock.Mock(side_effect=[0, 2, 3])
+        quota = SlidingWindowQuota('test', limit=3, window=100, fallback=fallback)
+        results = [quota.hit('ip', now=1000) for _ in range(3)]
+        self.assertEqual([r.allowed for r in results], [True, True, False])
+        self.assertEqual(results[1].remaining, 0)
+        self.assertEqual(fallback.call_count, 3)
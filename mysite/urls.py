@@ -27,6 +27,7 @@ urlpatterns = [
     path("pages/", include("pages.urls")),
     path("", include("blog.urls")),
     path("ai/", include(("ai_search.urls", "ai_search"), namespace="ai_search")),
+    path("api/v1/", include(("api.urls", "api"), namespace="api")),
     # path('markdownx/', include('markdownx.urls')), # markdownx URLs
 ]
 
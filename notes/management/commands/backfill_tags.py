@@ -1,59 +1,40 @@
-import requests
-import json
 from django.core.management.base import BaseCommand
-from notes.models import Note
 
-class Command(BaseCommand):
-    help = 'Backfills tags for existing notes that do not have any.'
-
-    def handle(self, *args, **options):
-        notes_without_tags = Note.objects.filter(tags__isnull=True)
-        if not notes_without_tags.exists():
-            self.stdout.write(self.style.SUCCESS('All notes already have tags. Nothing to do.'))
-            return
-
-        self.stdout.write(self.style.SUCCESS(f'Found {notes_without_tags.count()} notes without tags. Starting backfill...'))
+from notes import tagging
 
-        for note in notes_without_tags:
-            self.stdout.write(f'Processing note: "{note.title}"')
-            if not note.content:
-                self.stdout.write(self.style.WARNING('  - Skipping note as it has no content.'))
-                continue
 
-            try:
-                # --- Prepare the prompt for Ollama ---
-                prompt = (
-                    f"다음 텍스트에서 가장 중요한 핵심 키워드 2개를 쉼표(,)로 구분하여 추출해 주세요. "
-                    f"다른 설명 없이 키워드만 응답해야 합니다. 예: 파이썬,장고\n\n"
-                    f"텍스트: {note.content}"
-                )
-
-                # --- Ollama API Call ---
-                ollama_api_url = "http://localhost:11434/api/generate"
-                payload = {
-                    "model": "llama3:instruct",
-                    "prompt": prompt,
-                    "stream": False
-                }
-                
-                response = requests.post(ollama_api_url, json=payload, timeout=60)
-                response.raise_for_status()
-                
-                ollama_response = response.json()
-                raw_keywords = ollama_response.get('response', '').strip()
-                
-                if raw_keywords:
-                    keyword_list = [tag.strip() for tag in raw_keywords.split(',') if tag.strip()]
-                    note.tags.add(*keyword_list)
-                    self.stdout.write(self.style.SUCCESS(f'  - Successfully added tags: {", ".join(keyword_list)}'))
-                else:
-                    self.stdout.write(self.style.WARNING('  - AI did not return any keywords.'))
+class Command(BaseCommand):
+    help = 'Backfills tags for existing notes that do not have any.'
 
-            except requests.exceptions.RequestException as e:
-                self.stdout.write(self.style.ERROR(f'  - Could not connect to Ollama. Error: {e}'))
-                self.stdout.write(self.style.WARNING('  - Aborting backfill. Please ensure Ollama is running and accessible.'))
-                break # Stop the process if Ollama isn't running
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f'  - An unexpected error occurred: {e}'))
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=tagging.DEFAULT_WORKERS, help='Concurrent Ollama requests.')
+        parser.add_argument('--batch-size', type=int, default=tagging.DEFAULT_BATCH_SIZE, help='Short notes sent per prompt (1 disables batching).')
+        parser.add_argument('--batch-chars', type=int, default=tagging.DEFAULT_BATCH_CHARS, help='Longest note that may share a prompt.')
+        parser.add_argument('--timeout', type=int, default=tagging.DEFAULT_TIMEOUT, help='Seconds to wait for each Ollama answer.')
+        parser.add_argument('--url', default=tagging.OLLAMA_API_URL, help='Ollama /api/generate endpoint.')
+        parser.add_argument('--model', default=tagging.OLLAMA_MODEL_NAME, help='Ollama model name.')
+        parser.add_argument('--restart', action='store_true', help='Ignore the saved checkpoint and start from the first note.')
 
-        self.stdout.write(self.style.SUCCESS('Backfill process complete.'))
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Starting backfill...'))
+
+        result = tagging.backfill_tags(
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            batch_chars=options['batch_chars'],
+            timeout=options['timeout'],
+            url=options['url'],
+            model=options['model'],
+            restart=options['restart'],
+            log=lambda message: self.stdout.write(f'  - {message}'),
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Backfill process complete. Tagged {result.tagged} notes '
+            f'({result.cached} from cache, {result.requests} Ollama requests); '
+            f'{result.empty} got no keywords.'
+        ))
+        if result.failed:
+            self.stdout.write(self.style.WARNING(
+                f'{result.failed} notes could not be tagged. Run the command again to resume from the checkpoint.'
+            ))
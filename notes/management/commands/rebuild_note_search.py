@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from notes import search
+from notes.models import Note
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the notes full-text search index from the Note table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Notes indexed per batch.')
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            self.stdout.write(self.style.WARNING(f'No full-text index for the {connection.vendor} backend. Nothing to do.'))
+            return
+
+        batch_size = options['batch_size']
+        notes = Note.objects.only('id', 'title', 'content').prefetch_related('tags').order_by('id')
+        indexed = 0
+        with transaction.atomic():
+            search.clear_index()
+            last_id = 0
+            while True:
+                batch = list(notes.filter(id__gt=last_id)[:batch_size])
+                if not batch:
+                    break
+                search.index_notes([(n.id, n.title, n.content, [t.name for t in n.tags.all()]) for n in batch])
+                indexed += len(batch)
+                last_id = batch[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} notes.'))
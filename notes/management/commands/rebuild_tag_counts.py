@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from notes.models import rebuild_tag_usage
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the materialized per-tag note counts (TagUsage) from scratch.'
+
+    def handle(self, *args, **options):
+        counted = rebuild_tag_usage()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt note counts for {counted} tags.'))
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+from notes.search import create_index, drop_index, index_notes
+
+BATCH_SIZE = 2000
+
+
+def build_search_index(apps, schema_editor):
+    create_index(schema_editor)
+
+    Note = apps.get_model('notes', 'Note')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    db = schema_editor.connection.alias
+
+    tag_names = {}
+    content_type = ContentType.objects.using(db).filter(app_label='notes', model='note').first()
+    if content_type is not None:
+        items = TaggedItem.objects.using(db).filter(content_type=content_type).values_list('object_id', 'tag__name')
+        for object_id, name in items.iterator():
+            tag_names.setdefault(object_id, []).append(name)
+
+    rows = []
+    for pk, title, content in Note.objects.using(db).values_list('pk', 'title', 'content').iterator():
+        rows.append((pk, title, content, tag_names.get(pk, [])))
+        if len(rows) >= BATCH_SIZE:
+            index_notes(rows, using=schema_editor.connection)
+            rows = []
+    index_notes(rows, using=schema_editor.connection)
+
+
+def remove_search_index(apps, schema_editor):
+    drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notes', '0005_note_board_index'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_search_index, remove_search_index),
+    ]
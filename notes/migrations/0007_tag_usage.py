@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_tag_usage(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    TagUsage = apps.get_model('notes', 'TagUsage')
+    db = schema_editor.connection.alias
+
+    content_type = ContentType.objects.using(db).filter(app_label='notes', model='note').first()
+    if content_type is None:
+        return
+    counts = (
+        TaggedItem.objects.using(db).filter(content_type=content_type)
+        .values('tag_id').annotate(num_times=Count('id')).values_list('tag_id', 'num_times')
+    )
+    TagUsage.objects.using(db).bulk_create(
+        [TagUsage(tag_id=tag_id, num_times=num_times) for tag_id, num_times in counts], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notes', '0006_note_search_index'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagUsage',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='note_usage', serialize=False, to='taggit.tag')),
+                ('num_times', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(populate_tag_usage, migrations.RunPython.noop),
+    ]
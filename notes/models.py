@@ -1,22 +1,111 @@
-from django.db import models
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.db.models import Count, Exists, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from taggit.managers import TaggableManager
 
-from django.db.models.signals import m2m_changed, pre_delete, post_delete
-from django.dispatch import receiver
+from django.db.models.signals import m2m_changed, pre_delete, post_delete, post_save
+from django.dispatch import Signal, receiver
 from taggit.models import Tag, TaggedItem
 
-class Note(models.Model):
+from blog.models import RenderedMarkdownModel
+from . import search
+
+# Note ids per DELETE ... WHERE id IN (...) statement in bulk_delete_notes.
+BULK_DELETE_CHUNK = 500
+
+# Sent with note_ids after bulk_delete_notes commits, since it skips post_delete.
+notes_bulk_deleted = Signal()
+
+
+class Note(RenderedMarkdownModel):
     title = models.CharField(max_length=200)
     content = models.TextField()
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
     tags = TaggableManager()
     ip_address = models.CharField(max_length=45, blank=True, null=True)
 
+    # Notes are written by visitors, so raw HTML in them is escaped.
+    markdown_allow_html = False
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the board seeks on (created_at, id).
+            models.Index(fields=['-created_at', '-id'], name='note_board_idx'),
+            # Per-IP write quota fallback counts recent notes of one IP.
+            models.Index(fields=['ip_address', 'created_at'], name='note_ip_created_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
 
+class TagUsage(models.Model):
+    """
+    Materialized number of notes per tag, kept current by the tag receivers below
+    so the tag cloud never has to COUNT over the taggit tables.
+    """
+    tag = models.OneToOneField(Tag, on_delete=models.CASCADE, primary_key=True, related_name='note_usage')
+    num_times = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.tag_id}: {self.num_times}"
+
+
+class KeywordCache(models.Model):
+    """
+    Keywords the LLM extracted for a piece of note content, keyed by a hash of the
+    content and model so unchanged text is never sent again.
+    """
+    content_hash = models.CharField(max_length=64, primary_key=True)
+    keywords = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.content_hash[:12]}: {', '.join(self.keywords)}"
+
+
+class BackfillCheckpoint(models.Model):
+    """Highest note id a named backfill run has fully processed, so the next run resumes after it."""
+    name = models.CharField(max_length=50, unique=True)
+    last_note_id = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_note_id}"
+
+
+def tag_cloud():
+    """Tags used by at least one note, each annotated with num_times."""
+    return Tag.objects.filter(note_usage__num_times__gt=0).annotate(num_times=F('note_usage__num_times'))
+
+
+def rebuild_tag_usage():
+    """Recompute every TagUsage row from TaggedItem. Returns the number of tags counted."""
+    content_type = ContentType.objects.get_for_model(Note)
+    counts = (
+        TaggedItem.objects.filter(content_type=content_type)
+        .values('tag_id').annotate(num_times=Count('id')).values_list('tag_id', 'num_times')
+    )
+    usages = [TagUsage(tag_id=tag_id, num_times=num_times) for tag_id, num_times in counts]
+    with transaction.atomic():
+        TagUsage.objects.all().delete()
+        TagUsage.objects.bulk_create(usages, batch_size=1000)
+    return len(usages)
+
+
+def _adjust_tag_usage(tag_ids, delta):
+    if not tag_ids:
+        return
+    if delta > 0:
+        TagUsage.objects.bulk_create([TagUsage(tag_id=tag_id) for tag_id in tag_ids], ignore_conflicts=True)
+        TagUsage.objects.filter(tag_id__in=tag_ids).update(num_times=F('num_times') + delta)
+    else:
+        TagUsage.objects.filter(tag_id__in=tag_ids, num_times__gte=-delta).update(num_times=F('num_times') + delta)
+
+
 # ------------------------------
 # Tag cleanup: delete tags that are no longer used by any object
 # ------------------------------
@@ -25,15 +114,94 @@ def _delete_orphan_tags(tag_ids):
     """Delete Tag records whose usage count is 0 (no TaggedItem rows left)."""
     if not tag_ids:
         return
-    for tag_id in tag_ids:
-        if not TaggedItem.objects.filter(tag_id=tag_id).exists():
-            Tag.objects.filter(id=tag_id).delete()
+    # One set-based statement instead of an exists()/delete() pair per tag.
+    Tag.objects.filter(id__in=tag_ids).exclude(
+        Exists(TaggedItem.objects.filter(tag_id=OuterRef('pk')))
+    ).delete()
+
+
+def _recount_tag_usage(tag_ids):
+    """Recompute TagUsage for the given tags in a single UPDATE."""
+    if not tag_ids:
+        return
+    note_count = (
+        TaggedItem.objects.filter(content_type=ContentType.objects.get_for_model(Note), tag_id=OuterRef('tag_id'))
+        .values('tag_id').annotate(n=Count('id')).values('n')
+    )
+    TagUsage.objects.filter(tag_id__in=tag_ids).update(num_times=Coalesce(Subquery(note_count), 0))
+
+
+def _delete_note_rows(note_ids):
+    """
+    DELETE FROM notes_note WHERE id IN (...), skipping Django's deletion collector.
+
+    The public QuerySet.delete() fetches every note to send pre/post_delete, which is
+    the per-note work bulk_delete_notes exists to avoid. Skipping it is only safe
+    while nothing cascades from Note and bulk_delete_notes does itself what the
+    delete receivers do; notes.tests.BulkDeleteNotesTests pins both assumptions.
+    """
+    notes = Note.objects.filter(id__in=note_ids)
+    return notes._raw_delete(notes.db)
+
+
+def bulk_delete_notes(queryset):
+    """
+    Delete the notes in queryset without per-note signals.
+
+    Affected tag ids are collected once; TaggedItems, notes and search entries are
+    deleted per chunk of ids, then TagUsage is recounted and orphan tags removed
+    with one statement each. Returns the number of notes deleted.
+    """
+    note_ids = list(queryset.values_list('id', flat=True))
+    if not note_ids:
+        return 0
+
+    content_type = ContentType.objects.get_for_model(Note)
+    tag_ids = set()
+    with transaction.atomic():
+        for start in range(0, len(note_ids), BULK_DELETE_CHUNK):
+            chunk = note_ids[start:start + BULK_DELETE_CHUNK]
+            items = TaggedItem.objects.filter(content_type=content_type, object_id__in=chunk)
+            tag_ids.update(items.values_list('tag_id', flat=True))
+            items.delete()
+            _delete_note_rows(chunk)
+            search.unindex_notes(chunk)
+        _recount_tag_usage(tag_ids)
+        _delete_orphan_tags(tag_ids)
+        transaction.on_commit(lambda: notes_bulk_deleted.send(sender=Note, note_ids=note_ids))
+    return len(note_ids)
+
+
+def _tag_note_ids(tag):
+    content_type = ContentType.objects.get_for_model(Note)
+    return list(TaggedItem.objects.filter(content_type=content_type, tag=tag).values_list("object_id", flat=True))
 
 
 @receiver(m2m_changed, sender=Note.tags.through)
-def cleanup_tags_on_change(sender, instance, action, pk_set, **kwargs):
-    # When tags are removed/cleared from a note, purge any tags that became unused.
-    if action in ("post_remove", "post_clear"):
+def cleanup_tags_on_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # Changed from the tag side: instance is the Tag and pk_set holds note ids,
+        # so recount that one tag instead of adjusting the tags in pk_set.
+        if action in ("post_add", "post_remove", "post_clear"):
+            TagUsage.objects.bulk_create([TagUsage(tag_id=instance.pk)], ignore_conflicts=True)
+            _recount_tag_usage([instance.pk])
+            if action != "post_add":
+                _delete_orphan_tags([instance.pk])
+        return
+    if not isinstance(instance, Note):
+        return
+    if action == "pre_clear":
+        # clear() sends pk_set=None, so remember which tags are about to go.
+        instance._cleared_tag_ids = list(instance.tags.values_list("id", flat=True))
+        return
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_cleared_tag_ids", [])
+
+    if action == "post_add":
+        _adjust_tag_usage(pk_set, 1)
+    elif action in ("post_remove", "post_clear"):
+        # When tags are removed/cleared from a note, purge any tags that became unused.
+        _adjust_tag_usage(pk_set, -1)
         _delete_orphan_tags(pk_set)
 
 
@@ -45,5 +213,37 @@ def cache_tag_ids_before_note_delete(sender, instance, **kwargs):
 
 @receiver(post_delete, sender=Note)
 def cleanup_tags_after_note_delete(sender, instance, **kwargs):
-    _delete_orphan_tags(getattr(instance, "_deleted_tag_ids", []))
-    
\ No newline at end of file
+    tag_ids = getattr(instance, "_deleted_tag_ids", [])
+    _adjust_tag_usage(tag_ids, -1)
+    _delete_orphan_tags(tag_ids)
+
+
+# ------------------------------
+# Full-text search index sync
+# ------------------------------
+
+@receiver(post_save, sender=Note)
+def index_note_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_note(instance)
+
+
+@receiver(m2m_changed, sender=Note.tags.through)
+def reindex_note_on_tag_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # Tags are indexed with the note, so re-index it when its tag set changes.
+    if reverse:
+        if action == "pre_clear":
+            instance._cleared_note_ids = _tag_note_ids(instance)
+        elif action in ("post_add", "post_remove", "post_clear"):
+            note_ids = pk_set if action != "post_clear" else instance.__dict__.pop("_cleared_note_ids", [])
+            for note in Note.objects.filter(pk__in=note_ids or []):
+                search.index_note(note)
+        return
+    if action in ("post_add", "post_remove", "post_clear") and isinstance(instance, Note):
+        search.index_note(instance)
+
+
+@receiver(post_delete, sender=Note)
+def unindex_note_after_delete(sender, instance, **kwargs):
+    search.unindex_note(instance.pk)
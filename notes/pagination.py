@@ -0,0 +1,45 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """A cursor that no page handed out; serving page 1 for it would repeat rows."""
+
+
+def encode_cursor(note):
+    raw = f"{note.created_at.isoformat()}|{note.pk}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """
+    Return (created_at, id) from an opaque cursor, or None if it is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, pk = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeError):
+        return None
+
+
+def keyset_page(queryset, cursor=None, page_size=30):
+    """
+    One page of rows (notes, or any model with created_at) ordered newest first,
+    seeking past (created_at, id) of the cursor instead of using OFFSET, so every
+    page costs the same on the (created_at, id) index. Returns (rows, next_cursor or None);
+    raises InvalidCursor for a malformed cursor.
+    """
+    queryset = queryset.order_by("-created_at", "-id")
+    if cursor:
+        position = decode_cursor(cursor)
+        if position is None:
+            raise InvalidCursor(cursor)
+        created_at, pk = position
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+    notes = list(queryset[:page_size + 1])
+    next_cursor = encode_cursor(notes[page_size - 1]) if len(notes) > page_size else None
+    return notes[:page_size], next_cursor
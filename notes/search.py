@@ -0,0 +1,231 @@
+"""
+Full-text search for notes.
+
+Text is split into overlapping character bigrams ("포스트잇" -> "포스 스트 트잇")
+before it is indexed, so Korean words match without a morphological analyzer.
+The bigram documents live in a side table keyed by note id:
+
+- SQLite: an FTS5 virtual table, ranked with bm25().
+- PostgreSQL: a tsvector column with a GIN index, ranked with ts_rank().
+
+Other backends fall back to an unranked icontains scan, and so do queries
+made only of one-letter words: a single character is not a bigram, so the
+index cannot find it inside longer words.
+"""
+import re
+import unicodedata
+
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+FTS_TABLE = 'notes_note_fts'
+SEARCH_TABLE = 'notes_note_search'
+# 제목 > 태그 > 본문 순으로 가중치
+SQLITE_WEIGHTS = (10.0, 1.0, 5.0)  # title, content, tags (bm25 column order)
+SNIPPET_RADIUS = 60
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+def _normalize(text):
+    return unicodedata.normalize('NFKC', text or '').lower()
+
+
+def bigrams(text):
+    """
+    Overlapping character bigrams of every word in text; one-letter words are kept as-is.
+    """
+    grams = []
+    for word in _WORD_RE.findall(_normalize(text)):
+        if len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+def _document(text):
+    return ' '.join(bigrams(text))
+
+
+def _query_grams(query):
+    # 순서를 유지한 채 중복 제거
+    return list(dict.fromkeys(bigrams(query)))
+
+
+def is_supported(vendor=None):
+    return (vendor or connection.vendor) in ('sqlite', 'postgresql')
+
+
+def is_indexable(query):
+    """True when query has a word of two or more characters for the bigram index to look up."""
+    return any(len(word) > 1 for word in _WORD_RE.findall(_normalize(query)))
+
+
+# ------------------------------
+# Schema (used by the migration)
+# ------------------------------
+
+def create_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5(title, content, tags, tokenize='unicode61')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+            f"note_id bigint PRIMARY KEY REFERENCES notes_note(id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+            f"document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_gin ON {SEARCH_TABLE} USING GIN (document)"
+        )
+
+
+def drop_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == 'postgresql':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+# ------------------------------
+# Index maintenance
+# ------------------------------
+
+def index_notes(rows, using=connection):
+    """
+    Write (note_id, title, content, tag_names) rows into the search index, replacing old entries.
+    """
+    if not is_supported(using.vendor):
+        return
+    params = [
+        (note_id, _document(title), _document(content), _document(' '.join(tag_names)))
+        for note_id, title, content, tag_names in rows
+    ]
+    if not params:
+        return
+    with using.cursor() as cursor:
+        if using.vendor == 'sqlite':
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(p[0],) for p in params])
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, content, tags) VALUES (%s, %s, %s, %s)", params
+            )
+        else:
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (note_id, document) VALUES (%s, "
+                f"setweight(to_tsvector('simple', %s), 'A') || "
+                f"setweight(to_tsvector('simple', %s), 'C') || "
+                f"setweight(to_tsvector('simple', %s), 'B')) "
+                f"ON CONFLICT (note_id) DO UPDATE SET document = EXCLUDED.document",
+                params,
+            )
+
+
+def index_note(note):
+    index_notes([(note.pk, note.title, note.content, note.tags.names())])
+
+
+def unindex_note(note_id, using=connection):
+    if not is_supported(using.vendor):
+        return
+    with using.cursor() as cursor:
+        if using.vendor == 'sqlite':
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [note_id])
+        else:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE note_id = %s", [note_id])
+
+
+def unindex_notes(note_ids, using=connection):
+    if not is_supported(using.vendor) or not note_ids:
+        return
+    table, key = (FTS_TABLE, 'rowid') if using.vendor == 'sqlite' else (SEARCH_TABLE, 'note_id')
+    placeholders = ', '.join(['%s'] * len(note_ids))
+    with using.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE {key} IN ({placeholders})", list(note_ids))
+
+
+def clear_index(using=connection):
+    if not is_supported(using.vendor):
+        return
+    with using.cursor() as cursor:
+        table = FTS_TABLE if using.vendor == 'sqlite' else SEARCH_TABLE
+        cursor.execute(f"DELETE FROM {table}")
+
+
+# ------------------------------
+# Querying
+# ------------------------------
+
+def search_note_ids(query, limit, offset=0):
+    """
+    Ids of notes matching every bigram of query, best match first.
+    """
+    grams = _query_grams(query)
+    if not grams:
+        return []
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            match = ' '.join(f'"{gram}"' for gram in grams)
+            weights = ', '.join(str(w) for w in SQLITE_WEIGHTS)
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                f"ORDER BY bm25({FTS_TABLE}, {weights}), rowid DESC LIMIT %s OFFSET %s",
+                [match, limit, offset],
+            )
+        else:
+            cursor.execute(
+                f"SELECT note_id FROM {SEARCH_TABLE}, plainto_tsquery('simple', %s) query "
+                f"WHERE document @@ query "
+                f"ORDER BY ts_rank(document, query) DESC, note_id DESC LIMIT %s OFFSET %s",
+                [' '.join(grams), limit, offset],
+            )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _highlight_re(query):
+    terms = set(_WORD_RE.findall(_normalize(query))) | set(_query_grams(query))
+    terms = sorted(terms, key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+
+
+def _mark(text, pattern):
+    parts, last = [], 0
+    for match in pattern.finditer(text):
+        parts.append(escape(text[last:match.start()]))
+        parts.append(f'<mark>{escape(match.group())}</mark>')
+        last = match.end()
+    parts.append(escape(text[last:]))
+    return ''.join(parts)
+
+
+def highlight(text, query):
+    """
+    HTML-escaped text with every query word or bigram wrapped in <mark>.
+    """
+    pattern = _highlight_re(query)
+    if pattern is None:
+        return escape(text)
+    return mark_safe(_mark(text, pattern))
+
+
+def snippet(text, query, radius=SNIPPET_RADIUS):
+    """
+    A highlighted excerpt of text around the first match, or its opening if nothing matches.
+    """
+    text = ' '.join((text or '').split())
+    pattern = _highlight_re(query)
+    found = pattern.search(text) if pattern else None
+    start = max(found.start() - radius, 0) if found else 0
+    end = min(start + radius * 3, len(text))
+    excerpt = text[start:end]
+    body = _mark(excerpt, pattern) if pattern else escape(excerpt)
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if end < len(text) else ''
+    return mark_safe(f'{prefix}{body}{suffix}')
@@ -0,0 +1,265 @@
+"""
+LLM keyword extraction for notes (Ollama /api/generate).
+
+Short notes are batched into one prompt, requests go out on a thread pool and
+every answer is cached by a hash of the note content, so a re-run only sends
+text the model has not seen. backfill_tags() checkpoints the highest note id it
+has fully processed and resumes after it.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from .models import BackfillCheckpoint, KeywordCache, Note
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_API_URL = os.environ.get("OLLAMA_API_URL", "http://localhost:11434/api/generate")
+OLLAMA_MODEL_NAME = os.environ.get("OLLAMA_MODEL_NAME", "llama3:instruct")
+# 프롬프트가 바뀌면 올려서 캐시를 무효화
+PROMPT_VERSION = 1
+CHECKPOINT_NAME = 'backfill_tags'
+
+DEFAULT_WORKERS = 4
+DEFAULT_BATCH_SIZE = 5
+DEFAULT_BATCH_CHARS = 400  # notes at most this long may share a prompt
+DEFAULT_TIMEOUT = 60
+DEFAULT_RETRIES = 2
+
+
+class OllamaError(Exception):
+    pass
+
+
+@dataclass
+class BackfillResult:
+    tagged: int = 0
+    cached: int = 0
+    empty: int = 0
+    failed: int = 0
+    requests: int = 0
+
+
+def content_hash(content, model=OLLAMA_MODEL_NAME):
+    raw = f"{PROMPT_VERSION}\0{model}\0{content}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def single_prompt(content):
+    return (
+        f"다음 텍스트에서 가장 중요한 핵심 키워드 2개를 쉼표(,)로 구분하여 추출해 주세요. "
+        f"다른 설명 없이 키워드만 응답해야 합니다. 예: 파이썬,장고\n\n"
+        f"텍스트: {content}"
+    )
+
+
+def batch_prompt(contents):
+    texts = "\n".join(f"[{i}] {' '.join(content.split())}" for i, content in enumerate(contents, 1))
+    return (
+        f"다음 {len(contents)}개의 텍스트 각각에서 가장 중요한 핵심 키워드 2개를 추출해 주세요. "
+        f"다른 설명 없이 번호를 키로 하는 JSON 객체로만 응답해야 합니다. "
+        f'예: {{"1": ["파이썬", "장고"], "2": ["도커", "배포"]}}\n\n'
+        f"{texts}"
+    )
+
+
+def parse_keywords(raw):
+    keywords = [tag.strip().strip('"\'[]') for tag in (raw or '').split(',')]
+    return list(dict.fromkeys(tag for tag in keywords if tag))
+
+
+def parse_batch(raw, count):
+    """Keyword lists from a batch answer, or None if it is not the JSON object asked for."""
+    raw = (raw or '').strip()
+    start, end = raw.find('{'), raw.rfind('}')
+    if start < 0 or end < start:
+        return None
+    try:
+        data = json.loads(raw[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    results = []
+    for i in range(1, count + 1):
+        value = data.get(str(i))
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = value.split(',')
+        results.append(list(dict.fromkeys(str(tag).strip() for tag in value if str(tag).strip())))
+    return results
+
+
+def generate(prompt, url=OLLAMA_API_URL, model=OLLAMA_MODEL_NAME, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES):
+    """The model's answer to prompt, retrying transient failures with exponential backoff."""
+    payload = json.dumps({"model": model, "prompt": prompt, "stream": False}).encode('utf-8')
+    for attempt in range(retries + 1):
+        request = urllib.request.Request(url, data=payload, headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return json.loads(response.read().decode('utf-8')).get('response', '').strip()
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            if attempt == retries:
+                raise OllamaError(f"Ollama request failed: {e}") from e
+            time.sleep(0.5 * 2 ** attempt)
+
+
+def extract_keywords(contents, **options):
+    """
+    Keyword lists for contents, one prompt for all of them when there are several.
+    Returns (keyword lists, number of requests made). A batch answer that cannot be
+    parsed falls back to one request per content.
+    """
+    if len(contents) > 1:
+        results = parse_batch(generate(batch_prompt(contents), **options), len(contents))
+        if results is not None:
+            return results, 1
+        logger.warning(f"Unparseable batch answer for {len(contents)} notes; retrying one by one")
+        return [parse_keywords(generate(single_prompt(c), **options)) for c in contents], 1 + len(contents)
+    return [parse_keywords(generate(single_prompt(contents[0]), **options))], 1
+
+
+def cached_keywords(hashes):
+    return dict(KeywordCache.objects.filter(content_hash__in=hashes).values_list('content_hash', 'keywords'))
+
+
+def keywords_for(content, model=OLLAMA_MODEL_NAME, **options):
+    """Keywords for one piece of content, from the cache when possible. Raises OllamaError."""
+    digest = content_hash(content, model)
+    cached = cached_keywords([digest])
+    if digest in cached:
+        return cached[digest]
+    (keywords,), _ = extract_keywords([content], model=model, **options)
+    KeywordCache.objects.update_or_create(content_hash=digest, defaults={'keywords': keywords})
+    return keywords
+
+
+def _pages(queryset, after_id, page_size=500):
+    # 키셋 페이지로 읽어 태그를 쓰는 동안 열린 커서를 유지하지 않음
+    while True:
+        page = list(queryset.filter(id__gt=after_id).order_by('id')[:page_size])
+        if not page:
+            return
+        yield from page
+        after_id = page[-1].id
+
+
+def _batches(notes, batch_size, batch_chars):
+    """Group notes (in id order) into units: long notes alone, short notes up to batch_size per unit."""
+    batch = []
+    for note in notes:
+        if len(note.content) > batch_chars or batch_size <= 1:
+            if batch:
+                yield batch
+                batch = []
+            yield [note]
+            continue
+        batch.append(note)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def backfill_tags(
+    queryset=None, workers=DEFAULT_WORKERS, batch_size=DEFAULT_BATCH_SIZE, batch_chars=DEFAULT_BATCH_CHARS,
+    restart=False, checkpoint=CHECKPOINT_NAME, log=None, url=OLLAMA_API_URL, model=OLLAMA_MODEL_NAME,
+    timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+):
+    """
+    Tag every untagged note with LLM-extracted keywords.
+
+    Cached answers are applied without a request; the rest go out in batches on
+    `workers` threads, while tags, the cache and the checkpoint are written from
+    the calling thread. A failed batch is logged and skipped, and the checkpoint
+    stops before it so the next run retries it.
+    """
+    log = log or logger.info
+    options = {'url': url, 'model': model, 'timeout': timeout, 'retries': retries}
+    state, _ = BackfillCheckpoint.objects.get_or_create(name=checkpoint)
+    if restart:
+        state.last_note_id = 0
+        state.save(update_fields=['last_note_id', 'updated_at'])
+
+    if queryset is None:
+        queryset = Note.objects.filter(tags__isnull=True)
+    notes = _pages(queryset.exclude(content='').only('id', 'title', 'content'), state.last_note_id)
+
+    result = BackfillResult()
+    pending = {}   # future -> (unit index, notes, hashes)
+    done = set()   # finished unit indexes not yet folded into the checkpoint
+    last_ids = {}  # unit index -> id of its last note
+    next_unit = 0  # first unit not yet folded into the checkpoint
+    units = enumerate(_batches(notes, batch_size, batch_chars))
+
+    def apply(unit_notes, hashes, keyword_lists, cached):
+        for note, digest, keywords in zip(unit_notes, hashes, keyword_lists):
+            if not cached:
+                KeywordCache.objects.update_or_create(content_hash=digest, defaults={'keywords': keywords})
+            if keywords:
+                note.tags.add(*keywords)
+                result.tagged += 1
+                log(f'Tagged note {note.id} "{note.title}": {", ".join(keywords)}')
+            else:
+                result.empty += 1
+            if cached:
+                result.cached += 1
+
+    def advance():
+        # 앞에서부터 연속으로 성공한 묶음까지만 체크포인트를 전진
+        nonlocal next_unit
+        last_id = None
+        while next_unit in done:
+            done.remove(next_unit)
+            last_id = last_ids.pop(next_unit)
+            next_unit += 1
+        if last_id is not None:
+            state.last_note_id = last_id
+            state.save(update_fields=['last_note_id', 'updated_at'])
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        exhausted = False
+        while not exhausted or pending:
+            # 요청 중인 묶음 수를 제한해 메모리를 일정하게 유지
+            while not exhausted and len(pending) < max(workers, 1) * 2:
+                try:
+                    index, unit_notes = next(units)
+                except StopIteration:
+                    exhausted = True
+                    break
+                last_ids[index] = unit_notes[-1].id
+                hashes = [content_hash(note.content, model) for note in unit_notes]
+                known = cached_keywords(hashes)
+                if len(known) == len(hashes):
+                    apply(unit_notes, hashes, [known[h] for h in hashes], cached=True)
+                    done.add(index)
+                    continue
+                future = pool.submit(extract_keywords, [note.content for note in unit_notes], **options)
+                pending[future] = (index, unit_notes, hashes)
+            advance()
+            if not pending:
+                continue
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index, unit_notes, hashes = pending.pop(future)
+                try:
+                    keyword_lists, requests_made = future.result()
+                except OllamaError as e:
+                    result.failed += len(unit_notes)
+                    log(f'Could not tag notes {unit_notes[0].id}-{unit_notes[-1].id}: {e}')
+                    continue
+                result.requests += requests_made
+                apply(unit_notes, hashes, keyword_lists, cached=False)
+                done.add(index)
+            advance()
+
+    return result
@@ -0,0 +1,15 @@
+from jobs.queue import task
+
+from . import tagging
+from .models import Note
+
+
+@task('notes.tag_note', max_attempts=5, timeout=180)
+def tag_note(note_id):
+    """Add LLM-extracted keywords to a newly created note (runs on a job worker)."""
+    note = Note.objects.filter(id=note_id).only('id', 'content').first()
+    if note is None or not note.content:
+        return
+    keywords = tagging.keywords_for(note.content)
+    if keywords:
+        note.tags.add(*keywords)
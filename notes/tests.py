@@ -1,3 +1,574 @@
-from django.test import TestCase
+import json
+import re
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import m2m_changed, post_delete, pre_delete
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from . import search, tagging
+from taggit.models import Tag, TaggedItem
+
+from . import models
+from .pagination import InvalidCursor, encode_cursor, keyset_page
+from .models import BackfillCheckpoint, Note, TagUsage, bulk_delete_notes, notes_bulk_deleted, rebuild_tag_usage, tag_cloud
+from .views import note_style
+
+
+class NoteBoardQueryTests(TestCase):
+    """The board renders with a constant number of queries however many notes it shows."""
+
+    def setUp(self):
+        cache.clear()
+
+    def _add_notes(self, count):
+        for i in range(count):
+            note = Note.objects.create(title=f'note {i}', content='내용')
+            note.tags.add(f'tag{i}', 'shared')
+
+    def _board_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('notes:notes_index'))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_is_constant(self):
+        self._add_notes(2)
+        few = self._board_queries()
+        self._add_notes(10)
+        self.assertEqual(self._board_queries(), few)
+
+    def test_board_query_count(self):
+        self._add_notes(5)
+        # notes + prefetched tags + tag cloud; the sidebar is not rendered on this page
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('notes:notes_index'))
+        self.assertContains(response, 'shared')
+
+    def test_note_style_is_deterministic(self):
+        self.assertEqual(note_style(42), note_style(42))
+        color, rotation, offset_x, offset_y = note_style(7)
+        self.assertTrue(-3 <= rotation <= 3)
+        self.assertTrue(-7 <= offset_x <= 7 and -7 <= offset_y <= 7)
+
+
+@mock.patch('notes.views.NOTES_PAGE_SIZE', 3)
+class NotesFeedTests(TestCase):
+    """Infinite scroll: following next_cursor visits every matching note once."""
+
+    def setUp(self):
+        same_time = timezone.now()
+        self.notes = [Note.objects.create(title=f'메모 {i}', content='레디스', created_at=same_time) for i in range(7)]
+        for note in self.notes[::2]:
+            note.tags.add('even')
+
+    def feed(self, **params):
+        return self.client.get(reverse('notes:notes_feed'), params)
+
+    def walk(self, **params):
+        pages, cursor = [], ''
+        while True:
+            data = self.feed(cursor=cursor, **params).json()
+            pages.append([int(pk) for pk in re.findall(r'data-note-id="(\d+)"', data['html'])])
+            self.assertEqual(data['count'], len(pages[-1]))
+            cursor = data['next_cursor']
+            if not cursor:
+                return pages
+
+    def test_cursor_continues_across_equal_created_at(self):
+        pages = self.walk()
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), [note.pk for note in reversed(self.notes)])
+
+    def test_last_full_page_has_no_cursor(self):
+        Note.objects.filter(pk=self.notes[0].pk).delete()
+        self.assertEqual([len(page) for page in self.walk()], [3, 3])
+
+    def test_tag_filter(self):
+        pages = self.walk(tag='even')
+        self.assertEqual([len(page) for page in pages], [3, 1])
+        self.assertEqual(sorted(sum(pages, [])), [note.pk for note in self.notes[::2]])
+
+    def test_search_pages_by_rank_offset(self):
+        pages = self.walk(q='레디스')
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sorted(sum(pages, [])), [note.pk for note in self.notes])
+        self.assertEqual(self.feed(q='레디스').json()['next_cursor'], '3')
+
+    def test_malformed_cursor_is_rejected(self):
+        bad = ['garbage!', 'bm90IGEgY3Vyc29y', 'eHx5', '%%%']
+        for cursor in bad:
+            with self.subTest(cursor=cursor):
+                response = self.feed(cursor=cursor)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'error': 'Malformed cursor.'})
+        self.assertEqual(self.feed(cursor='abc', q='레디스').status_code, 400)
+        self.assertEqual(self.feed(cursor=encode_cursor(self.notes[0]), q='레디스').status_code, 400)
+        with self.assertRaises(InvalidCursor):
+            keyset_page(Note.objects.all(), 'garbage!')
+
+
+class NoteContentApiTests(TestCase):
+    def setUp(self):
+        self.notes = [Note.objects.create(title=f'메모 {i}', content=f'**내용 {i}**') for i in range(3)]
+        self.url = reverse('notes:notes_content_api')
+
+    def get(self, ids, **headers):
+        return self.client.get(self.url, {'ids': ids}, headers=headers)
+
+    def test_ids_are_parsed_leniently(self):
+        first, second, _ = self.notes
+        data = self.get(f' {second.pk},{first.pk},x,,{second.pk},-1,²,99999').json()
+        self.assertEqual(list(data['notes']), [str(first.pk), str(second.pk)])
+        self.assertEqual(data['notes'][str(first.pk)], {
+            'title': '메모 0', 'content': '**내용 0**', 'content_html': '<p><strong>내용 0</strong></p>',
+            'created_at': first.created_at.strftime('%Y.%m.%d'),
+        })
+        self.assertEqual(self.get('abc').json(), {'notes': {}})
+        self.assertEqual(self.client.get(self.url).json(), {'notes': {}})
+
+    def test_batch_is_capped_and_loaded_in_one_query(self):
+        for i in range(70):
+            Note.objects.create(title=f'추가 {i}', content='c')
+        ids = list(Note.objects.order_by('id').values_list('id', flat=True))
+        with self.assertNumQueries(1):
+            data = self.get(','.join(map(str, reversed(ids)))).json()
+        self.assertEqual(len(data['notes']), 60)
+        self.assertEqual(list(data['notes']), [str(pk) for pk in ids[:60]])
+
+    def test_validators_and_304(self):
+        ids = ','.join(str(n.pk) for n in self.notes)
+        response = self.get(ids)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.assertRegex(etag, r'^"[0-9a-f]{32}"$')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        newest = max(n.updated_at for n in self.notes)
+        self.assertEqual(last_modified, http_date(int(newest.timestamp())))
+
+        for headers in ({'If-None-Match': etag}, {'If-Modified-Since': last_modified}):
+            with self.subTest(headers=headers), self.assertNumQueries(1):
+                response = self.get(ids, **headers)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b'')
+            self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.get(ids, **{'If-None-Match': '"other"'}).status_code, 200)
+
+    def test_etag_changes_after_an_edit(self):
+        note = self.notes[0]
+        before = self.get(str(note.pk))['ETag']
+        note.content = '고친 내용'
+        note.save()
+        response = self.get(str(note.pk), **{'If-None-Match': before})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], before)
+        self.assertEqual(response.json()['notes'][str(note.pk)]['content'], '고친 내용')
+
+    def test_single_note_endpoint(self):
+        note = self.notes[1]
+        url = reverse('notes:note_content_api', args=[note.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.json()['title'], '메모 1')
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': response['ETag']}).status_code, 304)
+        self.assertEqual(self.client.get(reverse('notes:note_content_api', args=[99999])).status_code, 404)
+
+
+class CreateNoteQuotaTests(TestCase):
+    """create_note answers 429 with Retry-After once an IP used up its quota."""
+
+    def setUp(self):
+        cache.clear()
+
+    def post_note(self, ip='10.0.0.1'):
+        return self.client.post(reverse('notes:create_note'), {'title': 't', 'content': 'c', 'tags': 'quota'}, REMOTE_ADDR=ip)
+
+    def assert_limited(self, response):
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()['status'], 'error')
+        self.assertGreater(int(response['Retry-After']), 0)
+
+    def test_process_local_cache_counts_note_rows(self):
+        for _ in range(3):
+            self.assertEqual(self.post_note().status_code, 200)
+        # 캐시가 비워져도(재시작, 다른 워커) DB 집계는 그대로
+        cache.clear()
+        self.assert_limited(self.post_note())
+        self.assertEqual(Note.objects.count(), 3)
+        self.assertEqual(self.post_note('10.0.0.2').status_code, 200)
+
+    def test_notes_outside_the_window_do_not_count(self):
+        for _ in range(3):
+            self.post_note()
+        Note.objects.update(created_at=timezone.now() - timedelta(days=2))
+        self.assertEqual(self.post_note().status_code, 200)
+
+    def test_shared_cache_counts_in_cache(self):
+        with mock.patch('mysite.quota.is_shared', return_value=True):
+            for _ in range(3):
+                self.assertEqual(self.post_note().status_code, 200)
+            self.assert_limited(self.post_note())
+        self.assertEqual(Note.objects.count(), 3)
+
+    def test_invalid_form_does_not_use_quota(self):
+        for _ in range(5):
+            self.assertEqual(self.client.post(reverse('notes:create_note'), {'title': ''}).status_code, 400)
+        self.assertEqual(self.post_note().status_code, 200)
+
+
+class BigramTests(SimpleTestCase):
+    def test_words_are_split_into_overlapping_bigrams(self):
+        self.assertEqual(search.bigrams('포스트잇'), ['포스', '스트', '트잇'])
+        self.assertEqual(search.bigrams('Ｃａｆｅ a_b, 가'), ['ca', 'af', 'fe', 'a', 'b', '가'])
+        self.assertEqual(search.bigrams('  !? '), [])
+
+    def test_one_letter_queries_are_not_indexable(self):
+        self.assertFalse(search.is_indexable('c'))
+        self.assertFalse(search.is_indexable('가 나'))
+        self.assertFalse(search.is_indexable('!!'))
+        self.assertTrue(search.is_indexable('c 언어'))
+
+
+class SearchSchemaTests(SimpleTestCase):
+    def test_postgresql_note_id_matches_the_note_primary_key(self):
+        schema_editor = mock.Mock()
+        schema_editor.connection.vendor = 'postgresql'
+        search.create_index(schema_editor)
+        ddl = schema_editor.execute.call_args_list[0].args[0]
+        # notes_note.id 는 BigAutoField(bigint)이므로 참조 컬럼도 같은 타입이어야 함
+        self.assertEqual(Note._meta.pk.get_internal_type(), 'BigAutoField')
+        self.assertIn('note_id bigint PRIMARY KEY REFERENCES notes_note(id)', ddl)
+
+
+class HighlightTests(SimpleTestCase):
+    def test_text_is_escaped_around_marks(self):
+        self.assertEqual(
+            search.highlight('<script>alert(1)</script> Redis 캐시', 'redis'),
+            '&lt;script&gt;alert(1)&lt;/script&gt; <mark>Redis</mark> 캐시',
+        )
+
+    def test_matches_are_taken_before_escaping(self):
+        # 'amp'나 'lt' 검색이 이스케이프된 엔티티 안쪽에 <mark>를 넣지 않음
+        self.assertEqual(search.highlight('a & b amp', 'amp'), 'a &amp; b <mark>amp</mark>')
+        self.assertEqual(search.highlight('<lt>', 'lt'), '&lt;<mark>lt</mark>&gt;')
+        self.assertEqual(search.highlight('"quoted"', '"quoted"'), '&quot;<mark>quoted</mark>&quot;')
+
+    def test_query_markup_is_not_injected(self):
+        self.assertEqual(search.highlight('x <b>bold</b>', '<b>bold</b>'), 'x &lt;<mark>b</mark>&gt;<mark>bold</mark>&lt;/<mark>b</mark>&gt;')
+        self.assertEqual(search.highlight('<i>x</i>', '!!'), '&lt;i&gt;x&lt;/i&gt;')
+
+    def test_snippet_is_escaped_and_centred_on_the_match(self):
+        text = '<img src=x onerror=alert(1)> ' + '가' * 100 + ' Redis 캐시 ' + '<b>' * 60
+        excerpt = search.snippet(text, '캐시', radius=10)
+        self.assertNotIn('<img', excerpt)
+        self.assertNotIn('<b>', excerpt)
+        self.assertTrue(excerpt.startswith('…') and excerpt.endswith('…'))
+        self.assertIn('<mark>캐시</mark>', excerpt)
+        self.assertEqual(search.snippet('<b>x</b>', 'zz'), '&lt;b&gt;x&lt;/b&gt;')
+
+
+class NoteSearchTests(TestCase):
+    def ids(self, query):
+        return search.search_note_ids(query, limit=10)
+
+    def test_save_tags_and_delete_keep_the_index_in_sync(self):
+        note = Note.objects.create(title='포스트잇 보드', content='Django 캐시')
+        self.assertEqual(self.ids('포스트잇'), [note.pk])
+        self.assertEqual(self.ids('스트잇'), [note.pk])
+
+        note.title = '메모장'
+        note.save()
+        self.assertEqual(self.ids('포스트잇'), [])
+        self.assertEqual(self.ids('메모장'), [note.pk])
+
+        note.tags.add('파이썬')
+        self.assertEqual(self.ids('파이썬'), [note.pk])
+        note.tags.remove('파이썬')
+        self.assertEqual(self.ids('파이썬'), [])
+        note.tags.add('장고')
+        note.tags.clear()
+        self.assertEqual(self.ids('장고'), [])
+
+        note.delete()
+        self.assertEqual(self.ids('메모장'), [])
+
+    def test_title_outranks_tags_and_content(self):
+        in_content = Note.objects.create(title='a', content='Redis 설정')
+        in_title = Note.objects.create(title='Redis 설정', content='b')
+        in_tags = Note.objects.create(title='c', content='d')
+        in_tags.tags.add('redis')
+        self.assertEqual(self.ids('redis'), [in_title.pk, in_tags.pk, in_content.pk])
+
+    def test_every_bigram_must_match(self):
+        note = Note.objects.create(title='레디스 캐시', content='')
+        Note.objects.create(title='레디스', content='')
+        self.assertEqual(self.ids('캐시 레디스'), [note.pk])
+
+    def test_board_search_highlights_escaped_titles(self):
+        Note.objects.create(title='<b>Redis</b> 정리', content='<script>alert(1)</script> Redis 캐시')
+        response = self.client.get(reverse('notes:notes_index'), {'q': 'redis'})
+        self.assertContains(response, '&lt;b&gt;<mark>Redis</mark>&lt;/b&gt; 정리')
+        self.assertContains(response, '&lt;script&gt;alert(1)&lt;/script&gt; <mark>Redis</mark> 캐시')
+        self.assertNotContains(response, '<script>alert(1)')
+
+    def test_one_letter_query_scans_with_icontains(self):
+        note = Note.objects.create(title='C언어 포인터', content='')
+        Note.objects.create(title='파이썬', content='')
+        self.assertEqual(self.ids('c'), [])
+        response = self.client.get(reverse('notes:notes_index'), {'q': 'c'})
+        self.assertEqual([n.pk for n in response.context['notes']], [note.pk])
+
+
+class TagUsageTests(TestCase):
+    def setUp(self):
+        self.note = Note.objects.create(title='첫 메모', content='x')
+        self.other = Note.objects.create(title='둘째 메모', content='y')
+
+    def usage(self):
+        return dict(TagUsage.objects.values_list('tag__name', 'num_times'))
+
+    def test_add_remove_and_clear(self):
+        self.note.tags.add('django', 'redis')
+        self.other.tags.add('django')
+        self.assertEqual(self.usage(), {'django': 2, 'redis': 1})
+        self.assertEqual({tag.name: tag.num_times for tag in tag_cloud()}, {'django': 2, 'redis': 1})
+
+        self.note.tags.remove('django')
+        self.assertEqual(self.usage(), {'django': 1, 'redis': 1})
+        self.note.tags.clear()
+        # 더 이상 쓰이지 않는 태그는 TagUsage와 함께 삭제됨
+        self.assertEqual(self.usage(), {'django': 1})
+        self.assertFalse(Tag.objects.filter(name='redis').exists())
+
+        self.note.tags.add('django')
+        self.note.tags.add('django')
+        self.assertEqual(self.usage(), {'django': 2})
+
+    def test_note_delete(self):
+        self.note.tags.add('django', 'redis')
+        self.other.tags.add('django')
+        self.note.delete()
+        self.assertEqual(self.usage(), {'django': 1})
+        self.assertEqual(list(Tag.objects.values_list('name', flat=True)), ['django'])
+
+    def test_rebuild_tag_usage(self):
+        self.note.tags.add('django', 'redis')
+        self.other.tags.add('django')
+        TagUsage.objects.all().delete()
+        TagUsage.objects.create(tag=Tag.objects.create(name='stale'), num_times=9)
+        self.assertEqual(rebuild_tag_usage(), 2)
+        self.assertEqual(self.usage(), {'django': 2, 'redis': 1})
+
+    def send_reverse(self, tag, action, note_ids):
+        m2m_changed.send(sender=Note.tags.through, instance=tag, action=action, reverse=True,
+                         model=Note, pk_set=note_ids, using='default')
+
+    def test_changes_from_the_tag_side(self):
+        # taggit 자체는 reverse=True를 보내지 않으므로 태그 쪽 변경을 직접 흉내 냄
+        tag = Tag.objects.create(name='파이썬')
+        content_type = ContentType.objects.get_for_model(Note)
+        for note in (self.note, self.other):
+            TaggedItem.objects.create(tag=tag, content_type=content_type, object_id=note.pk)
+        self.send_reverse(tag, 'post_add', {self.note.pk, self.other.pk})
+        self.assertEqual(self.usage(), {'파이썬': 2})
+        self.assertEqual(sorted(search.search_note_ids('파이썬', limit=10)), [self.note.pk, self.other.pk])
+
+        TaggedItem.objects.filter(object_id=self.note.pk).delete()
+        self.send_reverse(tag, 'post_remove', {self.note.pk})
+        self.assertEqual(self.usage(), {'파이썬': 1})
+        self.assertEqual(search.search_note_ids('파이썬', limit=10), [self.other.pk])
+
+        self.send_reverse(tag, 'pre_clear', None)
+        TaggedItem.objects.filter(tag=tag).delete()
+        self.send_reverse(tag, 'post_clear', None)
+        self.assertEqual(self.usage(), {})
+        self.assertFalse(Tag.objects.filter(pk=tag.pk).exists())
+        self.assertEqual(search.search_note_ids('파이썬', limit=10), [])
+
+
+class BulkDeleteNotesTests(TestCase):
+    def setUp(self):
+        self.first = Note.objects.create(title='첫 메모', content='레디스')
+        self.second = Note.objects.create(title='둘째 메모', content='레디스')
+        self.kept = Note.objects.create(title='남는 메모', content='레디스')
+        self.first.tags.add('shared', 'gone')
+        self.second.tags.add('shared', 'gone')
+        self.kept.tags.add('shared', 'kept')
+
+    def usage(self):
+        return dict(TagUsage.objects.values_list('tag__name', 'num_times'))
+
+    def add_notes(self, count):
+        for i in range(count):
+            Note.objects.create(title=f'bulk {i}', content='x').tags.add(f'bulk{i}', 'shared')
+        return Note.objects.filter(title__startswith='bulk')
+
+    def test_tags_usage_and_search_are_updated(self):
+        deleted = mock.Mock()
+        notes_bulk_deleted.connect(deleted)
+        self.addCleanup(notes_bulk_deleted.disconnect, deleted)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.assertEqual(bulk_delete_notes(Note.objects.exclude(pk=self.kept.pk)), 2)
+            deleted.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+        deleted.assert_called_once()
+        self.assertEqual(deleted.call_args.kwargs['sender'], Note)
+        self.assertEqual(sorted(deleted.call_args.kwargs['note_ids']), [self.first.pk, self.second.pk])
+
+        self.assertEqual(list(Note.objects.all()), [self.kept])
+        self.assertEqual(self.usage(), {'shared': 1, 'kept': 1})
+        self.assertFalse(Tag.objects.filter(name='gone').exists())
+        self.assertEqual(search.search_note_ids('레디스', limit=10), [self.kept.pk])
+        self.assertEqual(search.search_note_ids('메모', limit=10), [self.kept.pk])
+
+    def test_per_note_signals_are_skipped(self):
+        receiver = mock.Mock()
+        post_delete.connect(receiver, sender=Note)
+        self.addCleanup(post_delete.disconnect, receiver, sender=Note)
+        bulk_delete_notes(Note.objects.all())
+        receiver.assert_not_called()
+        self.assertFalse(Tag.objects.exists())
+        self.assertEqual(bulk_delete_notes(Note.objects.all()), 0)
+
+    def test_query_count_grows_per_chunk_not_per_note(self):
+        few = self.add_notes(3)
+        with CaptureQueriesContext(connection) as small:
+            bulk_delete_notes(few)
+        many = self.add_notes(40)
+        with self.assertNumQueries(len(small.captured_queries)):
+            bulk_delete_notes(many)
+
+        chunked = self.add_notes(12)
+        with mock.patch.object(models, 'BULK_DELETE_CHUNK', 5), CaptureQueriesContext(connection) as three_chunks:
+            bulk_delete_notes(chunked)
+        # 조각마다 태그 조회, TaggedItem·노트·검색 항목 DELETE 네 문장
+        self.assertEqual(len(three_chunks.captured_queries), len(small.captured_queries) + 2 * 4)
+
+    def test_raw_delete_assumptions(self):
+        # _delete_note_rows는 연쇄 삭제와 삭제 시그널을 건너뜀: Note를 가리키는 FK가 생기거나
+        # 삭제 receiver가 늘면 bulk_delete_notes도 같이 고쳐야 함
+        self.assertEqual([rel for rel in Note._meta.related_objects if not rel.many_to_many], [])
+        receivers = {
+            signal: sorted(f'{r.__module__}.{r.__name__}' for r in signal._live_receivers(Note)[0])
+            for signal in (pre_delete, post_delete)
+        }
+        self.assertEqual(receivers, {
+            pre_delete: ['notes.models.cache_tag_ids_before_note_delete'],  # 태그 재집계로 대신함
+            post_delete: [
+                'ai_search.retrieval.unindex_deleted',  # notes_bulk_deleted로 대신함
+                'notes.models.cleanup_tags_after_note_delete',  # 태그 재집계·고아 태그 삭제로 대신함
+                'notes.models.unindex_note_after_delete',  # search.unindex_notes로 대신함
+            ],
+        })
+
+
+class FakeOllama:
+    """
+    Minimal stand-in for Ollama's /api/generate on a local port. Each text is
+    tagged with its first word; `latency` delays every answer and prompts
+    containing `fail_marker` get a 500.
+    """
+
+    def __init__(self, latency=0.0, fail_marker=None):
+        self.latency = latency
+        self.fail_marker = fail_marker
+        self.prompts = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                prompt = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['prompt']
+                fake.prompts.append(prompt)
+                time.sleep(fake.latency)
+                if fake.fail_marker and fake.fail_marker in prompt:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                body = json.dumps({'response': fake.answer(prompt)}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/api/generate'
+
+    @staticmethod
+    def answer(prompt):
+        texts = re.findall(r'^\[(\d+)\] (\S+)', prompt, re.MULTILINE)
+        if texts:
+            return json.dumps({index: [word, 'batch'] for index, word in texts})
+        return f"{prompt.split('텍스트: ', 1)[1].split()[0]},single"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class BackfillTagsTests(TestCase):
+    """backfill_tags() against a local fake Ollama server."""
+
+    def _notes(self, *contents):
+        return [Note.objects.create(title=f'note {i}', content=content) for i, content in enumerate(contents)]
+
+    def test_requests_run_concurrently(self):
+        notes = self._notes('alpha text', 'beta text', 'gamma text', 'delta text')
+        with FakeOllama(latency=0.3) as ollama:
+            started = time.monotonic()
+            result = tagging.backfill_tags(url=ollama.url, workers=4, batch_size=1)
+            elapsed = time.monotonic() - started
+        self.assertEqual(result.tagged, 4)
+        self.assertEqual(len(ollama.prompts), 4)
+        self.assertLess(elapsed, 0.9)  # one at a time would take 1.2s
+        self.assertEqual(sorted(notes[1].tags.names()), ['beta', 'single'])
+
+    def test_short_notes_share_a_prompt(self):
+        notes = self._notes('one', 'two', 'three', 'four', 'five', 'six', 'long ' * 100)
+        with FakeOllama() as ollama:
+            result = tagging.backfill_tags(url=ollama.url, workers=1, batch_size=3, batch_chars=50)
+        self.assertEqual(result.tagged, 7)
+        self.assertEqual(result.requests, 3)  # two batches of three + the long note alone
+        self.assertEqual(sorted(notes[4].tags.names()), ['batch', 'five'])
+        self.assertEqual(sorted(notes[6].tags.names()), ['long', 'single'])
+
+    def test_unchanged_content_is_served_from_cache(self):
+        note, = self._notes('cached words')
+        with FakeOllama() as ollama:
+            tagging.backfill_tags(url=ollama.url, batch_size=1)
+            note.tags.clear()
+            twin, = self._notes('cached words')
+            result = tagging.backfill_tags(url=ollama.url, batch_size=1, restart=True)
+        self.assertEqual(len(ollama.prompts), 1)
+        self.assertEqual(result.cached, 2)
+        self.assertEqual(sorted(twin.tags.names()), ['cached', 'single'])
+
+    def test_failed_run_resumes_from_checkpoint(self):
+        first, broken, last = self._notes('first note', 'broken note', 'last note')
+        with FakeOllama(fail_marker='broken') as ollama:
+            result = tagging.backfill_tags(url=ollama.url, workers=1, batch_size=1, retries=0)
+        self.assertEqual((result.tagged, result.failed), (2, 1))
+        self.assertEqual(BackfillCheckpoint.objects.get(name=tagging.CHECKPOINT_NAME).last_note_id, first.id)
+
+        with FakeOllama() as ollama:
+            result = tagging.backfill_tags(url=ollama.url, workers=1, batch_size=1)
+        self.assertEqual(result.tagged, 1)
+        self.assertEqual(len(ollama.prompts), 1)
+        self.assertIn('broken note', ollama.prompts[0])
+        self.assertFalse(Note.objects.filter(tags__isnull=True).exists())
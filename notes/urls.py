@@ -7,7 +7,9 @@ urlpatterns = [
     path('', views.index, name='notes_index'),
     path('tag/<str:tag_name>/', views.index, name='tagged_notes'),
     path('note/<int:note_id>/', views.note_detail, name='note_detail'),
+    path('api/notes/', views.notes_content_api, name='notes_content_api'),
     path('api/notes/<int:note_id>/', views.note_content_api, name='note_content_api'),
+    path('api/feed/', views.notes_feed, name='notes_feed'),
 
     path('new/', views.create_note, name='create_note'),
     path('admin/delete-all/', views.admin_delete_all_notes, name='admin_delete_all'),
@@ -1,52 +1,136 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.http import JsonResponse
-from django.db.models import Count, Q # Q 임포트
-from .models import Note
+from django.db.models import Q # Q 임포트
+from django.template.loader import render_to_string
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from .models import Note, bulk_delete_notes, tag_cloud
 from .forms import NoteForm
-from taggit.models import Tag # Import Tag model
+from .pagination import InvalidCursor, keyset_page
+from . import search
+from jobs.queue import enqueue
+from mysite.quota import SlidingWindowQuota
+from functools import lru_cache
+import hashlib
 import random # random 모듈 추가
 
-def index(request, tag_name=None):
-    notes = Note.objects.all().order_by("-created_at") # 기본 쿼리셋
+NOTES_PAGE_SIZE = 30
+ADMIN_NOTES_PAGE_SIZE = 50
+NOTE_API_BATCH_LIMIT = 60
+# 브라우저가 매번 ETag로 재검증하도록 (변경이 없으면 304)
+NOTE_API_CACHE_CONTROL = 'no-cache'
+NOTE_COLORS = ('#fff9c4', '#c4e6ff', '#d6ffc4', '#ffd6ed') # Post-it 색상
+# 보드 카드에 필요한 컬럼만 로드 (content_html, ip_address 등 제외)
+BOARD_FIELDS = ('id', 'title', 'content', 'created_at')
+
 
-    query = request.GET.get('q') # 'q' 파라미터에서 검색어 가져오기
-    tag_param = request.GET.get('tag') # 'tag' 파라미터에서 태그 이름 가져오기
+def _board_page(request, tag_name=None, cursor=None):
+    """
+    One page of board notes: (notes, next_cursor, tag, query).
+    A free-text query ('q') is answered by the full-text index, a tag (URL path or 'tag') by an exact tag filter.
+    """
+    # 태그는 prefetch로 한 번에 가져와 노트마다 쿼리가 나가지 않도록 함
+    notes = Note.objects.only(*BOARD_FIELDS).prefetch_related('tags') # 기본 쿼리셋
 
-    # URL 경로로 tag_name이 제공된 경우 (예: /notes/tag/python/)
-    # 또는 검색 폼의 'q' 파라미터가 비어 있고 URL 경로에 tag_name이 있는 경우
-    if tag_name and not query and not tag_param: # tag_param도 고려
-        query = tag_name # URL 경로의 태그 이름을 검색 쿼리로 사용
-    elif tag_param and not query: # 'q'가 없고 'tag' 파라미터가 있는 경우
-        query = tag_param # 'tag' 파라미터를 검색 쿼리로 사용
+    query = (request.GET.get('q') or '').strip() # 'q' 파라미터에서 검색어 가져오기
+    tag = request.GET.get('tag') or tag_name # 'tag' 파라미터 또는 URL 경로의 태그 이름 (예: /notes/tag/python/)
 
     if query:
-        # 제목 또는 태그 이름으로 검색
+        notes, next_cursor = _search_page(notes, query, cursor)
+        return notes, next_cursor, None, query
+
+    if tag:
+        notes = notes.filter(tags__name=tag)
+    notes, next_cursor = keyset_page(notes, cursor, NOTES_PAGE_SIZE)
+    return notes, next_cursor, tag, query
+
+
+def _search_page(notes, query, cursor):
+    """
+    One page of notes ranked by relevance, with highlighted title and content snippet.
+    """
+    if not search.is_supported() or not search.is_indexable(query):
+        # 전문 검색 인덱스가 없는 DB나 한 글자 검색어는 기존 방식으로 검색
         notes = notes.filter(
             Q(title__icontains=query) |
+            Q(content__icontains=query) |
             Q(tags__name__icontains=query)
         ).distinct() # 중복 노트 제거
-    
-    form = NoteForm()
-    all_tags = Tag.objects.annotate(num_times=Count('note')).all()
+        return keyset_page(notes, cursor, NOTES_PAGE_SIZE)
+
+    # 검색 결과는 관련도 순이라 커서는 순위 오프셋
+    if cursor and not cursor.isdigit():
+        raise InvalidCursor(cursor)
+    offset = int(cursor) if cursor else 0
+    ids = search.search_note_ids(query, limit=NOTES_PAGE_SIZE + 1, offset=offset)
+    next_cursor = str(offset + NOTES_PAGE_SIZE) if len(ids) > NOTES_PAGE_SIZE else None
+    ids = ids[:NOTES_PAGE_SIZE]
+
+    by_id = notes.in_bulk(ids)
+    page = [by_id[note_id] for note_id in ids if note_id in by_id]
+    for note in page:
+        note.title_html = search.highlight(note.title, query)
+        note.snippet = search.snippet(note.content, query)
+    return page, next_cursor
+
 
+@lru_cache(maxsize=4096)
+def note_style(note_id):
+    """
+    (color, rotation, offset_x, offset_y) for a note, a pure function of its id.
+    """
+    # 전역 RNG를 다시 시드하지 않도록 노트 ID로 시드한 로컬 Random 사용 (기존과 같은 값)
+    rng = random.Random(note_id)
+    color = rng.choice(NOTE_COLORS)
+    rotation = (rng.random() * 6) - 3 # -3 to +3 deg
+    offset_x = (rng.random() * 14) - 7 # -7 to +7 px
+    offset_y = (rng.random() * 14) - 7 # -7 to +7 px
+    return color, rotation, offset_x, offset_y
+
+
+def _decorate_notes(notes):
     # 각 노트에 결정론적 무작위 스타일 적용
-    colors = ['#fff9c4', '#c4e6ff', '#d6ffc4', '#ffd6ed'] # Post-it 색상
     for note in notes:
-        # 노트 ID를 시드로 사용하여 결정론적 무작위성 확보
-        random.seed(note.id)
-        note.random_color = random.choice(colors)
-        note.random_rotation = (random.random() * 6) - 3 # -3 to +3 deg
-        note.random_offset_x = (random.random() * 14) - 7 # -7 to +7 px
-        note.random_offset_y = (random.random() * 14) - 7 # -7 to +7 px
-    
+        (note.random_color, note.random_rotation,
+         note.random_offset_x, note.random_offset_y) = note_style(note.id)
+    return notes
+
+
+def index(request, tag_name=None):
+    # 첫 화면은 고정 크기 페이지만 렌더링하고, 나머지는 notes_feed로 이어서 불러옵니다.
+    notes, next_cursor, tag, query = _board_page(request, tag_name)
+    _decorate_notes(notes)
+
+    form = NoteForm()
+    all_tags = tag_cloud() # 태그별 노트 수는 TagUsage에 미리 집계되어 있음
+
     context = {
         'notes': notes,
-        'tag_name': query, # 이제 tag_name은 검색 쿼리와 동일
+        'next_cursor': next_cursor,
+        'tag_name': tag,
+        'query': query,
         'form': form,
         'all_tags': all_tags,
     }
     return render(request, 'notes/index.html', context)
 
+
+def notes_feed(request):
+    """
+    Next page of the board for infinite scroll: pre-rendered note cards plus the cursor.
+    """
+    try:
+        notes, next_cursor, _, _ = _board_page(request, cursor=request.GET.get('cursor'))
+    except InvalidCursor:
+        # 첫 페이지를 다시 주면 클라이언트가 같은 카드를 또 붙이므로 거절
+        return JsonResponse({'error': 'Malformed cursor.'}, status=400)
+    _decorate_notes(notes)
+    html = render_to_string('notes/_note_cards.html', {'notes': notes})
+    return JsonResponse({'html': html, 'next_cursor': next_cursor, 'count': len(notes)})
+
 def note_detail(request, note_id):
     note = get_object_or_404(Note, pk=note_id)
     context = {
@@ -62,20 +146,38 @@ def get_client_ip(request):
         ip = request.META.get('REMOTE_ADDR')
     return ip
 
+def _notes_created_since(ip_address, since):
+    # 공유 캐시가 없거나 쓸 수 없을 때의 집계 (ip_address, created_at 인덱스 사용)
+    return Note.objects.filter(ip_address=ip_address, created_at__gte=since).count()
+
+
+note_quota = SlidingWindowQuota(
+    'create_note', settings.NOTE_CREATE_LIMIT, settings.NOTE_CREATE_WINDOW, fallback=_notes_created_since,
+)
+
+
 def create_note(request):
     if request.method == 'POST':
         ip_address = get_client_ip(request)
-        note_count = Note.objects.filter(ip_address=ip_address).count()
-
-        if note_count >= 3:
-            return JsonResponse({'status': 'error', 'message': 'IP당 3개의 노트만 생성할 수 있습니다.'}, status=403)
 
         form = NoteForm(request.POST)
         if form.is_valid():
+            # 유효한 요청만 한도를 차감
+            quota = note_quota.hit(ip_address)
+            if not quota.allowed:
+                response = JsonResponse({
+                    'status': 'error',
+                    'message': f'IP당 {settings.NOTE_CREATE_WINDOW // 3600}시간에 {settings.NOTE_CREATE_LIMIT}개의 노트만 생성할 수 있습니다.',
+                }, status=429)
+                response['Retry-After'] = str(quota.retry_after)
+                return response
+
             note = form.save(commit=False)
             note.ip_address = ip_address
             note.save()
             form.save_m2m() # Save ManyToMany relations for tags
+            # 키워드 추출은 느리므로 작업 큐에 넘기고 바로 응답
+            transaction.on_commit(lambda: enqueue('notes.tag_note', note_id=note.id))
             return JsonResponse({'status': 'success', 'message': '노트가 성공적으로 저장되었습니다.'})
         else:
             return JsonResponse({'status': 'error', 'errors': form.errors}, status=400)
@@ -91,22 +193,61 @@ from django.contrib import messages
 from django.contrib.auth.decorators import user_passes_test
 from django.contrib import messages
 
-def note_content_api(request, note_id):
-    note = get_object_or_404(Note, pk=note_id)
-    data = {
+def _note_payload(note):
+    return {
         'title': note.title,
         'content': note.content,
+        'content_html': note.rendered_content,
         'created_at': note.created_at.strftime('%Y.%m.%d'),
         # Add other fields as needed
     }
-    return JsonResponse(data)
+
+
+def _conditional_json(request, notes, build):
+    """
+    JSON response validated by an ETag over (id, updated_at, render key) of notes and
+    Last-Modified of the newest one; a matching conditional request gets a 304 and
+    `build` is never called.
+    """
+    fingerprint = '|'.join(f'{n.pk}:{n.updated_at.isoformat()}:{n.content_html_key}' for n in notes)
+    etag = f'"{hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:32]}"'
+    last_modified = max((n.updated_at for n in notes), default=None)
+    last_modified = last_modified and int(last_modified.timestamp())
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = JsonResponse(build())
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = NOTE_API_CACHE_CONTROL
+    return response
+
+
+def note_content_api(request, note_id):
+    note = get_object_or_404(Note, pk=note_id)
+    return _conditional_json(request, [note], lambda: _note_payload(note))
+
+
+def notes_content_api(request):
+    """
+    Content of several notes in one query: ?ids=1,2,3 -> {"notes": {"1": {...}, ...}}.
+    The board prefetches visible notes with it so pop-ups open without a round trip.
+    """
+    ids = []
+    for raw in request.GET.get('ids', '').split(','):
+        if raw.strip().isdecimal():  # isdigit()는 '²'도 받아 int()가 실패함
+            ids.append(int(raw))
+    ids = sorted(set(ids))[:NOTE_API_BATCH_LIMIT]
+    notes = list(Note.objects.filter(id__in=ids).order_by('id')) if ids else []
+    return _conditional_json(request, notes, lambda: {'notes': {str(n.pk): _note_payload(n) for n in notes}})
 
 @user_passes_test(lambda u: u.is_superuser)
 def admin_delete_all_notes(request):
     if request.method == 'POST':
         if 'delete_all' in request.POST:
             try:
-                Note.objects.all().delete()
+                bulk_delete_notes(Note.objects.all())
                 messages.success(request, '모든 노트가 성공적으로 삭제되었습니다.')
             except Exception as e:
                 messages.error(request, f'노트 삭제 중 오류가 발생했습니다: {e}')
@@ -118,8 +259,8 @@ def admin_delete_all_notes(request):
                 messages.error(request, '삭제할 노트를 선택해주세요.')
                 return redirect('notes:admin_delete_all')
             try:
-                Note.objects.filter(id__in=note_ids).delete()
-                messages.success(request, f'{len(note_ids)}개의 노트가 성공적으로 삭제되었습니다.')
+                deleted = bulk_delete_notes(Note.objects.filter(id__in=note_ids))
+                messages.success(request, f'{deleted}개의 노트가 성공적으로 삭제되었습니다.')
             except Exception as e:
                 messages.error(request, f'노트 삭제 중 오류가 발생했습니다: {e}')
             return redirect('notes:admin_delete_all')
@@ -128,5 +269,7 @@ def admin_delete_all_notes(request):
             messages.error(request, '잘못된 요청입니다.')
             return redirect('notes:admin_delete_all')
 
-    notes = Note.objects.all().order_by('-created_at')
-    return render(request, 'notes/admin_delete_all.html', {'notes': notes})
\ No newline at end of file
+    # 목록은 페이지 단위로만 로드
+    notes = Note.objects.only('id', 'title', 'content', 'created_at').order_by('-created_at', '-id')
+    page_obj = Paginator(notes, ADMIN_NOTES_PAGE_SIZE).get_page(request.GET.get('page'))
+    return render(request, 'notes/admin_delete_all.html', {'notes': page_obj.object_list, 'page_obj': page_obj})
\ No newline at end of file
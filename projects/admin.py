@@ -1,9 +1,9 @@
 from django.contrib import admin
 from django import forms
+from django.db import transaction
+from .images import resize_upload, store_image
+from .variants import schedule_variants
 from .models import Project
-import base64
-from PIL import Image
-from io import BytesIO
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,42 +21,35 @@ class ProjectAdminForm(forms.ModelForm):
 class ProjectAdmin(admin.ModelAdmin):
     form = ProjectAdminForm
     list_display = ('title', 'created_at', 'is_visible')
-    
+    readonly_fields = ('image_file', 'image_variants')
+
+    def get_queryset(self, request):
+        # The changelist never shows the legacy Base64 column.
+        return super().get_queryset(request).defer('image_data')
+
     def save_model(self, request, obj, form, change):
         uploaded_image = form.cleaned_data.get('image')
         if uploaded_image:
             try:
                 logger.info(f"Processing uploaded image: {uploaded_image.name}, original size: {uploaded_image.size} bytes")
 
-                # Open the image using Pillow
-                img = Image.open(uploaded_image)
-                
-                # Define max size and resize the image
-                max_size = (1200, 1200)
-                img.thumbnail(max_size, Image.Resampling.LANCZOS)
-                
-                # Save the resized image to an in-memory buffer
-                buffer = BytesIO()
-                # Use the original format, or a default like JPEG if the format is not available
-                image_format = img.format if img.format in ['JPEG', 'PNG', 'GIF'] else 'JPEG'
-                img.save(buffer, format=image_format)
-                image_bytes = buffer.getvalue()
-                
+                image_bytes, extension = resize_upload(uploaded_image)
                 logger.info(f"Resized image size: {len(image_bytes)} bytes")
 
-                # Encode the resized image in Base64
-                encoded_image = base64.b64encode(image_bytes).decode('utf-8')
-                
-                # Determine the MIME type
-                mime_type = f'image/{image_format.lower()}'
-                data_uri = f"data:{mime_type};base64,{encoded_image}"
-
-                obj.image_data = data_uri
+                # Store the file under its content hash; the row only keeps the reference.
+                obj.image_file.name = store_image(image_bytes, extension)
+                obj.image_data = None
+                obj.image_variants = {}
             except Exception as e:
                 logger.error(f"Error processing image: {e}", exc_info=True)
+                uploaded_image = None
                 # Optionally, you could add a message to the user
                 # self.message_user(request, "Error processing image.", level='error')
 
         super().save_model(request, obj, form, change)
 
-admin.site.register(Project, ProjectAdmin)
\ No newline at end of file
+        if uploaded_image:
+            # WebP/AVIF variants are encoded in the background once the row is committed.
+            transaction.on_commit(lambda: schedule_variants(obj))
+
+admin.site.register(Project, ProjectAdmin)
@@ -0,0 +1,26 @@
+import time
+
+from django.core.cache import cache
+
+
+VERSION_KEY = 'projects:version'
+
+
+def get_version():
+    """
+    Current version of project-derived cache entries. Any Project change bumps
+    it, so entries cached under an older version are simply never read again.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seed with a timestamp so a lost key can never resurrect an old version.
+        cache.add(VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, int(time.time() * 1000), None)
@@ -0,0 +1,48 @@
+import threading
+from collections import OrderedDict
+
+
+class ImageBytesCache:
+    """
+    Thread-safe LRU cache of decoded images, bounded by total byte size.
+    Values are (image_bytes, digest, extension) tuples.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, image_bytes, digest, extension):
+        size = len(image_bytes)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (image_bytes, digest, extension)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (evicted, _, _) = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def discard(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _pop(self, key):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.current_bytes -= len(old[0])
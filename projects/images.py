@@ -0,0 +1,95 @@
+import base64
+import hashlib
+import logging
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+IMAGE_DIR = "project_images"
+MAX_SIZE = (1200, 1200)
+FORMAT_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp"}
+EXTENSION_MIME_TYPES = {
+    "jpg": "image/jpeg",
+    "png": "image/png",
+    "gif": "image/gif",
+    "webp": "image/webp",
+    "avif": "image/avif",
+}
+
+
+def resize_upload(uploaded_image):
+    """
+    Resize an uploaded image to fit MAX_SIZE and return (bytes, extension).
+    """
+    img = Image.open(uploaded_image)
+    # Use the original format, or a default like JPEG if the format is not available
+    image_format = img.format if img.format in ["JPEG", "PNG", "GIF"] else "JPEG"
+    img.thumbnail(MAX_SIZE, Image.Resampling.LANCZOS)
+    if image_format == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    buffer = BytesIO()
+    img.save(buffer, format=image_format)
+    return buffer.getvalue(), FORMAT_EXTENSIONS[image_format]
+
+
+def content_name(image_bytes, extension):
+    """
+    Storage name derived from the content hash, e.g. project_images/ab/ab12...ef.png
+    """
+    digest = hashlib.sha256(image_bytes).hexdigest()
+    return f"{IMAGE_DIR}/{digest[:2]}/{digest}.{extension}"
+
+
+def name_digest(name):
+    """
+    Content hash embedded in a content-addressed storage name.
+    """
+    return name.rsplit("/", 1)[-1].split(".", 1)[0]
+
+
+def url_version(digest):
+    """
+    The ?v= value image URLs carry: a prefix of the content hash.
+    """
+    return digest[:16]
+
+
+def store_image(image_bytes, extension):
+    """
+    Save image bytes under a content-addressed name and return that name.
+    Identical uploads map to the same file, so re-saving is a no-op.
+    """
+    name = content_name(image_bytes, extension)
+    if not default_storage.exists(name):
+        saved_name = default_storage.save(name, ContentFile(image_bytes))
+        if saved_name != name:
+            logger.warning(f"Storage renamed content-addressed image {name} to {saved_name}")
+        name = saved_name
+    return name
+
+
+def decode_data_uri(data_uri):
+    """
+    Split a legacy 'data:image/png;base64,...' value into (bytes, extension).
+    Returns (None, None) if the value is not a base64 image data URI.
+    """
+    if not data_uri or not data_uri.startswith("data:image/"):
+        return None, None
+    header, _, payload = data_uri.partition(",")
+    if ";base64" not in header or not payload:
+        return None, None
+
+    mime_type = header[len("data:"):].split(";", 1)[0]
+    extension = mime_type.split("/", 1)[1].lower()
+    if extension == "jpeg":
+        extension = "jpg"
+    try:
+        return base64.b64decode(payload), extension
+    except (ValueError, TypeError):
+        return None, None
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from projects.models import Project
+from projects.variants import build_variants
+
+
+class Command(BaseCommand):
+    help = 'Builds responsive WebP/AVIF variants and blurred placeholders for project images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rebuild variants that already exist.')
+
+    def handle(self, *args, **options):
+        projects = Project.objects.order_by('pk')
+        if not options['force']:
+            projects = projects.filter(image_variants={})
+
+        built = 0
+        # Iterate ids first so only one source image is held in memory at a time.
+        for project_id in projects.values_list('pk', flat=True):
+            project = Project.objects.get(pk=project_id)
+            if not project.image_url:
+                continue
+            try:
+                manifest = build_variants(project)
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'  - Failed "{project.title}": {e}'))
+                continue
+            if manifest:
+                built += 1
+                self.stdout.write(f'  - Built variants for "{project.title}"')
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Built variants for {built} projects.'))
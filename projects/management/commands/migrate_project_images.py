@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from projects.images import decode_data_uri, store_image
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Moves legacy Base64 project images out of Project.image_data into content-addressed media files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=20, help='Number of rows loaded per batch.')
+        parser.add_argument('--keep-data', action='store_true', help='Keep image_data after the file is written.')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be migrated without writing.')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        keep_data = options['keep_data']
+        dry_run = options['dry_run']
+
+        pending = (
+            Project.objects.filter(image_file='', image_data__isnull=False)
+            .exclude(image_data='')
+            .order_by('pk')
+        )
+        self.stdout.write(f'Found {pending.count()} projects with legacy image data.')
+
+        migrated = skipped = 0
+        last_pk = 0
+        while True:
+            # Keyset batches keep at most `batch_size` Base64 payloads in memory.
+            batch = list(pending.filter(pk__gt=last_pk).only('pk', 'title', 'image_data')[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            for project in batch:
+                image_bytes, extension = decode_data_uri(project.image_data)
+                if image_bytes is None:
+                    self.stdout.write(self.style.WARNING(f'  - Skipping "{project.title}": not a Base64 image.'))
+                    skipped += 1
+                    continue
+                if dry_run:
+                    self.stdout.write(f'  - Would migrate "{project.title}" ({len(image_bytes)} bytes)')
+                    migrated += 1
+                    continue
+
+                name = store_image(image_bytes, extension)
+                updates = {'image_file': name}
+                if not keep_data:
+                    updates['image_data'] = None
+                Project.objects.filter(pk=project.pk).update(**updates)
+                self.stdout.write(f'  - Migrated "{project.title}" -> {name}')
+                migrated += 1
+
+            # Drop the payloads before loading the next batch.
+            del batch
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Migrated {migrated}, skipped {skipped}.'))
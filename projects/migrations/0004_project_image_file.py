@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_remove_project_image_project_image_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='image_file',
+            field=models.ImageField(blank=True, editable=False, upload_to='project_images/', verbose_name='이미지 파일'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+import re
+
+from django.db import migrations
+
+
+def _split_technologies(raw):
+    if not isinstance(raw, str):
+        return []
+    normalized = raw.replace("\r\n", "\n").replace("\n", ",")
+    parts = [re.sub(r"^[\s,]+|[\s,]+$", "", part) for part in normalized.split(",")]
+    return [part for part in parts if part]
+
+
+def _technology_slug(name):
+    slug = re.sub(r"\(.*?\)", "", name or "").lower()
+    slug = slug.replace(".", "")
+    return re.sub(r"\s+", " ", slug).strip()
+
+
+def populate_technologies(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    Technology = apps.get_model('projects', 'Technology')
+    ProjectTechnology = apps.get_model('projects', 'ProjectTechnology')
+
+    technologies = {}
+    links = []
+    for project in Project.objects.only('id', 'technologies').iterator():
+        seen = set()
+        for name in _split_technologies(project.technologies):
+            slug = _technology_slug(name)
+            if not slug or slug in seen:
+                continue
+            seen.add(slug)
+            if slug not in technologies:
+                technologies[slug] = Technology.objects.create(name=name, slug=slug)
+            links.append(ProjectTechnology(project_id=project.id, technology=technologies[slug], position=len(seen) - 1))
+    ProjectTechnology.objects.bulk_create(links)
+
+
+def clear_technologies(apps, schema_editor):
+    apps.get_model('projects', 'ProjectTechnology').objects.all().delete()
+    apps.get_model('projects', 'Technology').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_technology'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_technologies, clear_technologies),
+    ]
@@ -0,0 +1,144 @@
+import re
+
+from django.db import migrations
+
+# Frozen copy of the projects.technologies aliases and normalize() as of this
+# migration, so later registry changes do not change what it does.
+# key: aliases
+_TECHNOLOGY_ALIASES = {
+    'python': ('파이썬',),
+    'django': ('장고',),
+    'javascript': ('자바스크립트',),
+    'html': ('html5',),
+    'css': ('css3',),
+    'bootstrap': (),
+    'react': ('리액트',),
+    'zustand': (),
+    'vue': (),
+    'angular': (),
+    'typescript': (),
+    'docker': ('도커',),
+    'docker compose': (),
+    'kubernetes': (),
+    'postgresql': ('포스트그레스큐엘',),
+    'mysql': ('sql', '마이에스큐엘'),
+    'sqlite': (),
+    'mongodb': (),
+    'redis': (),
+    'git': ('깃', 'git & github'),
+    'github': ('깃허브',),
+    'gitlab': (),
+    'nginx': (),
+    'linux': (),
+    'ubuntu': (),
+    'figma': (),
+    'svelte': (),
+    'fastapi': (),
+    'firebase': ('파이어베이스',),
+    'graphql': (),
+    'nodejs': ('node', 'node.js'),
+    'npm': (),
+    'yarn': (),
+    'webpack': (),
+    'babel': (),
+    'bash': (),
+    'c#': (),
+    'c++': (),
+    'go': (),
+    'java': ('자바',),
+    'javafx': (),
+    'spring boot': ('스프링 부트', 'springboot'),
+    'socket': ('소켓',),
+    'ollama': ('올라마', 'llama3.1', 'llama'),
+    'ai': (),
+    'gemini api': (),
+    'kotlin': (),
+    'php': (),
+    'ruby': (),
+    'rust': (),
+    'swift': (),
+    'aws': ('아마존 웹 서비스',),
+    's3': (),
+    'azure': (),
+    'google cloud': (),
+    'heroku': (),
+    'digitalocean': (),
+    'jenkins': (),
+    'nextjs': ('next.js', '넥스트js'),
+    'tailwindcss': ('tailwind', 'tainwindcss', '테일윈드css'),
+    'sass': (),
+    'less': (),
+    'jest': (),
+    'mocha': (),
+    'selenium': (),
+    'blender': (),
+    'photoshop': (),
+    'illustrator': (),
+    'premiere pro': (),
+    'after effects': (),
+    'vscode': (),
+    'visual studio': (),
+    'pycharm': (),
+    'intellij': (),
+    'webstorm': (),
+    'android': (),
+    'apple': (),
+    'windows': (),
+    'sensor': (),
+    'monitoring': (),
+}
+_ALIASES = {alias: key for key, aliases in _TECHNOLOGY_ALIASES.items() for alias in (key,) + aliases}
+
+
+def _split_technologies(raw):
+    if not isinstance(raw, str):
+        return []
+    normalized = raw.replace("\r\n", "\n").replace("\n", ",")
+    parts = [re.sub(r"^[\s,]+", "", re.sub(r"[,\s]+$", "", part)) for part in normalized.split(",")]
+    return [part for part in parts if part]
+
+
+def _normalize(name):
+    cleaned = re.sub(r"[,\s]+$", "", name or "")
+    cleaned = re.sub(r"\(.*?\)", "", cleaned)
+    cleaned = re.sub(r"\s+", " ", cleaned).strip().lower()
+    dotless = cleaned.replace(".", "")
+    return _ALIASES.get(cleaned) or _ALIASES.get(dotless) or dotless
+
+
+def reslug_technologies(apps, schema_editor):
+    """
+    Rebuild technology links with slugs from the unified registry, which
+    folds aliases such as "Tailwind"/"TailwindCss" into one row.
+    """
+    Project = apps.get_model('projects', 'Project')
+    Technology = apps.get_model('projects', 'Technology')
+    ProjectTechnology = apps.get_model('projects', 'ProjectTechnology')
+
+    ProjectTechnology.objects.all().delete()
+    Technology.objects.all().delete()
+
+    technologies = {}
+    links = []
+    for project in Project.objects.only('id', 'technologies').iterator():
+        seen = []
+        for name in _split_technologies(project.technologies):
+            slug = _normalize(name)
+            if not slug or slug in seen:
+                continue
+            seen.append(slug)
+            if slug not in technologies:
+                technologies[slug] = Technology.objects.create(name=name, slug=slug)
+            links.append(ProjectTechnology(project_id=project.id, technology=technologies[slug], position=len(seen) - 1))
+    ProjectTechnology.objects.bulk_create(links)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_populate_technologies'),
+    ]
+
+    operations = [
+        migrations.RunPython(reslug_technologies, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,165 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import BooleanField, ExpressionWrapper, Prefetch, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.urls import reverse
+
+from . import cache as projects_cache
+from .images import name_digest, url_version
+from .technologies import split_technologies, technology_slug
+
+
+class Technology(models.Model):
+    # Project.technologies 의 한 항목이 그대로 들어올 수 있으므로 같은 길이까지 허용
+    name = models.CharField(max_length=200)
+    slug = models.CharField(max_length=200, unique=True)
+
+    class Meta:
+        verbose_name_plural = 'technologies'
+
+    def __str__(self):
+        return self.name
+
+
+class ProjectQuerySet(models.QuerySet):
+    def for_display(self):
+        """
+        Skip the heavy legacy Base64 column; only flag whether it holds an image.
+        """
+        return self.defer('image_data').with_legacy_flag()
+
+    def with_legacy_flag(self):
+        """
+        Annotate has_legacy_image, which image_url uses instead of loading image_data.
+        """
+        return self.annotate(
+            has_legacy_image=ExpressionWrapper(
+                Q(image_data__isnull=False) & ~Q(image_data=''),
+                output_field=BooleanField(),
+            )
+        )
+
+    def with_stack(self):
+        """
+        Prefetch each project's technologies, in the order they were entered.
+        """
+        return self.prefetch_related(
+            Prefetch(
+                'tech_stack',
+                queryset=Technology.objects.order_by('project_links__position'),
+                to_attr='prefetched_stack',
+            )
+        )
+
 
 class Project(models.Model):
     title = models.CharField(max_length=100)
     description = models.TextField()
     technologies = models.CharField(max_length=200)
+    tech_stack = models.ManyToManyField(Technology, through='ProjectTechnology', related_name='projects', blank=True)
+    image_file = models.ImageField(upload_to='project_images/', blank=True, editable=False, verbose_name='이미지 파일')
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name='이미지 변환본')
     image_data = models.TextField(blank=True, null=True, verbose_name='이미지 데이터 (Base64)')
     live_link = models.URLField(blank=True, null=True)
     source_link = models.URLField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     is_visible = models.BooleanField(default=True, verbose_name='채팅에서 보이기') # Added field
 
+    objects = ProjectQuerySet.as_manager()
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+    def sync_tech_stack(self):
+        """
+        Rebuild the normalized tech_stack links from the technologies string.
+        """
+        names = {}
+        for name in split_technologies(self.technologies):
+            names.setdefault(technology_slug(name), name)
+        names.pop('', None)
+
+        existing = {tech.slug: tech for tech in Technology.objects.filter(slug__in=names)}
+        missing = [Technology(name=name, slug=slug) for slug, name in names.items() if slug not in existing]
+        if missing:
+            Technology.objects.bulk_create(missing, ignore_conflicts=True)
+            existing = {tech.slug: tech for tech in Technology.objects.filter(slug__in=names)}
+
+        ProjectTechnology.objects.filter(project=self).delete()
+        ProjectTechnology.objects.bulk_create(
+            ProjectTechnology(project=self, technology=existing[slug], position=position)
+            for position, slug in enumerate(names)
+        )
+        self.__dict__.pop('prefetched_stack', None)
+
+    @property
+    def stack(self):
+        """
+        Technologies in display order; uses the with_stack() prefetch when present.
+        """
+        if hasattr(self, 'prefetched_stack'):
+            return self.prefetched_stack
+        return list(self.tech_stack.order_by('project_links__position'))
+
+    @property
+    def image_url(self):
+        """
+        URL of the original project image. Stored files carry their content
+        hash as ?v= so the response can be cached as immutable; rows whose
+        Base64 data has not been migrated yet are served without it.
+        """
+        if self.image_file:
+            return self.variant_url('original', self.image_file.name)
+        has_legacy_image = getattr(self, 'has_legacy_image', None)
+        if has_legacy_image is None:
+            has_legacy_image = bool(self.image_data)
+        if has_legacy_image:
+            return reverse('project_image', args=[self.pk, 'original'])
+        return ''
+
+    def variant_url(self, variant, name):
+        url = reverse('project_image', args=[self.pk, variant])
+        return f"{url}?v={url_version(name_digest(name))}"
+
+    def variant_name(self, variant):
+        """
+        Storage name for 'original' or a '<format>-<width>' variant such as 'webp-640'.
+        """
+        if variant == 'original':
+            return self.image_file.name or None
+        fmt, _, width = variant.partition('-')
+        formats = (self.image_variants or {}).get('formats') or {}
+        for variant_width, name in formats.get(fmt, []):
+            if str(variant_width) == width:
+                return name
+        return None
+
+
+class ProjectTechnology(models.Model):
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='technology_links')
+    technology = models.ForeignKey(Technology, on_delete=models.CASCADE, related_name='project_links')
+    position = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        ordering = ['position']
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'technology'], name='unique_project_technology'),
+        ]
+
+
+# ------------------------------
+# Keep derived data in sync with Project edits. Receivers run in registration
+# order, so the tech stack is rebuilt before cached view models are invalidated.
+# ------------------------------
+
+@receiver(post_save, sender=Project)
+def sync_tech_stack_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance.sync_tech_stack()
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def bump_projects_cache_version(sender, **kwargs):
+    # 커밋 전에 올리면 다른 요청이 옛 데이터로 새 버전을 채울 수 있음
+    transaction.on_commit(projects_cache.bump_version)
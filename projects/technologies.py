@@ -0,0 +1,198 @@
+"""
+Single registry of the technologies shown across the site.
+
+Icon (Devicon class), purpose (project detail page), badge color (sidebar) and
+aliases (Korean names, spelling variants) live in one table that is compiled
+once at import. Every lookup goes through the memoized ``normalize`` so pages
+rendering many badges never rebuild maps or rerun regexes per badge.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+
+TechInfo = namedtuple("TechInfo", ["key", "icon", "purpose", "color"])
+
+DEFAULT_ICON = "devicon-gear-plain"
+DEFAULT_PURPOSE = "적용 목적 정리 예정."
+DEFAULT_COLOR = "teal"
+
+# key: (icon, purpose, color, aliases)
+TECHNOLOGIES = {
+    "python": ("devicon-python-plain", "핵심 비즈니스 로직 구현", "teal", ("파이썬",)),
+    "django": ("devicon-django-plain", "웹 백엔드 및 API 계층 구성", "purple", ("장고",)),
+    "javascript": ("devicon-javascript-plain", None, "teal", ("자바스크립트",)),
+    "html": ("devicon-html5-plain", None, "teal", ("html5",)),
+    "css": ("devicon-css3-plain", None, "teal", ("css3",)),
+    "bootstrap": ("devicon-bootstrap-plain", "반응형 UI 구성", "teal", ()),
+    "react": ("devicon-react-original", "컴포넌트 중심 UI 구성", "purple", ("리액트",)),
+    "zustand": ("devicon-redux-original", "인증 상태 중앙 관리", "teal", ()),
+    "vue": ("devicon-vuejs-plain", None, "teal", ()),
+    "angular": ("devicon-angularjs-plain", None, "teal", ()),
+    "typescript": ("devicon-typescript-plain", "정적 타입 기반 안정성 확보", "teal", ()),
+    "docker": ("devicon-docker-plain", "배포 환경 표준화", "teal", ("도커",)),
+    "docker compose": ("devicon-docker-plain", None, "teal", ()),
+    "kubernetes": ("devicon-kubernetes-plain", None, "teal", ()),
+    "postgresql": ("devicon-postgresql-plain", None, "teal", ("포스트그레스큐엘",)),
+    "mysql": ("devicon-mysql-plain", "관계형 데이터 저장", "purple", ("sql", "마이에스큐엘")),
+    "sqlite": ("devicon-sqlite-plain", "경량 데이터 저장", "teal", ()),
+    "mongodb": ("devicon-mongodb-plain", None, "purple", ()),
+    "redis": ("devicon-redis-plain", "반복 조회 구간 캐싱 최적화", "teal", ()),
+    "git": ("devicon-git-plain", None, "teal", ("깃", "git & github")),
+    "github": ("devicon-github-original", None, "teal", ("깃허브",)),
+    "gitlab": ("devicon-gitlab-plain", None, "teal", ()),
+    "nginx": ("devicon-nginx-original", "Reverse Proxy 및 요청 분산", "teal", ()),
+    "linux": ("devicon-linux-plain", None, "teal", ()),
+    "ubuntu": ("devicon-ubuntu-plain", None, "teal", ()),
+    "figma": ("devicon-figma-plain", None, "teal", ()),
+    "svelte": ("devicon-svelte-plain", None, "teal", ()),
+    "fastapi": ("devicon-fastapi-plain", None, "teal", ()),
+    "firebase": ("devicon-firebase-plain", "백엔드 서비스 및 데이터 연동", "teal", ("파이어베이스",)),
+    "graphql": ("devicon-graphql-plain", None, "teal", ()),
+    "nodejs": ("devicon-nodejs-plain", None, "teal", ("node", "node.js")),
+    "npm": ("devicon-npm-original-wordmark", None, "teal", ()),
+    "yarn": ("devicon-yarn-plain", None, "teal", ()),
+    "webpack": ("devicon-webpack-plain", None, "teal", ()),
+    "babel": ("devicon-babel-plain", None, "teal", ()),
+    "bash": ("devicon-bash-plain", None, "teal", ()),
+    "c#": ("devicon-csharp-plain", None, "teal", ()),
+    "c++": ("devicon-cplusplus-plain", None, "teal", ()),
+    "go": ("devicon-go-plain", None, "teal", ()),
+    "java": ("devicon-java-plain", "서비스 로직 구현", "teal", ("자바",)),
+    # Using Java icon as proxy for JavaFX
+    "javafx": ("devicon-java-plain", None, "teal", ()),
+    "spring boot": ("devicon-spring-plain", None, "purple", ("스프링 부트", "springboot")),
+    # Using Kafka as proxy for socket/streaming
+    "socket": ("devicon-apachekafka-original", "실시간 이벤트 처리", "purple", ("소켓",)),
+    # Using Google as proxy for AI
+    "ollama": ("devicon-google-plain", None, "purple", ("올라마", "llama3.1", "llama")),
+    "ai": ("devicon-google-plain", "지능형 처리 기능 구성", "teal", ()),
+    "gemini api": ("devicon-google-plain", None, "teal", ()),
+    "kotlin": ("devicon-kotlin-plain", None, "teal", ()),
+    "php": ("devicon-php-plain", None, "teal", ()),
+    "ruby": ("devicon-ruby-plain", None, "teal", ()),
+    "rust": ("devicon-rust-plain", None, "teal", ()),
+    "swift": ("devicon-swift-plain", None, "teal", ()),
+    "aws": ("devicon-amazonwebservices-plain-wordmark", "인프라 운영 및 리소스 관리", "teal", ("아마존 웹 서비스",)),
+    "s3": ("devicon-amazonwebservices-plain-wordmark", None, "teal", ()),
+    "azure": ("devicon-azure-plain", None, "teal", ()),
+    "google cloud": ("devicon-googlecloud-plain", None, "teal", ()),
+    "heroku": ("devicon-heroku-plain", None, "teal", ()),
+    "digitalocean": ("devicon-digitalocean-plain", None, "teal", ()),
+    "jenkins": ("devicon-jenkins-plain", None, "teal", ()),
+    "nextjs": ("devicon-nextjs-plain", "SSR 기반 초기 렌더링 최적화", "purple", ("next.js", "넥스트js")),
+    # "tainwindcss" covers a typo present in existing project data
+    "tailwindcss": ("devicon-tailwindcss-plain", "반응형 UI 구현", "purple", ("tailwind", "tainwindcss", "테일윈드css")),
+    "sass": ("devicon-sass-original", None, "teal", ()),
+    "less": ("devicon-less-plain-wordmark", None, "teal", ()),
+    "jest": ("devicon-jest-plain", None, "teal", ()),
+    "mocha": ("devicon-mocha-plain", None, "teal", ()),
+    "selenium": ("devicon-selenium-original", None, "teal", ()),
+    "blender": ("devicon-blender-original", None, "teal", ()),
+    "photoshop": ("devicon-photoshop-plain", None, "teal", ()),
+    "illustrator": ("devicon-illustrator-plain", None, "teal", ()),
+    "premiere pro": ("devicon-premierepro-plain", None, "teal", ()),
+    "after effects": ("devicon-aftereffects-plain", None, "teal", ()),
+    "vscode": ("devicon-vscode-plain", None, "teal", ()),
+    "visual studio": ("devicon-visualstudio-plain", None, "teal", ()),
+    "pycharm": ("devicon-pycharm-plain", None, "teal", ()),
+    "intellij": ("devicon-intellij-plain", None, "teal", ()),
+    "webstorm": ("devicon-webstorm-plain", None, "teal", ()),
+    "android": ("devicon-android-plain", None, "teal", ()),
+    "apple": ("devicon-apple-original", None, "teal", ()),
+    "windows": ("devicon-windows8-original", None, "teal", ()),
+    "sensor": (DEFAULT_ICON, "현장 데이터 수집 요소", "teal", ()),
+    "monitoring": (DEFAULT_ICON, "상태 관찰 및 시각화", "teal", ()),
+}
+
+
+def _build_registry():
+    infos = {}
+    aliases = {}
+    for key, (icon, purpose, color, extra_aliases) in TECHNOLOGIES.items():
+        infos[key] = TechInfo(key, icon, purpose or DEFAULT_PURPOSE, color)
+        for alias in (key,) + extra_aliases:
+            aliases[alias] = key
+    return infos, aliases
+
+
+_INFOS, _ALIASES = _build_registry()
+
+# Aliases that count as a technology mention in chat messages: the chat's original
+# keyword list. Short, common words such as "ai", "go" or "s3" stay out so ordinary
+# questions ("ai 프로젝트 보여줘") do not narrow the project cards.
+CHAT_KEYWORDS = (
+    "python", "파이썬", "django", "장고", "react", "리액트", "docker", "도커",
+    "javascript", "자바스크립트", "java", "자바", "mysql", "sql", "마이에스큐엘",
+    "postgresql", "포스트그레스큐엘", "aws", "아마존 웹 서비스",
+    "nextjs", "next.js", "넥스트js", "firebase", "파이어베이스",
+    "tailwindcss", "tailwind", "테일윈드css", "socket", "소켓",
+    "ollama", "올라마", "llama3.1", "llama", "spring boot", "스프링 부트",
+    "git", "깃", "github", "깃허브",
+)
+# The chat's original keyword table folded GitHub mentions into "git"; detection
+# keeps that mapping even though the registry lists GitHub separately.
+CHAT_ALIASES = {"github": "git", "깃허브": "git"}
+
+_TRAILING_PUNCTUATION_RE = re.compile(r"[,\s]+$")
+_LEADING_PUNCTUATION_RE = re.compile(r"^[\s,]+")
+_PARENTHETICAL_RE = re.compile(r"\(.*?\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+# Longest keyword first so "자바스크립트" wins over "자바"; the lookarounds stop
+# "sql" matching inside "postgresql" while Korean particles still match.
+_DETECT_RE = re.compile(
+    r"(?<![a-z0-9])(?:"
+    + "|".join(re.escape(alias) for alias in sorted(CHAT_KEYWORDS, key=len, reverse=True))
+    + r")(?![a-z0-9])"
+)
+
+
+def split_technologies(raw):
+    """
+    Split a comma/newline separated technologies string into trimmed names.
+    """
+    if not isinstance(raw, str):
+        return []
+    normalized = raw.replace("\r\n", "\n").replace("\n", ",")
+    parts = [_TRAILING_PUNCTUATION_RE.sub("", _LEADING_PUNCTUATION_RE.sub("", part)) for part in normalized.split(",")]
+    return [part for part in parts if part]
+
+
+@lru_cache(maxsize=1024)
+def normalize(name):
+    """
+    Canonical registry key for a technology name:
+    "Next.js" -> "nextjs", "AWS(EC2)" -> "aws", "파이썬" -> "python".
+    Unknown names fall back to a cleaned lowercase form.
+    """
+    cleaned = _TRAILING_PUNCTUATION_RE.sub("", name or "")
+    cleaned = _PARENTHETICAL_RE.sub("", cleaned)
+    cleaned = _WHITESPACE_RE.sub(" ", cleaned).strip().lower()
+    dotless = cleaned.replace(".", "")
+    return _ALIASES.get(cleaned) or _ALIASES.get(dotless) or dotless
+
+
+# Technology.slug stores the canonical key.
+technology_slug = normalize
+
+
+def lookup(name):
+    """
+    Icon, purpose and color for a technology name in a single lookup.
+    """
+    key = normalize(name)
+    return _INFOS.get(key) or TechInfo(key, DEFAULT_ICON, DEFAULT_PURPOSE, DEFAULT_COLOR)
+
+
+def detect_technologies(text):
+    """
+    Canonical keys of the CHAT_KEYWORDS technologies mentioned in free text, in
+    order of appearance.
+    """
+    found = []
+    for match in _DETECT_RE.finditer((text or "").lower()):
+        alias = match.group(0)
+        key = CHAT_ALIASES.get(alias) or _ALIASES[alias]
+        if key not in found:
+            found.append(key)
+    return found
@@ -0,0 +1,42 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+
+def variant_srcset(project, fmt, variants):
+    return ', '.join(f'{project.variant_url(f"{fmt}-{width}", name)} {width}w' for width, name in variants)
+
+
+@register.simple_tag
+def project_picture(project, sizes='100vw', css_class='', style=''):
+    """
+    Render a project image as <picture> with AVIF/WebP srcsets and a blurred
+    placeholder, so the browser downloads only the width it displays.
+    Projects without variants fall back to a plain <img>.
+    """
+    image_url = project.image_url
+    if not image_url:
+        return ''
+
+    manifest = project.image_variants or {}
+    formats = manifest.get('formats') or {}
+    if not formats:
+        return format_html(
+            '<img src="{}" class="{}" style="{}" alt="{}" loading="lazy" decoding="async">',
+            image_url, css_class, style, project.title,
+        )
+
+    sources = format_html_join(
+        '',
+        '<source type="{}" srcset="{}" sizes="{}">',
+        ((MIME_TYPES.get(fmt, f'image/{fmt}'), variant_srcset(project, fmt, variants), sizes) for fmt, variants in formats.items()),
+    )
+    placeholder = f"background: url('{manifest['lqip']}') center / cover no-repeat;" if manifest.get('lqip') else ''
+    return format_html(
+        '<picture>{}<img src="{}" width="{}" height="{}" class="{}" style="{}{}" alt="{}" loading="lazy" decoding="async"></picture>',
+        sources, image_url, manifest.get('width', ''), manifest.get('height', ''),
+        css_class, placeholder, style, project.title,
+    )
@@ -1,3 +1,241 @@
-from django.test import TestCase
+import base64
+import importlib
+import json
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from . import views
+from .image_cache import ImageBytesCache
+from .images import content_name, name_digest, store_image, url_version
+from .models import Project, Technology
+from .technologies import detect_technologies, lookup, normalize
+from .variants import VARIANT_FORMATS, build_variants, save_variants
+
+
+def png_bytes(size=(800, 400), color='red'):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class TechnologyRegistryTests(SimpleTestCase):
+    def test_normalize_folds_aliases(self):
+        self.assertEqual(normalize('Next.js'), 'nextjs')
+        self.assertEqual(normalize('AWS(EC2)'), 'aws')
+        self.assertEqual(normalize('파이썬'), 'python')
+        self.assertEqual(normalize('TainwindCss'), 'tailwindcss')
+        self.assertEqual(normalize('Some New Tool'), 'some new tool')
+        self.assertEqual(lookup('장고').icon, 'devicon-django-plain')
+
+    def test_detection_uses_chat_keywords_only(self):
+        self.assertEqual(detect_technologies('ai 프로젝트 보여줘'), [])
+        self.assertEqual(detect_technologies('go 언어 프로젝트'), [])
+        self.assertEqual(detect_technologies('s3 쓴 거 있어?'), [])
+        self.assertEqual(detect_technologies('파이썬이랑 Docker 프로젝트'), ['python', 'docker'])
+        self.assertEqual(detect_technologies('스프링 부트로 만든 것'), ['spring boot'])
+
+    def test_detection_respects_word_boundaries(self):
+        self.assertEqual(detect_technologies('자바스크립트 프로젝트'), ['javascript'])
+        self.assertEqual(detect_technologies('postgresql 프로젝트'), ['postgresql'])
+        self.assertEqual(detect_technologies('mongodb, mysql'), ['mysql'])
+
+    def test_github_mentions_fold_into_git(self):
+        self.assertEqual(detect_technologies('깃허브 프로젝트'), ['git'])
+        self.assertEqual(detect_technologies('GitHub, git'), ['git'])
+        self.assertEqual(normalize('GitHub'), 'github')
+
+
+class TechStackTests(TestCase):
+    LONG_NAME = 'Framework ' * 18
+
+    def test_entry_as_long_as_the_technologies_field_is_stored(self):
+        self.assertEqual(Technology._meta.get_field('name').max_length, Project._meta.get_field('technologies').max_length)
+        project = Project.objects.create(title='p', description='d', technologies=f'Python, {self.LONG_NAME}')
+        self.assertEqual([tech.name for tech in project.stack], ['Python', self.LONG_NAME.strip()])
+
+    def test_populate_migration_accepts_long_entries(self):
+        migration = importlib.import_module('projects.migrations.0007_populate_technologies')
+        Project.objects.create(title='p', description='d', technologies=self.LONG_NAME)
+        migration.clear_technologies(apps, None)
+        migration.populate_technologies(apps, None)
+        self.assertEqual(list(Technology.objects.values_list('name', flat=True)), [self.LONG_NAME.strip()])
+
+
+class ChatProjectFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Project.objects.create(title='AI 챗봇', description='d', technologies='Python, AI')
+        Project.objects.create(title='Go 서버', description='d', technologies='Go, Docker')
+
+    def chat(self, message):
+        response = self.client.post(
+            reverse('ai_search:chat_interaction'), json.dumps({'message': message}), content_type='application/json',
+        )
+        return response.json()['response']['content']
+
+    def test_plain_words_do_not_filter_cards(self):
+        content = self.chat('ai 프로젝트 보여줘')
+        self.assertIn('AI 챗봇', content)
+        self.assertIn('Go 서버', content)
+
+    def test_keyword_filters_cards(self):
+        content = self.chat('도커 프로젝트 보여줘')
+        self.assertIn('Go 서버', content)
+        self.assertNotIn('AI 챗봇', content)
+
+
+class MediaTestCase(TestCase):
+    """Project images written to a throwaway MEDIA_ROOT."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        views.image_cache.clear()
+
+
+class ImageStorageTests(MediaTestCase):
+    def test_images_are_content_addressed(self):
+        data = png_bytes()
+        name = store_image(data, 'png')
+        self.assertEqual(name, content_name(data, 'png'))
+        self.assertEqual(store_image(data, 'png'), name)
+        with default_storage.open(name, 'rb') as fh:
+            self.assertEqual(fh.read(), data)
+
+    def test_legacy_base64_is_moved_to_files(self):
+        data = png_bytes()
+        project = Project.objects.create(
+            title='legacy', description='d', technologies='Python',
+            image_data='data:image/png;base64,' + base64.b64encode(data).decode('ascii'),
+        )
+        call_command('migrate_project_images', stdout=StringIO())
+        project.refresh_from_db()
+        self.assertEqual(project.image_file.name, content_name(data, 'png'))
+        self.assertIsNone(project.image_data)
+
+
+class ImageVariantTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(title='p', description='d', technologies='Python')
+        self.project.image_file.name = store_image(png_bytes(), 'png')
+        self.project.save()
+
+    def test_variants_are_built_per_width_and_format(self):
+        manifest = build_variants(self.project)
+        self.assertEqual((manifest['width'], manifest['height']), (800, 400))
+        self.assertTrue(manifest['lqip'].startswith('data:image/webp;base64,'))
+        self.assertEqual(set(manifest['formats']), set(VARIANT_FORMATS))
+        for fmt, variants in manifest['formats'].items():
+            self.assertEqual([width for width, _ in variants], [320, 640, 800])
+            for width, name in variants:
+                with default_storage.open(name, 'rb') as fh:
+                    image = Image.open(fh)
+                    self.assertEqual((image.format.lower(), image.width), (fmt, width))
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.image_variants, manifest)
+        self.assertEqual(self.project.variant_name('webp-640'), manifest['formats']['webp'][1][1])
+        self.assertIsNone(self.project.variant_name('webp-1200'))
+
+    def test_variants_of_a_replaced_source_are_discarded(self):
+        self.assertIsNone(save_variants(self.project.pk, 'project_images/old.png', {
+            'width': 1, 'height': 1, 'lqip': '', 'formats': {},
+        }))
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.image_variants, {})
+
+
+class ProjectImageEndpointTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.data = png_bytes()
+        self.project = Project.objects.create(title='p', description='d', technologies='Python')
+        self.project.image_file.name = store_image(self.data, 'png')
+        self.project.save()
+        self.digest = name_digest(self.project.image_file.name)
+        self.url = reverse('project_image', args=[self.project.pk, 'original'])
+
+    def test_versioned_url_is_immutable(self):
+        response = self.client.get(self.project.image_url)
+        self.assertEqual(self.project.image_url, f'{self.url}?v={url_version(self.digest)}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response.content, self.data)
+        self.assertEqual(response['ETag'], f'"{self.digest}"')
+        self.assertEqual(response['Cache-Control'], views.IMMUTABLE_CACHE_CONTROL)
+
+    def test_other_versions_revalidate(self):
+        for query in ('', '?v=', f'?v={self.digest[:1]}', f'?v={self.digest[:15]}', f'?v={self.digest}', '?v=0000'):
+            with self.subTest(query=query):
+                response = self.client.get(self.url + query)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Cache-Control'], views.REVALIDATE_CACHE_CONTROL)
+
+    def test_matching_etag_gets_304_without_reading_storage(self):
+        with mock.patch.object(default_storage, 'open') as storage_open:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{self.digest}"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], f'"{self.digest}"')
+        storage_open.assert_not_called()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_bytes_are_cached_after_first_read(self):
+        self.client.get(self.url)
+        with mock.patch.object(default_storage, 'open') as storage_open:
+            response = self.client.get(self.url)
+        self.assertEqual(response.content, self.data)
+        storage_open.assert_not_called()
+
+    def test_legacy_image_is_served_and_revalidated(self):
+        legacy = Project.objects.create(
+            title='legacy', description='d', technologies='Python',
+            image_data='data:image/png;base64,' + base64.b64encode(self.data).decode('ascii'),
+        )
+        response = self.client.get(Project.objects.for_display().get(pk=legacy.pk).image_url)
+        self.assertEqual(response.content, self.data)
+        self.assertEqual(response['Cache-Control'], views.REVALIDATE_CACHE_CONTROL)
+
+    def test_list_cards_have_no_thumbnail(self):
+        self.assertNotContains(self.client.get(reverse('project_list')), self.url)
+        self.assertContains(self.client.get(reverse('project_detail', args=[self.project.pk])), self.url)
+
+    def test_unknown_variant_is_404(self):
+        self.assertEqual(self.client.get(reverse('project_image', args=[self.project.pk, 'webp-640'])).status_code, 404)
+
+
+class ImageBytesCacheTests(SimpleTestCase):
+    def test_least_recently_used_entries_are_evicted_by_size(self):
+        cache = ImageBytesCache(max_bytes=10)
+        cache.set('a', b'aaaa', 'da', 'png')
+        cache.set('b', b'bbbb', 'db', 'png')
+        cache.get('a')
+        cache.set('c', b'cccc', 'dc', 'png')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), (b'aaaa', 'da', 'png'))
+        self.assertEqual(cache.current_bytes, 8)
+
+    def test_oversized_and_replaced_entries(self):
+        cache = ImageBytesCache(max_bytes=10)
+        cache.set('big', b'x' * 11, 'd', 'png')
+        self.assertIsNone(cache.get('big'))
+        cache.set('a', b'aaaa', 'd1', 'png')
+        cache.set('a', b'aa', 'd2', 'png')
+        self.assertEqual(cache.current_bytes, 2)
+        cache.discard('a')
+        self.assertEqual((cache.get('a'), cache.current_bytes), (None, 0))
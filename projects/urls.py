@@ -4,4 +4,5 @@ from . import views
 urlpatterns = [
     path('', views.project_list, name='project_list'),
     path('<int:project_id>/', views.project_detail, name='project_detail'),
+    path('<int:project_id>/image/<str:variant>/', views.project_image, name='project_image'),
 ]
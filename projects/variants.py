@@ -0,0 +1,142 @@
+import base64
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection
+from PIL import Image, ImageFilter, ImageOps, features
+
+from .images import decode_data_uri, store_image
+
+logger = logging.getLogger(__name__)
+
+
+VARIANT_WIDTHS = (320, 640, 960, 1200)
+# Listed in order of preference; browsers pick the first <source> they support.
+VARIANT_FORMATS = ("avif", "webp") if features.check("avif") else ("webp",)
+ENCODE_OPTIONS = {
+    "avif": {"quality": 55},
+    "webp": {"quality": 80, "method": 4},
+}
+LQIP_SIZE = (24, 24)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def encode_variants(source_bytes):
+    """
+    Encode every width/format variant plus a blurred placeholder.
+    Pure bytes in, bytes out, so it can run in a worker process without Django.
+    """
+    img = Image.open(BytesIO(source_bytes))
+    img = ImageOps.exif_transpose(img)
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if img.mode in ("LA", "PA") or "transparency" in img.info else "RGB")
+
+    widths = sorted({w for w in VARIANT_WIDTHS if w < img.width} | {min(img.width, VARIANT_WIDTHS[-1])})
+    formats = {fmt: [] for fmt in VARIANT_FORMATS}
+    for width in widths:
+        height = max(1, round(img.height * width / img.width))
+        resized = img if width == img.width else img.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in VARIANT_FORMATS:
+            buffer = BytesIO()
+            resized.save(buffer, format=fmt.upper(), **ENCODE_OPTIONS[fmt])
+            formats[fmt].append((width, buffer.getvalue()))
+
+    placeholder = img.copy()
+    placeholder.thumbnail(LQIP_SIZE)
+    placeholder = placeholder.filter(ImageFilter.GaussianBlur(1))
+    buffer = BytesIO()
+    placeholder.save(buffer, format="WEBP", quality=30)
+    lqip = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    return {"width": img.width, "height": img.height, "formats": formats, "lqip": lqip}
+
+
+def read_source(project):
+    """
+    Return the original image bytes of a project (media file or legacy Base64).
+    """
+    if project.image_file:
+        with default_storage.open(project.image_file.name, "rb") as fh:
+            return fh.read()
+    image_bytes, _ = decode_data_uri(project.image_data)
+    return image_bytes
+
+
+def save_variants(project_id, source_name, encoded):
+    """
+    Store encoded variants under content-addressed names and record the manifest.
+    The update is skipped if the project's source image changed meanwhile.
+    """
+    from .models import Project
+
+    manifest = {
+        "source": source_name,
+        "width": encoded["width"],
+        "height": encoded["height"],
+        "lqip": encoded["lqip"],
+        "formats": {
+            fmt: [[width, store_image(data, fmt)] for width, data in variants]
+            for fmt, variants in encoded["formats"].items()
+        },
+    }
+    updated = Project.objects.filter(pk=project_id, image_file=source_name).update(image_variants=manifest)
+    if not updated:
+        logger.info(f"Project {project_id} image changed while encoding; discarding variants.")
+    return manifest if updated else None
+
+
+def build_variants(project):
+    """
+    Synchronously encode and store the variants of one project.
+    """
+    source_bytes = read_source(project)
+    if not source_bytes:
+        return None
+    return save_variants(project.pk, project.image_file.name, encode_variants(source_bytes))
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # "spawn" keeps the workers free of the parent's threads and DB connections.
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PROJECT_IMAGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _on_encoded(project_id, source_name, future):
+    try:
+        save_variants(project_id, source_name, future.result())
+        logger.info(f"Stored image variants for project {project_id}")
+    except Exception as e:
+        logger.error(f"Error building image variants for project {project_id}: {e}", exc_info=True)
+    finally:
+        # Callbacks run on the executor's management thread, which owns its own connection.
+        connection.close()
+
+
+def schedule_variants(project):
+    """
+    Encode the project's variants in the process pool and return immediately.
+    With PROJECT_IMAGE_WORKERS = 0 the work runs inline instead.
+    """
+    if settings.PROJECT_IMAGE_WORKERS <= 0:
+        return build_variants(project)
+
+    source_bytes = read_source(project)
+    if not source_bytes:
+        return None
+    future = _get_executor().submit(encode_variants, source_bytes)
+    future.add_done_callback(partial(_on_encoded, project.pk, project.image_file.name))
+    return future